@@ -0,0 +1,388 @@
+"""
+ShieldCraft AI - Chunking Throughput Benchmark
+Runs every strategy in STRATEGY_MAP over generated corpora (prose, JSON lines,
+syslog) and records MB/s, chunks/s, peak RSS and peak traced allocations.
+Each case runs in its own spawned process so memory figures are per case. A
+comparison mode fails when throughput regresses against a stored baseline or
+a baseline case has no result.
+"""
+
+import argparse
+import concurrent.futures
+import json
+import logging
+import multiprocessing
+import random
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Dict, List, Optional
+
+from ai_core.chunking.chunk import STRATEGY_MAP
+from infra.utils.config_loader import get_config_loader
+
+logging.basicConfig(level=logging.INFO)
+
+CORPUS_KINDS = ("prose", "jsonl", "syslog")
+DEFAULT_SIZES = ("1KB", "1MB", "16MB")
+# Chunks kept alive while counting allocations per chunk
+ALLOC_SAMPLE_CHUNKS = 1000
+_UNITS = {"KB": 1024, "MB": 1024**2, "GB": 1024**3, "B": 1}
+
+_WORDS = (
+    "alert anomalous access denied policy principal role bucket instance "
+    "escalation credential rotation finding severity tenant egress traffic "
+    "lateral movement baseline drift token session firewall endpoint"
+).split()
+
+
+def _whitespace_tokenizer(text):
+    return text.split()
+
+
+# Representative params per strategy, close to the dev config
+STRATEGY_PARAMS: Dict[str, dict] = {
+    "fixed": {"chunk_size": 512, "overlap": 64, "min_length": 0},
+    "semantic": {"min_length": 0},
+    "recursive": {"max_chunk_size": 512, "min_length": 0},
+    "sentence": {"min_length": 0},
+    "token_based": {
+        "tokenizer": _whitespace_tokenizer,
+        "chunk_size": 128,
+        "overlap": 16,
+        "min_length": 0,
+    },
+    "sliding_window": {"window_size": 512, "step_size": 256, "min_length": 0},
+    "custom_heuristic": {"delimiter": "\n---\n", "min_length": 0, "rules": {}},
+    "json_records": {"chunk_size": 1024, "min_length": 0},
+}
+
+
+def parse_size(size: str) -> int:
+    """Parse sizes such as ``1KB``, ``16MB`` or ``1GB`` into bytes."""
+    text = str(size).strip().upper()
+    for unit in ("KB", "MB", "GB", "B"):
+        if text.endswith(unit):
+            return int(float(text[: -len(unit)]) * _UNITS[unit])
+    return int(text)
+
+
+def _prose_record(rng: random.Random) -> str:
+    sentences = [
+        " ".join(rng.choice(_WORDS) for _ in range(rng.randint(6, 18))).capitalize()
+        + rng.choice(".!?")
+        for _ in range(rng.randint(2, 6))
+    ]
+    sep = "\n---\n" if rng.random() < 0.1 else "\n\n"
+    return " ".join(sentences) + sep
+
+
+def _jsonl_record(rng: random.Random) -> str:
+    event = {
+        "eventTime": f"2025-10-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00Z",
+        "eventName": rng.choice(["AssumeRole", "GetObject", "PutBucketPolicy"]),
+        "sourceIPAddress": f"10.0.{rng.randint(0, 255)}.{rng.randint(0, 255)}",
+        "userIdentity": {"arn": f"arn:aws:iam::123456789012:role/{rng.choice(_WORDS)}"},
+        "severity": rng.randint(1, 8),
+    }
+    return json.dumps(event) + "\n"
+
+
+def _syslog_record(rng: random.Random) -> str:
+    return (
+        f"Oct {rng.randint(1, 28):2d} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00 "
+        f"ip-10-0-{rng.randint(0, 255)}-{rng.randint(0, 255)} sshd[{rng.randint(100, 9999)}]: "
+        f"{rng.choice(['Accepted', 'Failed'])} publickey for {rng.choice(_WORDS)} "
+        f"from 10.0.{rng.randint(0, 255)}.{rng.randint(0, 255)} port {rng.randint(1024, 65535)}\n"
+    )
+
+
+_GENERATORS = {"prose": _prose_record, "jsonl": _jsonl_record, "syslog": _syslog_record}
+
+
+def generate_corpus(kind: str, size_bytes: int, seed: int = 0) -> str:
+    """
+    Deterministic synthetic corpus of roughly ``size_bytes``. A 64 KB block of
+    random records is tiled for large sizes so generation stays cheap.
+    """
+    if kind not in _GENERATORS:
+        raise ValueError(f"Unknown corpus kind: {kind}")
+    rng = random.Random(seed)
+    make = _GENERATORS[kind]
+    parts, total = [], 0
+    while total < min(size_bytes, 64 * 1024):
+        record = make(rng)
+        parts.append(record)
+        total += len(record)
+    block = "".join(parts)
+    # One join allocates the result once; no second full-size copy
+    repeats, rest = divmod(size_bytes, len(block))
+    return "".join([block] * repeats + [block[:rest]])
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024**2) if sys.platform == "darwin" else rss / 1024
+
+
+def _time_best(fn, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return max(best, 1e-9), result
+
+
+def bench_strategy(name: str, kind: str, size: str, repeat: int = 3) -> dict:
+    """
+    Time ``iter_chunks`` (what callers consume) and ``iter_spans`` on one
+    generated corpus, then stream ``iter_chunks`` under tracemalloc without
+    keeping the chunks, so memory is measured at any input size. Allocations
+    per chunk are counted over the first ``ALLOC_SAMPLE_CHUNKS`` chunks. Run
+    in a fresh process for a per-case peak RSS.
+    """
+    strategy = STRATEGY_MAP[name]
+    params = STRATEGY_PARAMS[name]
+    text = generate_corpus(kind, parse_size(size))
+    size_mb = len(text.encode("utf-8")) / (1024**2)
+    input_rss_mb = _peak_rss_mb()
+    best, n_chunks = _time_best(
+        lambda: sum(1 for _ in strategy.iter_chunks(text, **params)), repeat
+    )
+    span_best, _ = _time_best(
+        lambda: sum(1 for _ in strategy.iter_spans(text, **params)), repeat
+    )
+    tracemalloc.start()
+    try:
+        for _ in strategy.iter_chunks(text, **params):
+            pass
+        _, alloc_peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    tracemalloc.start()
+    try:
+        sample = list(islice(strategy.iter_chunks(text, **params), ALLOC_SAMPLE_CHUNKS))
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+    finally:
+        tracemalloc.stop()
+    alloc_blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+    peak_rss_mb = _peak_rss_mb()
+    return {
+        "strategy": name,
+        "corpus": kind,
+        "size": size,
+        "seconds": best,
+        "span_seconds": span_best,
+        "chunks": n_chunks,
+        "mb_per_s": size_mb / best,
+        "span_mb_per_s": size_mb / span_best,
+        "chunks_per_s": n_chunks / best,
+        "alloc_peak_mb": alloc_peak / (1024**2),
+        # Live blocks retained per chunk yielded by iter_chunks
+        "alloc_blocks_per_chunk": alloc_blocks / max(1, len(sample)),
+        "peak_rss_mb": peak_rss_mb,
+        # RSS the strategy added above the generated corpus itself
+        "chunking_rss_mb": max(0.0, peak_rss_mb - input_rss_mb),
+    }
+
+
+def run_chunking_benchmark(
+    strategies: Optional[List[str]] = None,
+    corpora: Optional[List[str]] = None,
+    sizes: Optional[List[str]] = None,
+    repeat: int = 3,
+    isolate: bool = True,
+    output_path: Optional[str] = "chunking_benchmark.json",
+) -> dict:
+    """
+    Benchmark each strategy on each (corpus kind, size) pair. With
+    ``isolate`` every case generates its corpus in a fresh spawned process,
+    so peak RSS belongs to that case rather than to everything run before.
+    """
+    strategies = strategies or list(STRATEGY_MAP)
+    corpora = corpora or list(CORPUS_KINDS)
+    sizes = sorted(sizes or list(DEFAULT_SIZES), key=parse_size)
+    unknown = [s for s in strategies if s not in STRATEGY_MAP]
+    if unknown:
+        raise ValueError(f"Unknown chunking strategies: {unknown}")
+    results = []
+    for size in sizes:
+        for kind in corpora:
+            for name in strategies:
+                logging.info("Benchmarking %s on %s/%s", name, kind, size)
+                if isolate:
+                    with concurrent.futures.ProcessPoolExecutor(
+                        max_workers=1, mp_context=multiprocessing.get_context("spawn")
+                    ) as pool:
+                        row = pool.submit(
+                            bench_strategy, name, kind, size, repeat
+                        ).result()
+                else:
+                    row = bench_strategy(name, kind, size, repeat=repeat)
+                results.append(row)
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "isolated": isolate,
+        "results": results,
+    }
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        logging.info("Chunking benchmark complete. Results saved to %s", output_path)
+    return report
+
+
+def compare_to_baseline(
+    report: dict, baseline: dict, max_regression_pct: float = 10.0
+) -> List[dict]:
+    """
+    Return one entry per (strategy, corpus, size) that fails the gate: MB/s
+    dropped by more than ``max_regression_pct`` percent (``reason`` "slower"),
+    a baseline case has no result ("missing_result"), or a result has no
+    baseline to be checked against ("missing_baseline").
+    """
+
+    def key(r):
+        return r["strategy"], r["corpus"], r["size"]
+
+    base = {key(r): r for r in baseline.get("results", [])}
+    current = {key(r): r for r in report.get("results", [])}
+    failures = []
+    for case in sorted(set(base) - set(current)):
+        failures.append(
+            {
+                "strategy": case[0],
+                "corpus": case[1],
+                "size": case[2],
+                "reason": "missing_result",
+            }
+        )
+    for row in report.get("results", []):
+        ref = base.get(key(row))
+        if not ref:
+            failures.append(
+                {
+                    "strategy": row["strategy"],
+                    "corpus": row["corpus"],
+                    "size": row["size"],
+                    "reason": "missing_baseline",
+                }
+            )
+            continue
+        if ref["mb_per_s"] <= 0:
+            continue
+        drop_pct = (1 - row["mb_per_s"] / ref["mb_per_s"]) * 100
+        if drop_pct > max_regression_pct:
+            failures.append(
+                {
+                    "strategy": row["strategy"],
+                    "corpus": row["corpus"],
+                    "size": row["size"],
+                    "reason": "slower",
+                    "baseline_mb_per_s": ref["mb_per_s"],
+                    "mb_per_s": row["mb_per_s"],
+                    "drop_pct": drop_pct,
+                }
+            )
+    return failures
+
+
+if __name__ == "__main__":
+    config_loader = get_config_loader()
+    bench_config = (
+        config_loader.get_section("chunking_benchmark")
+        if "chunking_benchmark" in config_loader.config
+        else {}
+    )
+    parser = argparse.ArgumentParser(
+        description="Benchmark chunking strategies. CLI flags override config."
+    )
+    parser.add_argument(
+        "--strategies",
+        type=str,
+        nargs="*",
+        default=bench_config.get("strategies"),
+        help="Strategies to run (default: all in STRATEGY_MAP)",
+    )
+    parser.add_argument(
+        "--corpora",
+        type=str,
+        nargs="*",
+        default=bench_config.get("corpora", list(CORPUS_KINDS)),
+        help="Corpus kinds: prose, jsonl, syslog",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=str,
+        nargs="*",
+        default=bench_config.get("sizes", list(DEFAULT_SIZES)),
+        help="Corpus sizes, e.g. 1KB 1MB 1GB",
+    )
+    parser.add_argument("--repeat", type=int, default=bench_config.get("repeat", 3))
+    parser.add_argument(
+        "--no-isolate",
+        action="store_true",
+        help="Run every case in this process (peak RSS becomes cumulative)",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=bench_config.get("output_path", "chunking_benchmark.json"),
+        help="Output path for the JSON report",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=bench_config.get("baseline_path"),
+        help="Baseline report to compare against; enables the regression gate",
+    )
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=bench_config.get("max_regression_pct", 10.0),
+        help="Max allowed MB/s drop in percent before failing",
+    )
+    args = parser.parse_args()
+
+    report = run_chunking_benchmark(
+        strategies=args.strategies,
+        corpora=args.corpora,
+        sizes=args.sizes,
+        repeat=args.repeat,
+        isolate=not args.no_isolate,
+        output_path=args.output,
+    )
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.max_regression)
+        for r in regressions:
+            if r["reason"] != "slower":
+                logging.error(
+                    "Gate failed: %s on %s/%s (%s)",
+                    r["strategy"],
+                    r["corpus"],
+                    r["size"],
+                    r["reason"],
+                )
+                continue
+            logging.error(
+                "Regression: %s on %s/%s %.1f -> %.1f MB/s (-%.1f%%)",
+                r["strategy"],
+                r["corpus"],
+                r["size"],
+                r["baseline_mb_per_s"],
+                r["mb_per_s"],
+                r["drop_pct"],
+            )
+        if regressions:
+            sys.exit(1)
+        logging.info("No throughput regressions over %.1f%%", args.max_regression)
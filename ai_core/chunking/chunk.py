@@ -2,8 +2,12 @@
 Chunking module for text processing.
 """
 
-from typing import List, Dict, Any
+import functools
+import itertools
+import re
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple
 from abc import ABC, abstractmethod
+import numpy as np
 from pydantic import BaseModel
 from infra.utils.config_loader import get_config_loader
 
@@ -23,241 +27,743 @@ class Chunk(BaseModel):
         return self.__str__()
 
 
+# (start_offset, end_offset, chunk_index) of one chunk within its document
+Span = Tuple[int, int, int]
+# A span plus the chunk text sliced in the same pass
+Part = Tuple[int, int, int, str]
+
+
+class ChunkBatch:
+    """
+    Columnar container for the chunks of one or more documents.
+
+    All documents share a single ``source`` buffer. Per-chunk fields are
+    NumPy int64 arrays and doc ids are stored once per document, with
+    ``doc_ptr`` marking which rows belong to which document (rows of document
+    ``d`` are ``doc_ptr[d]:doc_ptr[d + 1]``). Offsets are relative to each
+    document, exactly as on :class:`Chunk`. Chunk text is never copied until
+    it is accessed via :meth:`text`, and a pydantic :class:`Chunk` is only
+    built when a row is indexed.
+    """
+
+    __slots__ = (
+        "source",
+        "start_offset",
+        "end_offset",
+        "chunk_index",
+        "doc_ids",
+        "doc_ptr",
+        "doc_base",
+    )
+
+    def __init__(
+        self,
+        source: str,
+        start_offset: np.ndarray,
+        end_offset: np.ndarray,
+        chunk_index: np.ndarray,
+        doc_ids: Sequence[str] = ("",),
+        doc_ptr: Optional[np.ndarray] = None,
+        doc_base: Optional[np.ndarray] = None,
+    ):
+        self.source = source
+        self.start_offset = np.asarray(start_offset, dtype=np.int64)
+        self.end_offset = np.asarray(end_offset, dtype=np.int64)
+        self.chunk_index = np.asarray(chunk_index, dtype=np.int64)
+        self.doc_ids = list(doc_ids)
+        n_rows = len(self.start_offset)
+        if doc_ptr is None:
+            doc_ptr = [0, n_rows]
+        if doc_base is None:
+            doc_base = np.zeros(len(self.doc_ids), dtype=np.int64)
+        self.doc_ptr = np.asarray(doc_ptr, dtype=np.int64)
+        self.doc_base = np.asarray(doc_base, dtype=np.int64)
+        if not (len(self.end_offset) == len(self.chunk_index) == n_rows):
+            raise ValueError("Offset and index arrays must have the same length.")
+        if len(self.doc_ptr) != len(self.doc_ids) + 1 or self.doc_ptr[-1] != n_rows:
+            raise ValueError("doc_ptr must have one entry per document plus one.")
+        if len(self.doc_base) != len(self.doc_ids):
+            raise ValueError("doc_base must have one entry per document.")
+
+    @classmethod
+    def from_spans(
+        cls,
+        texts: Sequence[str],
+        spans: Iterable[Iterable[Span]],
+        doc_ids: Optional[Sequence[str]] = None,
+    ) -> "ChunkBatch":
+        """Build a batch from one iterable of spans per document."""
+        tables = [
+            np.fromiter(
+                itertools.chain.from_iterable(doc_spans), dtype=np.int64
+            ).reshape(-1, 3)
+            for doc_spans in spans
+        ]
+        return cls.from_tables(texts, tables, doc_ids)
+
+    @classmethod
+    def from_tables(
+        cls,
+        texts: Sequence[str],
+        tables: Sequence[np.ndarray],
+        doc_ids: Optional[Sequence[str]] = None,
+    ) -> "ChunkBatch":
+        """
+        Build a batch from one ``(n, 3)`` int64 array of
+        (start_offset, end_offset, chunk_index) rows per document.
+        """
+        if doc_ids is None:
+            doc_ids = ["" for _ in texts]
+        if len(doc_ids) != len(texts):
+            raise ValueError("Length of doc_ids must match texts.")
+        if len(tables) != len(texts):
+            raise ValueError("Expected one span table per document.")
+        table = np.concatenate(tables) if tables else np.empty((0, 3), dtype=np.int64)
+        counts = np.fromiter(
+            (len(t) for t in tables), dtype=np.int64, count=len(tables)
+        )
+        lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+        doc_base = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+        doc_ptr = np.concatenate(([0], np.cumsum(counts)))
+        return cls(
+            "".join(texts),
+            table[:, 0],
+            table[:, 1],
+            table[:, 2],
+            doc_ids=doc_ids,
+            doc_ptr=doc_ptr,
+            doc_base=doc_base[: len(texts)],
+        )
+
+    def __len__(self) -> int:
+        return len(self.start_offset)
+
+    @property
+    def num_docs(self) -> int:
+        return len(self.doc_ids)
+
+    def doc_index(self, i: int) -> int:
+        """Index of the document that row ``i`` belongs to."""
+        return int(np.searchsorted(self.doc_ptr, i, side="right")) - 1
+
+    def doc_id(self, i: int) -> str:
+        return self.doc_ids[self.doc_index(i)]
+
+    def text(self, i: int) -> str:
+        """Materialize the text of row ``i`` from the shared source buffer."""
+        base = self.doc_base[self.doc_index(i)]
+        return self.source[base + self.start_offset[i] : base + self.end_offset[i]]
+
+    def texts(self) -> Iterator[str]:
+        """Yield chunk texts in row order without building Chunk objects."""
+        for d in range(self.num_docs):
+            base = int(self.doc_base[d])
+            lo, hi = self.doc_ptr[d], self.doc_ptr[d + 1]
+            for start, end in zip(
+                self.start_offset[lo:hi].tolist(), self.end_offset[lo:hi].tolist()
+            ):
+                yield self.source[base + start : base + end]
+
+    def __getitem__(self, i: int) -> Chunk:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("ChunkBatch index out of range.")
+        return Chunk(
+            text=self.text(i),
+            doc_id=self.doc_id(i),
+            chunk_index=int(self.chunk_index[i]),
+            start_offset=int(self.start_offset[i]),
+            end_offset=int(self.end_offset[i]),
+        )
+
+    def __iter__(self) -> Iterator[Chunk]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_chunks(self) -> List[Chunk]:
+        return list(self)
+
+    def doc_chunks(self, d: int) -> List[Chunk]:
+        """Chunks of document ``d`` as a list of pydantic views."""
+        return [self[i] for i in range(self.doc_ptr[d], self.doc_ptr[d + 1])]
+
+
 class ChunkingStrategy(ABC):
+    # True when chunk_columnar computes a whole batch without per-document loops
+    vectorized: bool = False
+    # False when iter_chunks adds metadata that spans (and ChunkBatch) drop
+    span_based: bool = True
+
+    @staticmethod
     @abstractmethod
-    def chunk(self, text: str, doc_id: str = "") -> List[Chunk]:
-        pass
+    def iter_spans(text: str, **params) -> Iterator[Span]:
+        """Lazily yield (start_offset, end_offset, chunk_index) for each chunk."""
+
+    @classmethod
+    def iter_parts(cls, text: str, *args, **params) -> Iterator[Part]:
+        """Yield spans together with their chunk text."""
+        for start, end, idx in cls.iter_spans(text, *args, **params):
+            yield start, end, idx, text[start:end]
+
+    @classmethod
+    def iter_chunks(
+        cls, text: str, doc_id: str = "", *args, **params
+    ) -> Iterator[Chunk]:
+        """Lazily yield chunks one at a time."""
+        for start, end, idx, part in cls.iter_parts(text, *args, **params):
+            yield Chunk(
+                text=part,
+                doc_id=doc_id,
+                chunk_index=idx,
+                start_offset=start,
+                end_offset=end,
+            )
+
+    @classmethod
+    def chunk(cls, text: str, doc_id: str = "", *args, **params) -> List[Chunk]:
+        """Materialize ``iter_chunks`` into a list."""
+        return list(cls.iter_chunks(text, doc_id, *args, **params))
+
+    @classmethod
+    def chunk_columnar(
+        cls, texts: Sequence[str], doc_ids: Optional[Sequence[str]] = None, **params
+    ) -> ChunkBatch:
+        """Chunk ``texts`` into a :class:`ChunkBatch` without per-chunk objects."""
+        return ChunkBatch.from_spans(
+            texts, (cls.iter_spans(t, **params) for t in texts), doc_ids
+        )
+
+
+def _require_text(text) -> None:
+    if not isinstance(text, str) or not text:
+        raise ValueError("Input text must be a non-empty string.")
+
+
+def _drop_text(parts: Iterator[Part]) -> Iterator[Span]:
+    for start, end, idx, _ in parts:
+        yield start, end, idx
+
+
+class RegexSplitter:
+    """
+    Single-pass splitter shared by the delimiter-based strategies.
+
+    ``re.finditer`` over the separator pattern yields exact part spans in one
+    linear scan (repeated parts keep their own offsets), and each part's text
+    is sliced in that same pass. Blank parts are dropped; ``chunk_index``
+    counts the remaining parts, including those shorter than ``min_length``.
+    """
+
+    def __init__(self, separator, strip: bool = False, flags: int = 0):
+        self.pattern = (
+            separator
+            if isinstance(separator, re.Pattern)
+            else re.compile(separator, flags)
+        )
+        self.strip = strip
+
+    def iter_parts(self, text: str, min_length: int = 0) -> Iterator[Part]:
+        idx = 0
+        start = 0
+        for match in itertools.chain(self.pattern.finditer(text), (None,)):
+            end = match.start() if match is not None else len(text)
+            part = text[start:end]
+            part_start = start
+            if match is not None:
+                start = match.end()
+            if not part or part.isspace():
+                continue
+            if self.strip:
+                stripped = part.lstrip()
+                part_start += len(part) - len(stripped)
+                part = stripped.rstrip()
+            if len(part) >= min_length:
+                yield part_start, part_start + len(part), idx, part
+            idx += 1
+
+
+PARAGRAPH_SPLITTER = RegexSplitter(r"\n\n")
+SENTENCE_SPLITTER = RegexSplitter(r"(?<=[.!?])\s+", strip=True)
+
+
+@functools.lru_cache(maxsize=64)
+def _custom_splitter(delimiter: str, rules: Tuple[Tuple[str, str], ...]):
+    alternatives = [re.escape(delimiter)] if delimiter else []
+    for name, pattern in rules:
+        try:
+            re.compile(pattern, re.MULTILINE)
+        except re.error as e:
+            raise ValueError(f"Invalid regex for rule '{name}': {e}") from e
+        alternatives.append(f"(?:{pattern})")
+    if not alternatives:
+        return None
+    return RegexSplitter("|".join(alternatives), flags=re.MULTILINE)
 
 
 class FixedChunkingStrategy(ChunkingStrategy):
+    vectorized = True
+
     @staticmethod
-    def chunk(
+    def iter_spans(
         text: str,
-        doc_id: str = "",
         chunk_size: int = 512,
         overlap: int = 0,
         min_length: int = 0,
-    ) -> List[Chunk]:
-        if not isinstance(text, str) or not text:
-            raise ValueError("Input text must be a non-empty string.")
-        chunks = []
-        start = 0
-        idx = 0
-        while start < len(text):
-            end = min(start + chunk_size, len(text))
-            chunk_text = text[start:end]
-            if len(chunk_text) >= min_length:
-                chunks.append(
-                    Chunk(
-                        text=chunk_text,
-                        doc_id=doc_id,
-                        chunk_index=idx,
-                        start_offset=start,
-                        end_offset=end,
-                    )
-                )
-                idx += 1
-            start += chunk_size - overlap if chunk_size > overlap else chunk_size
-        return chunks
+    ) -> Iterator[Span]:
+        _require_text(text)
+        return _fixed_spans(0, len(text), chunk_size, overlap, min_length)
+
+    @classmethod
+    def chunk_columnar(
+        cls,
+        texts: Sequence[str],
+        doc_ids: Optional[Sequence[str]] = None,
+        chunk_size: int = 512,
+        overlap: int = 0,
+        min_length: int = 0,
+    ) -> ChunkBatch:
+        """Vectorized over the whole batch; no per-document Python loop."""
+        step = chunk_size - overlap if chunk_size > overlap else chunk_size
+        return _window_batch(texts, doc_ids, chunk_size, step, min_length, False)
+
+
+def _fixed_spans(
+    lo: int, hi: int, chunk_size: int, overlap: int, min_length: int
+) -> Iterator[Span]:
+    step = chunk_size - overlap if chunk_size > overlap else chunk_size
+    idx = 0
+    for start in range(lo, hi, step):
+        end = min(start + chunk_size, hi)
+        if end - start >= min_length:
+            yield start, end, idx
+            idx += 1
+
+
+def _window_batch(
+    texts: Sequence[str],
+    doc_ids: Optional[Sequence[str]],
+    size: int,
+    step: int,
+    min_length: int,
+    stop_at_end: bool,
+) -> ChunkBatch:
+    """
+    Window offsets for a whole batch of documents at once. The number of
+    windows per document is derived from its length, every window start is
+    laid out with one ``arange`` over the batch, ends are clipped with
+    ``minimum`` and ``min_length`` is applied as a mask. ``stop_at_end``
+    drops the windows after the first one that reaches the end of its
+    document (sliding-window semantics).
+    """
+    for text in texts:
+        _require_text(text)
+    if step < 1:
+        raise ValueError(f"Window step must be positive, got {step}.")
+    if doc_ids is None:
+        doc_ids = ["" for _ in texts]
+    if len(doc_ids) != len(texts):
+        raise ValueError("Length of doc_ids must match texts.")
+    n_docs = len(texts)
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=n_docs)
+    counts = -(-lengths // step)
+    if stop_at_end:
+        counts = np.minimum(counts, np.maximum(-(-(lengths - size) // step), 0) + 1)
+    doc_of_row = np.repeat(np.arange(n_docs), counts)
+    first_row = np.cumsum(counts) - counts
+    starts = (np.arange(counts.sum(), dtype=np.int64) - first_row[doc_of_row]) * step
+    ends = np.minimum(starts + size, lengths[doc_of_row])
+    keep = ends - starts >= min_length
+    starts, ends, doc_of_row = starts[keep], ends[keep], doc_of_row[keep]
+    kept = np.bincount(doc_of_row, minlength=n_docs).astype(np.int64)
+    doc_ptr = np.concatenate(([0], np.cumsum(kept))).astype(np.int64)
+    # Indices are renumbered per document after filtering, as in iter_spans
+    chunk_index = np.arange(len(starts), dtype=np.int64) - doc_ptr[doc_of_row]
+    return ChunkBatch(
+        "".join(texts),
+        starts,
+        ends,
+        chunk_index,
+        doc_ids=doc_ids,
+        doc_ptr=doc_ptr,
+        doc_base=np.cumsum(lengths) - lengths,
+    )
 
 
 # 2. Semantic Chunking: split by paragraphs (double newline) as a simple semantic proxy
 class SemanticChunkingStrategy(ChunkingStrategy):
     @staticmethod
-    def chunk(text: str, doc_id: str = "", min_length: int = 0) -> List[Chunk]:
-        if not isinstance(text, str) or not text:
-            raise ValueError("Input text must be a non-empty string.")
-        paragraphs = [p for p in text.split("\n\n") if p.strip()]
-        chunks = []
-        for idx, para in enumerate(paragraphs):
-            if len(para) < min_length:
-                continue
-            start_offset = text.find(para)
-            end_offset = start_offset + len(para)
-            chunks.append(
-                Chunk(
-                    text=para,
-                    doc_id=doc_id,
-                    chunk_index=idx,
-                    start_offset=start_offset,
-                    end_offset=end_offset,
-                )
-            )
-        return chunks
+    def iter_parts(text: str, min_length: int = 0) -> Iterator[Part]:
+        _require_text(text)
+        return PARAGRAPH_SPLITTER.iter_parts(text, min_length)
+
+    @staticmethod
+    def iter_spans(text: str, min_length: int = 0) -> Iterator[Span]:
+        return _drop_text(SemanticChunkingStrategy.iter_parts(text, min_length))
 
 
 # 3. Recursive Chunking: try semantic, then fixed if too large
 class RecursiveChunkingStrategy(ChunkingStrategy):
     @staticmethod
-    def chunk(
-        text: str, doc_id: str = "", max_chunk_size: int = 512, min_length: int = 0
-    ) -> List[Chunk]:
-        semantic = SemanticChunkingStrategy()
-        sem_chunks = semantic.chunk(text, doc_id)
-        final_chunks = []
+    def iter_spans(
+        text: str, max_chunk_size: int = 512, min_length: int = 0
+    ) -> Iterator[Span]:
         idx = 0
-        for chunk in sem_chunks:
-            if len(chunk.text) > max_chunk_size:
-                sub_chunks = FixedChunkingStrategy.chunk(
-                    chunk.text, doc_id, max_chunk_size, 0, min_length
-                )
-                for sub in sub_chunks:
-                    sub.chunk_index = idx
-                    final_chunks.append(sub)
+        for start, end, _ in SemanticChunkingStrategy.iter_spans(text):
+            if end - start > max_chunk_size:
+                for sub_start, sub_end, _ in _fixed_spans(
+                    start, end, max_chunk_size, 0, min_length
+                ):
+                    yield sub_start, sub_end, idx
                     idx += 1
             else:
-                chunk.chunk_index = idx
-                final_chunks.append(chunk)
+                yield start, end, idx
                 idx += 1
-        return final_chunks
 
 
 # 4. Sentence Chunking: split by period, exclamation, or question mark
-import re
-
-
 class SentenceChunkingStrategy(ChunkingStrategy):
     @staticmethod
-    def chunk(text: str, doc_id: str = "", min_length: int = 0) -> List[Chunk]:
-        if not isinstance(text, str) or not text:
-            raise ValueError("Input text must be a non-empty string.")
-        sentences = re.split(r"(?<=[.!?])\s+", text)
-        chunks = []
-        offset = 0
-        for idx, sent in enumerate(sentences):
-            sent = sent.strip()
-            if not sent or len(sent) < min_length:
-                continue
-            start_offset = text.find(sent, offset)
-            end_offset = start_offset + len(sent)
-            offset = end_offset
-            chunks.append(
-                Chunk(
-                    text=sent,
-                    doc_id=doc_id,
-                    chunk_index=idx,
-                    start_offset=start_offset,
-                    end_offset=end_offset,
-                )
-            )
-        return chunks
+    def iter_parts(text: str, min_length: int = 0) -> Iterator[Part]:
+        _require_text(text)
+        return SENTENCE_SPLITTER.iter_parts(text, min_length)
+
+    @staticmethod
+    def iter_spans(text: str, min_length: int = 0) -> Iterator[Span]:
+        return _drop_text(SentenceChunkingStrategy.iter_parts(text, min_length))
 
 
 # 5. Token-Based Chunking: requires a tokenizer callable
+def _token_offsets(tokenizer, text: str) -> np.ndarray:
+    """
+    Character (start, end) of every token in ``text`` as an ``(n, 2)`` array.
+
+    Fast (Rust) tokenizers report offsets directly via
+    ``return_offsets_mapping``; plain callables must return string tokens,
+    which are aligned against the text left to right.
+    """
+    if getattr(tokenizer, "is_fast", False):
+        enc = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+        return np.asarray(enc["offset_mapping"], dtype=np.int64).reshape(-1, 2)
+    tokens = tokenizer(text)
+    offsets = np.empty((len(tokens), 2), dtype=np.int64)
+    cursor = 0
+    for i, token in enumerate(tokens):
+        pos = text.find(token, cursor) if isinstance(token, str) else -1
+        if pos == -1:
+            raise ValueError(
+                "Tokenizer must be a fast tokenizer or return string tokens "
+                "that occur in the text."
+            )
+        cursor = pos + len(token)
+        offsets[i] = (pos, cursor)
+    return offsets
+
+
+def _token_window_table(
+    offsets: np.ndarray, chunk_size: int, overlap: int, min_length: int
+) -> np.ndarray:
+    # Windows are computed over token indices, then mapped to characters
+    table = np.fromiter(
+        itertools.chain.from_iterable(
+            _fixed_spans(0, len(offsets), chunk_size, overlap, min_length)
+        ),
+        dtype=np.int64,
+    ).reshape(-1, 3)
+    if len(table):
+        table[:, 1] = offsets[table[:, 1] - 1, 1]
+        table[:, 0] = offsets[table[:, 0], 0]
+    return table
+
+
 class TokenBasedChunkingStrategy(ChunkingStrategy):
+    """
+    Windows of ``chunk_size`` tokens with ``overlap``. Text is tokenized once,
+    chunk text is sliced from the source string, and offsets are character
+    positions like every other strategy. ``min_length`` counts tokens.
+    """
+
     @staticmethod
-    def chunk(
+    def iter_spans(
         text: str,
-        doc_id: str = "",
         tokenizer=None,
         chunk_size: int = 512,
         overlap: int = 0,
         min_length: int = 0,
-    ) -> List[Chunk]:
+    ) -> Iterator[Span]:
         if not callable(tokenizer):
             raise ValueError("Tokenizer must be callable.")
-        tokens = tokenizer(text)
-        chunks = []
-        start = 0
-        idx = 0
-        while start < len(tokens):
-            end = min(start + chunk_size, len(tokens))
-            chunk_tokens = tokens[start:end]
-            chunk_text = (
-                tokenizer.decode(chunk_tokens)
-                if hasattr(tokenizer, "decode")
-                else " ".join(chunk_tokens)
+        table = _token_window_table(
+            _token_offsets(tokenizer, text), chunk_size, overlap, min_length
+        )
+        return map(tuple, table.tolist())
+
+    @classmethod
+    def chunk_columnar(
+        cls,
+        texts: Sequence[str],
+        doc_ids: Optional[Sequence[str]] = None,
+        tokenizer=None,
+        chunk_size: int = 512,
+        overlap: int = 0,
+        min_length: int = 0,
+    ) -> ChunkBatch:
+        """Batch mode: fast tokenizers encode all ``texts`` in a single call."""
+        if not callable(tokenizer):
+            raise ValueError("Tokenizer must be callable.")
+        if getattr(tokenizer, "is_fast", False) and texts:
+            enc = tokenizer(
+                list(texts), add_special_tokens=False, return_offsets_mapping=True
             )
-            if len(chunk_tokens) >= min_length:
-                chunks.append(
-                    Chunk(
-                        text=chunk_text,
-                        doc_id=doc_id,
-                        chunk_index=idx,
-                        start_offset=start,
-                        end_offset=end,
-                    )
-                )
-                idx += 1
-            start += chunk_size - overlap if chunk_size > overlap else chunk_size
-        return chunks
+            all_offsets = [
+                np.asarray(o, dtype=np.int64).reshape(-1, 2)
+                for o in enc["offset_mapping"]
+            ]
+        else:
+            all_offsets = [_token_offsets(tokenizer, t) for t in texts]
+        tables = [
+            _token_window_table(o, chunk_size, overlap, min_length) for o in all_offsets
+        ]
+        return ChunkBatch.from_tables(texts, tables, doc_ids)
 
 
 # 6. Sliding Window Chunking: moving window with overlap
 class SlidingWindowChunkingStrategy(ChunkingStrategy):
+    vectorized = True
+
     @staticmethod
-    def chunk(
+    def iter_spans(
         text: str,
-        doc_id: str = "",
         window_size: int = 512,
         step_size: int = 256,
         min_length: int = 0,
-    ) -> List[Chunk]:
-        if not isinstance(text, str) or not text:
-            raise ValueError("Input text must be a non-empty string.")
-        chunks = []
-        idx = 0
-        for start in range(0, len(text), step_size):
-            end = min(start + window_size, len(text))
-            chunk_text = text[start:end]
-            if len(chunk_text) >= min_length:
-                chunks.append(
-                    Chunk(
-                        text=chunk_text,
-                        doc_id=doc_id,
-                        chunk_index=idx,
-                        start_offset=start,
-                        end_offset=end,
-                    )
-                )
-                idx += 1
-            if end == len(text):
-                break
-        return chunks
+    ) -> Iterator[Span]:
+        _require_text(text)
+        return _sliding_spans(len(text), window_size, step_size, min_length)
+
+    @classmethod
+    def chunk_columnar(
+        cls,
+        texts: Sequence[str],
+        doc_ids: Optional[Sequence[str]] = None,
+        window_size: int = 512,
+        step_size: int = 256,
+        min_length: int = 0,
+    ) -> ChunkBatch:
+        """Vectorized over the whole batch; no per-document Python loop."""
+        return _window_batch(texts, doc_ids, window_size, step_size, min_length, True)
+
+
+def _sliding_spans(
+    length: int, window_size: int, step_size: int, min_length: int
+) -> Iterator[Span]:
+    idx = 0
+    for start in range(0, length, step_size):
+        end = min(start + window_size, length)
+        if end - start >= min_length:
+            yield start, end, idx
+            idx += 1
+        if end == length:
+            break
 
 
 # 7. Custom/Heuristic Chunking: split by custom delimiter or rule
 class CustomHeuristicChunkingStrategy(ChunkingStrategy):
+    """
+    Splits on ``delimiter`` and on every regex in ``rules`` (a mapping of
+    rule name to pattern, compiled with ``re.MULTILINE``), in a single pass.
+    Non-string rule values are ignored.
+    """
+
     @staticmethod
-    def chunk(
+    def iter_parts(
         text: str,
-        doc_id: str = "",
         delimiter: str = "\n---\n",
         min_length: int = 0,
         rules: dict = None,
-    ) -> List[Chunk]:
-        if not isinstance(text, str) or not text:
-            raise ValueError("Input text must be a non-empty string.")
-        # If delimiter is empty, treat the whole text as one chunk
-        if delimiter == "":
-            if len(text) < min_length:
-                return []
-            return [
-                Chunk(
-                    text=text,
-                    doc_id=doc_id,
-                    chunk_index=0,
-                    start_offset=0,
-                    end_offset=len(text),
-                )
-            ]
-        parts = [p for p in text.split(delimiter) if p.strip()]
-        chunks = []
-        for idx, part in enumerate(parts):
-            if len(part) < min_length:
+    ) -> Iterator[Part]:
+        _require_text(text)
+        patterns = tuple(
+            sorted((k, v) for k, v in (rules or {}).items() if isinstance(v, str))
+        )
+        splitter = _custom_splitter(delimiter, patterns)
+        # With no delimiter and no rules, treat the whole text as one chunk
+        if splitter is None:
+            return iter([(0, len(text), 0, text)] if len(text) >= min_length else [])
+        return splitter.iter_parts(text, min_length)
+
+    @staticmethod
+    def iter_spans(
+        text: str,
+        delimiter: str = "\n---\n",
+        min_length: int = 0,
+        rules: dict = None,
+    ) -> Iterator[Span]:
+        return _drop_text(
+            CustomHeuristicChunkingStrategy.iter_parts(
+                text, delimiter, min_length, rules
+            )
+        )
+
+
+# 8. JSON Record Chunking: pack whole JSON Lines / JSON records up to a size budget
+_LINE = re.compile(r"[^\n]*\n|[^\n]+")
+# Strings are matched whole so braces inside them are never counted
+_JSON_STRUCTURE = re.compile(r'"(?:[^"\\\n]|\\.)*"?|[{}\[\]]')
+
+
+def _json_depth_delta(line: str) -> int:
+    delta = 0
+    for m in _JSON_STRUCTURE.finditer(line):
+        token = m.group()
+        if token in "{[":
+            delta += 1
+        elif token in "}]":
+            delta -= 1
+    return delta
+
+
+def iter_json_records(
+    text: str, max_record: Optional[int] = None
+) -> Iterator[Tuple[int, int]]:
+    """
+    Yield ``(start, end)`` of each top-level record without parsing JSON.
+
+    Records are found with a line scan: a line that starts with ``{`` and
+    ends with ``}`` with balanced braces is taken as a whole JSON Lines
+    record (the fast path, counted in C). Other lines starting with ``{`` or
+    ``[`` are scanned for structural characters outside strings until the
+    nesting depth returns to zero, so pretty-printed objects stay whole. The
+    elements of a top-level array opened on its own line are records, and
+    any other non-blank line (plain log text) is a record of its own.
+    Leading whitespace and a trailing ``,`` are not part of a record.
+
+    An open record that never closes (a truncated line) is given up, and
+    its lines become records of their own, when another unindented ``{`` or
+    ``[`` line starts outside a top-level array, or once the record grows
+    past ``max_record`` characters.
+    """
+    base = depth = 0
+    rec_start = None
+    # (start, end) of each line of the open record, for the per-line fallback
+    rec_lines = []
+    for m in _LINE.finditer(text):
+        line = m.group()
+        body = line.strip()
+        if not body:
+            continue
+        lo = m.start() + len(line) - len(line.lstrip())
+        hi = m.start() + len(line.rstrip().rstrip(",").rstrip())
+        if rec_start is not None and base == 0 and lo == m.start() and body[0] in "{[":
+            yield from rec_lines
+            rec_start, rec_lines, depth = None, [], base
+        if rec_start is None:
+            if body == "[" and depth == 0:
+                base = depth = 1
                 continue
-            start_offset = text.find(part)
-            end_offset = start_offset + len(part)
-            chunks.append(
-                Chunk(
-                    text=part,
-                    doc_id=doc_id,
-                    chunk_index=idx,
-                    start_offset=start_offset,
-                    end_offset=end_offset,
-                )
+            if body in ("]", "],") and base:
+                base = depth = 0
+                continue
+            record = body.rstrip(",").rstrip()
+            if record[:1] not in ("{", "["):
+                yield lo, hi
+                continue
+            if (
+                record[0] == "{"
+                and record[-1] == "}"
+                and record.count("{") == record.count("}")
+                and record.count("[") == record.count("]")
+            ):
+                yield lo, hi
+                continue
+            rec_start = lo
+        rec_lines.append((lo, hi))
+        depth = max(depth + _json_depth_delta(line), base)
+        if depth == base:
+            yield rec_start, hi
+            rec_start, rec_lines = None, []
+        elif max_record is not None and hi - rec_start > max_record:
+            yield from rec_lines
+            rec_start, rec_lines, depth = None, [], base
+    # An unterminated record at the end is still emitted whole
+    if rec_start is not None:
+        yield rec_start, len(text.rstrip())
+
+
+def _pack_records(
+    records: Iterator[Tuple[int, int]], chunk_size: int, min_length: int
+) -> Iterator[Tuple[int, int, int, int]]:
+    # Yields (start, end, record_count, last_record_start) per packed chunk
+    start = end = last = None
+    count = 0
+    for rec_start, rec_end in records:
+        if start is not None and rec_end - start > chunk_size:
+            if end - start >= min_length:
+                yield start, end, count, last
+            start = None
+        if start is None:
+            start, count = rec_start, 0
+        end, last = rec_end, rec_start
+        count += 1
+    if start is not None and end - start >= min_length:
+        yield start, end, count, last
+
+
+class JsonRecordChunkingStrategy(ChunkingStrategy):
+    """
+    Packs whole records from :func:`iter_json_records` into chunks of at most
+    ``chunk_size`` characters; a single-line record larger than the budget
+    becomes its own chunk and is never split, while a multi-line record past
+    the budget falls back to one record per line. Chunks carry ``record_count``,
+    ``first_record_offset`` and ``last_record_offset`` metadata (character
+    positions in the document).
+    """
+
+    span_based = False
+
+    @staticmethod
+    def iter_spans(
+        text: str, chunk_size: int = 4096, min_length: int = 0
+    ) -> Iterator[Span]:
+        _require_text(text)
+        packed = _pack_records(
+            iter_json_records(text, max_record=chunk_size), chunk_size, min_length
+        )
+        return ((start, end, idx) for idx, (start, end, _, _) in enumerate(packed))
+
+    @classmethod
+    def iter_chunks(
+        cls, text: str, doc_id: str = "", chunk_size: int = 4096, min_length: int = 0
+    ) -> Iterator[Chunk]:
+        _require_text(text)
+        packed = _pack_records(
+            iter_json_records(text, max_record=chunk_size), chunk_size, min_length
+        )
+        for idx, (start, end, count, last) in enumerate(packed):
+            yield Chunk(
+                text=text[start:end],
+                doc_id=doc_id,
+                chunk_index=idx,
+                start_offset=start,
+                end_offset=end,
+                metadata={
+                    "record_count": count,
+                    "first_record_offset": start,
+                    "last_record_offset": last,
+                },
             )
-        return chunks
+
+
+STRATEGY_MAP = {
+    "fixed": FixedChunkingStrategy,
+    "semantic": SemanticChunkingStrategy,
+    "recursive": RecursiveChunkingStrategy,
+    "sentence": SentenceChunkingStrategy,
+    "token_based": TokenBasedChunkingStrategy,
+    "sliding_window": SlidingWindowChunkingStrategy,
+    "custom_heuristic": CustomHeuristicChunkingStrategy,
+    "json_records": JsonRecordChunkingStrategy,
+}
 
 
 def get_chunking_strategy_from_config():
@@ -279,6 +785,7 @@ def get_chunking_strategy_from_config():
         "token_based": ["chunk_size", "overlap", "min_length", "tokenizer"],
         "sliding_window": ["window_size", "step_size", "min_length"],
         "custom_heuristic": ["delimiter", "min_length", "rules"],
+        "json_records": ["chunk_size", "min_length"],
     }
     if strategy not in required:
         raise ValueError(f"Unknown chunking strategy: {strategy}")
@@ -288,39 +795,222 @@ def get_chunking_strategy_from_config():
             f"Missing required parameters for strategy '{strategy}': {missing}"
         )
     # Return a tuple: (strategy class, params dict)
-    strategy_map = {
-        "fixed": FixedChunkingStrategy,
-        "semantic": SemanticChunkingStrategy,
-        "recursive": RecursiveChunkingStrategy,
-        "sentence": SentenceChunkingStrategy,
-        "token_based": TokenBasedChunkingStrategy,
-        "sliding_window": SlidingWindowChunkingStrategy,
-        "custom_heuristic": CustomHeuristicChunkingStrategy,
-    }
-    return strategy_map[strategy], params
+    return STRATEGY_MAP[strategy], params
 
 
 import concurrent.futures
+import heapq
+import multiprocessing
+import pickle
+import threading
+
+EXECUTOR_TYPES = ("thread", "process")
+# fork would copy a multithreaded parent (tokenizer, BLAS, server threads)
+START_METHODS = ("spawn", "forkserver")
+
+
+def _balanced_groups(lengths: Sequence[int], n_groups: int) -> List[List[int]]:
+    """
+    Partition document indices into ``n_groups`` groups of similar total
+    length (longest-first greedy), so no worker is left with all large docs.
+    """
+    n_groups = max(1, min(n_groups, len(lengths)))
+    heap = [(0, g) for g in range(n_groups)]
+    groups = [[] for _ in range(n_groups)]
+    for i in sorted(range(len(lengths)), key=lambda i: -lengths[i]):
+        load, g = heapq.heappop(heap)
+        groups[g].append(i)
+        heapq.heappush(heap, (load + lengths[i], g))
+    return [sorted(g) for g in groups if g]
+
+
+def _chunk_span_group(strategy_class, params: Dict[str, Any], texts: List[str]):
+    # Runs in a worker process: return compact offset arrays, not Chunk objects
+    tables = [
+        np.fromiter(
+            itertools.chain.from_iterable(strategy_class.iter_spans(t, **params)),
+            dtype=np.int64,
+        ).reshape(-1, 3)
+        for t in texts
+    ]
+    counts = np.fromiter((len(t) for t in tables), dtype=np.int64, count=len(tables))
+    table = np.concatenate(tables) if tables else np.empty((0, 3), dtype=np.int64)
+    return counts, table
+
+
+def _chunk_group(
+    strategy_class, params: Dict[str, Any], texts: List[str], doc_ids: List[str]
+) -> List[List[Chunk]]:
+    # Runs in a worker process for strategies whose chunks carry metadata
+    return [
+        list(strategy_class.iter_chunks(t, doc_id=d, **params))
+        for t, d in zip(texts, doc_ids)
+    ]
 
 
 class Chunker:
     def __init__(self):
         self.strategy_class, self.params = get_chunking_strategy_from_config()
+        chunking_cfg = get_config_loader().get_section("chunking")
+        self.executor = chunking_cfg.get("executor", "thread")
+        self.max_workers = chunking_cfg.get("max_workers", 4)
+        self.start_method = chunking_cfg.get("start_method", "spawn")
+        if self.executor not in EXECUTOR_TYPES:
+            raise ValueError(
+                f"Unknown chunking executor '{self.executor}', expected one of {EXECUTOR_TYPES}."
+            )
+        if self.start_method not in START_METHODS:
+            raise ValueError(
+                f"Unknown chunking start_method '{self.start_method}', expected one of {START_METHODS}."
+            )
+        # Worker processes are started on first use and kept until close()
+        self._pool = None
+        self._pool_workers = 0
+        self._pool_lock = threading.Lock()
+        self._params_checked = False
 
-    def chunk(self, text: str, doc_id: str = "") -> List[Chunk]:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Shut down the worker processes, if any were started."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def _process_pool(self, max_workers: int) -> concurrent.futures.ProcessPoolExecutor:
+        if not self._params_checked:
+            try:
+                pickle.dumps((self.strategy_class, self.params))
+            except (pickle.PicklingError, TypeError, AttributeError) as e:
+                raise ValueError(
+                    f"Chunking params for {self.strategy_class.__name__} cannot be sent to worker processes ({e}); use a picklable tokenizer or executor 'thread'."
+                ) from e
+            self._params_checked = True
+        with self._pool_lock:
+            if self._pool is not None and self._pool_workers != max_workers:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+            if self._pool is None:
+                self._pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                )
+                self._pool_workers = max_workers
+            return self._pool
+
+    def _map_groups(self, fn, groups, max_workers: int, *args):
+        """
+        Run ``fn(strategy_class, params, *[[arg[i] for i in group] ...])`` for
+        each group on the worker pool; yield ``(group, result)`` as they finish.
+        """
+        pool = self._process_pool(max_workers)
+        try:
+            futures = {
+                pool.submit(
+                    fn,
+                    self.strategy_class,
+                    self.params,
+                    *[[arg[i] for i in group] for arg in args],
+                ): group
+                for group in groups
+            }
+            for future in concurrent.futures.as_completed(futures):
+                yield futures[future], future.result()
+        except concurrent.futures.BrokenExecutor:
+            # A dead worker poisons the pool; start a fresh one next call
+            with self._pool_lock:
+                if self._pool is pool:
+                    self._pool = None
+            raise
+
+    def iter_chunks(self, text: str, doc_id: str = "") -> Iterator[Chunk]:
         # Dynamically pass params to the static method
-        return self.strategy_class.chunk(text, doc_id=doc_id, **self.params)
+        return self.strategy_class.iter_chunks(text, doc_id=doc_id, **self.params)
+
+    def chunk(self, text: str, doc_id: str = "") -> List[Chunk]:
+        return list(self.iter_chunks(text, doc_id))
+
+    def chunk_columnar(
+        self,
+        texts: List[str],
+        doc_ids: List[str] = None,
+        executor: str = None,
+        max_workers: int = None,
+    ) -> ChunkBatch:
+        """
+        Chunk many documents into one :class:`ChunkBatch`. With the ``process``
+        executor, documents are sent to the chunker's long-lived worker
+        processes in size-balanced groups and only offset arrays come back. Vectorized strategies are
+        always computed in-process, where a batch costs a few array ops.
+        Rows carry offsets only; use :meth:`chunk_batch` when a strategy's
+        chunk metadata is needed.
+        """
+        executor = executor or self.executor
+        max_workers = max_workers or self.max_workers
+        if executor not in EXECUTOR_TYPES:
+            raise ValueError(f"Unknown chunking executor '{executor}'.")
+        if (
+            executor != "process"
+            or max_workers < 2
+            or len(texts) < 2
+            or self.strategy_class.vectorized
+        ):
+            return self.strategy_class.chunk_columnar(texts, doc_ids, **self.params)
+        if doc_ids is not None and len(doc_ids) != len(texts):
+            raise ValueError("Length of doc_ids must match texts.")
+        # Several groups per worker smooths out uneven per-document cost
+        groups = _balanced_groups([len(t) for t in texts], max_workers * 4)
+        tables = [None] * len(texts)
+        for group, (counts, table) in self._map_groups(
+            _chunk_span_group, groups, max_workers, texts
+        ):
+            for i, rows in zip(group, np.split(table, np.cumsum(counts)[:-1])):
+                tables[i] = rows
+        return ChunkBatch.from_tables(texts, tables, doc_ids)
+
+    def _chunk_batch_processes(
+        self, texts: List[str], doc_ids: List[str], max_workers: int
+    ) -> List[List[Chunk]]:
+        """
+        Process-pool path for strategies that are not span-based: workers
+        run ``iter_chunks`` and send back whole Chunks, metadata included.
+        """
+        groups = _balanced_groups([len(t) for t in texts], max_workers * 4)
+        results = [None] * len(texts)
+        for group, doc_chunks in self._map_groups(
+            _chunk_group, groups, max_workers, texts, doc_ids
+        ):
+            for i, chunks in zip(group, doc_chunks):
+                results[i] = chunks
+        return results
 
     def chunk_batch(
-        self, texts: List[str], doc_ids: List[str] = None, max_workers: int = 4
+        self,
+        texts: List[str],
+        doc_ids: List[str] = None,
+        max_workers: int = None,
+        executor: str = None,
     ) -> List[List[Chunk]]:
         if doc_ids is None:
             doc_ids = ["" for _ in texts]
         if len(doc_ids) != len(texts):
             raise ValueError("Length of doc_ids must match texts.")
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        executor = executor or self.executor
+        max_workers = max_workers or self.max_workers
+        if not self.strategy_class.span_based:
+            if executor == "process" and max_workers > 1 and len(texts) > 1:
+                return self._chunk_batch_processes(texts, doc_ids, max_workers)
+        elif executor == "process" or self.strategy_class.vectorized:
+            batch = self.chunk_columnar(texts, doc_ids, executor, max_workers)
+            return [batch.doc_chunks(d) for d in range(batch.num_docs)]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
             futures = [
-                executor.submit(self.chunk, text, doc_id)
+                pool.submit(self.chunk, text, doc_id)
                 for text, doc_id in zip(texts, doc_ids)
             ]
             return [f.result() for f in futures]
@@ -3,24 +3,16 @@ Chunking module for text processing.
 Extensible for different chunking strategies.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 from pydantic import BaseModel, Field, ValidationError
-from ai_core.chunking.chunk import (
-    Chunk,
-    FixedChunkingStrategy,
-    SemanticChunkingStrategy,
-    RecursiveChunkingStrategy,
-    SentenceChunkingStrategy,
-    TokenBasedChunkingStrategy,
-    SlidingWindowChunkingStrategy,
-    CustomHeuristicChunkingStrategy,
-)
+from ai_core.chunking.chunk import STRATEGY_MAP, Chunk, ChunkBatch
 
 
 class ChunkingConfig(BaseModel):
     # Common
     strategy: str = Field(
-        "fixed", description="Chunking strategy: fixed, semantic, recursive"
+        "fixed",
+        description="Chunking strategy: fixed, semantic, recursive, json_records",
     )
     # Fixed
     chunk_size: int = Field(
@@ -43,17 +35,16 @@ class ChunkingConfig(BaseModel):
 class Chunker:
     def __init__(self, config: ChunkingConfig):
         self.config = config
-        self.strategy_map = {
-            "fixed": FixedChunkingStrategy,
-            "semantic": SemanticChunkingStrategy,
-            "recursive": RecursiveChunkingStrategy,
-            "sentence": SentenceChunkingStrategy,
-            "token_based": TokenBasedChunkingStrategy,
-            "sliding_window": SlidingWindowChunkingStrategy,
-            "custom_heuristic": CustomHeuristicChunkingStrategy,
-        }
+        self.strategy_map = dict(STRATEGY_MAP)
 
     def chunk(self, text: str, doc_id: str = "", **kwargs) -> List[Chunk]:
+        return list(self.iter_chunks(text, doc_id=doc_id, **kwargs))
+
+    def iter_chunks(self, text: str, doc_id: str = "", **kwargs) -> Iterator[Chunk]:
+        """
+        Lazily yield chunks for ``text``. Input and strategy are validated
+        eagerly; chunks are only built as the caller consumes them.
+        """
         if not isinstance(text, str) or not text:
             raise ValueError("Input text must be a non-empty string.")
         strategy = self.config.strategy
@@ -64,7 +55,23 @@ class Chunker:
         # Build params for the strategy
         params = self._get_strategy_params(strategy)
         params.update(kwargs)
-        return self.strategy_map[strategy].chunk(text, doc_id=doc_id, **params)
+        return self.strategy_map[strategy].iter_chunks(text, doc_id=doc_id, **params)
+
+    def chunk_columnar(
+        self, texts: List[str], doc_ids: Optional[List[str]] = None, **kwargs
+    ) -> ChunkBatch:
+        """Chunk many documents into a single columnar :class:`ChunkBatch`."""
+        for text in texts:
+            if not isinstance(text, str) or not text:
+                raise ValueError("Input text must be a non-empty string.")
+        strategy = self.config.strategy
+        if strategy not in self.strategy_map:
+            raise NotImplementedError(
+                f"Chunking strategy '{strategy}' not implemented."
+            )
+        params = self._get_strategy_params(strategy)
+        params.update(kwargs)
+        return self.strategy_map[strategy].chunk_columnar(texts, doc_ids, **params)
 
     def _get_strategy_params(self, strategy: str) -> Dict[str, Any]:
         # Map config fields to strategy params
@@ -96,6 +103,8 @@ class Chunker:
                 min_length=c.min_length,
                 rules=getattr(c, "rules", None),
             )
+        elif strategy == "json_records":
+            return dict(chunk_size=c.chunk_size, min_length=c.min_length)
         return {}
 
 
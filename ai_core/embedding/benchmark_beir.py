@@ -14,6 +14,8 @@ from beir.retrieval.evaluation import EvaluateRetrieval
 from beir.retrieval.search.dense import DenseRetrievalExactSearch as DRES
 from sentence_transformers import SentenceTransformer
 from ai_core.embedding.embedding import EmbeddingModel
+from ai_core.embedding.projection import reduction_tradeoff
+from ai_core.embedding.quantization import quantization_tradeoff
 from infra.utils.config_loader import get_config_loader
 
 
@@ -59,11 +61,68 @@ class ShieldCraftEmbeddingAdapter:
 logging.basicConfig(level=logging.INFO)
 
 
+def encode_for_report(adapter, corpus, queries, qrels, batch_size=32):
+    """
+    Embed the whole corpus and the judged queries once for the trade-off
+    reports. Returns ``(corpus_emb, query_emb, relevant)`` where
+    ``relevant[i]`` lists the corpus rows judged relevant to query ``i``.
+    """
+    doc_ids = list(corpus)
+    query_ids = [q for q in queries if q in qrels]
+    row = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+    docs = [
+        (corpus[d].get("title", "") + " " + corpus[d].get("text", "")).strip()
+        for d in doc_ids
+    ]
+    corpus_emb = adapter.encode(docs, batch_size=batch_size)
+    query_emb = adapter.encode([queries[q] for q in query_ids], batch_size=batch_size)
+    relevant = [
+        [row[d] for d, score in qrels[q].items() if score > 0 and d in row]
+        for q in query_ids
+    ]
+    return corpus_emb, query_emb, relevant
+
+
+def dimension_report(corpus_emb, query_emb, relevant, dims):
+    """
+    Recall vs. bytes/latency of PCA-reduced embeddings at each width in
+    ``dims``, using exact search over the whole corpus.
+    """
+    report = reduction_tradeoff(corpus_emb, query_emb, relevant, dims=dims)
+    for entry in report:
+        logging.info(
+            f"Dim {entry['dim']}: recall@10 {entry['recall@10']:.4f} | "
+            f"{entry['bytes_per_vector']} B/vector | "
+            f"{entry['search_ms_per_query']:.3f} ms/query"
+        )
+    return report
+
+
+def quantization_report(corpus_emb, query_emb, relevant, candidates=200):
+    """
+    Recall vs. resident memory/latency of exact float search and two-stage
+    int8/binary search with float rescoring of ``candidates`` hits.
+    """
+    report = quantization_tradeoff(
+        corpus_emb, query_emb, relevant, candidates=candidates
+    )
+    for entry in report:
+        logging.info(
+            f"Codes {entry['codes']}: recall@10 {entry['recall@10']:.4f} | "
+            f"{entry['compression']:.1f}x smaller | "
+            f"{entry['search_ms_per_query']:.3f} ms/query"
+        )
+    return report
+
+
 def run_beir(
     datasets=["scifact"],
     data_path="./beir_datasets",
     output_path="beir_results.json",
     batch_size=32,
+    dims=None,
+    quantized=False,
+    rescore_candidates=200,
 ):
     """
     Run BEIR benchmark in parallel for the specified datasets.
@@ -71,6 +130,9 @@ def run_beir(
     :param data_path: Path to download/load BEIR datasets
     :param output_path: Where to save results
     :param batch_size: Batch size for encoding
+    :param dims: Embedding widths for the reduction trade-off report (optional)
+    :param quantized: Also report int8/binary two-stage search vs. float search
+    :param rescore_candidates: Code hits rescored in float per query
     """
 
     def run_single_dataset(dataset):
@@ -94,6 +156,18 @@ def run_beir(
                 "Recall": recall,
                 "Precision": precision,
             }
+            if dims or quantized:
+                embedded = encode_for_report(
+                    adapter, corpus, queries, qrels, batch_size=batch_size
+                )
+            if dims:
+                logging.info(f"Running dimensionality trade-off on {dataset}")
+                metrics["Dimensions"] = dimension_report(*embedded, dims)
+            if quantized:
+                logging.info(f"Running quantized-code trade-off on {dataset}")
+                metrics["Quantization"] = quantization_report(
+                    *embedded, candidates=rescore_candidates
+                )
             return {"dataset": dataset, "metrics": metrics, "success": True}
         except Exception as e:
             logging.error(f"Dataset {dataset} failed: {e}")
@@ -165,6 +239,25 @@ if __name__ == "__main__":
         default=beir_config.get("batch_size", 32),
         help="Batch size for encoding (default: from config)",
     )
+    parser.add_argument(
+        "--dims",
+        type=int,
+        nargs="*",
+        default=beir_config.get("dims", []),
+        help="Embedding widths for the recall vs. size/latency report (default: from config)",
+    )
+    parser.add_argument(
+        "--quantized",
+        action=argparse.BooleanOptionalAction,
+        default=beir_config.get("quantized", False),
+        help="Report int8/binary two-stage search vs. float search (default: from config)",
+    )
+    parser.add_argument(
+        "--rescore-candidates",
+        type=int,
+        default=beir_config.get("rescore_candidates", 200),
+        help="Code hits rescored in float per query (default: from config)",
+    )
     args = parser.parse_args()
 
     run_beir(
@@ -172,4 +265,7 @@ if __name__ == "__main__":
         data_path=args.data_path,
         output_path=args.output,
         batch_size=args.batch_size,
+        dims=args.dims,
+        quantized=args.quantized,
+        rescore_candidates=args.rescore_candidates,
     )
@@ -0,0 +1,331 @@
+"""
+ShieldCraft AI - Offline Embedding Throughput Benchmark
+Sweeps EmbeddingModel over batch size, torch thread count, quantization type
+and backend on generated security-log texts of controlled token length, and
+records docs/s, tokens/s, per-batch latency percentiles and peak RSS. Needs
+no dataset downloads; point it at a locally cached (tiny) model for CPU runs.
+"""
+
+import argparse
+import concurrent.futures
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import time
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+
+from infra.utils.config_loader import get_config_loader
+
+logging.basicConfig(level=logging.INFO)
+
+QUANTIZATIONS = ("none", "float16", "int8", "bitsandbytes")
+BACKENDS = ("torch", "onnx")
+
+_FIELDS = (
+    "GuardDuty finding UnauthorizedAccess:IAMUser/ConsoleLogin severity high",
+    "CloudTrail AssumeRole by arn:aws:iam::123456789012:role/build from 10.0.4.17",
+    "sshd Failed publickey for admin from 203.0.113.9 port 51022",
+    "S3 PutBucketPolicy made bucket shieldcraft-logs public",
+    "VPC flow REJECT egress 10.0.8.23:443 -> 198.51.100.4:8443 tcp",
+    "IAM access key AKIA rotated overdue for principal ci-deployer",
+    "WAF blocked SQL injection pattern on /api/v1/login",
+    "Lambda shieldcraft-ingest timed out after 900 seconds",
+)
+
+
+def generate_texts(
+    n: int, target_tokens: int, tokens_per_word: float = 1.3, seed: int = 0
+) -> List[str]:
+    """
+    ``n`` deterministic security-log texts of roughly ``target_tokens``
+    tokens each, given the tokenizer's measured ``tokens_per_word``.
+    """
+    if n < 1 or target_tokens < 1:
+        raise ValueError(f"Invalid text count {n} or token length {target_tokens}")
+    rng = random.Random(seed)
+    words = max(1, round(target_tokens / tokens_per_word))
+    texts = []
+    for _ in range(n):
+        out = []
+        while len(out) < words:
+            out.extend(rng.choice(_FIELDS).split())
+        texts.append(" ".join(out[:words]))
+    return texts
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024**2) if sys.platform == "darwin" else rss / 1024
+
+
+def _model_config(base: dict, batch_size: int, quantization: str, backend: str):
+    config = dict(base)
+    config.update(
+        {
+            "device": "cpu",
+            "batch_size": batch_size,
+            "backend": backend,
+            "quantize": quantization != "none",
+            "quantization_type": (
+                "float16" if quantization == "none" else quantization
+            ),
+            # Measure the model, not the cache or a token-budget batcher
+            "cache": {"enabled": False},
+            "length_bucketing": False,
+        }
+    )
+    # The ONNX backend quantizes its own export; "none" keeps it fp32
+    onnx_cfg = dict(config.get("onnx") or {})
+    onnx_cfg["quantize_int8"] = quantization == "int8"
+    config["onnx"] = onnx_cfg
+    return config
+
+
+def bench_config(
+    base_config: dict,
+    batch_size: int,
+    threads: int,
+    quantization: str,
+    backend: str,
+    n_texts: int = 256,
+    target_tokens: int = 128,
+    repeat: int = 2,
+) -> dict:
+    """
+    Time one configuration: load and warm the model, then encode ``n_texts``
+    in ``batch_size`` batches ``repeat`` times, keeping every batch latency.
+    """
+    import torch
+
+    from ai_core.embedding.embedding import EmbeddingModel
+
+    previous_threads = torch.get_num_threads()
+    torch.set_num_threads(threads)
+    row = {
+        "batch_size": batch_size,
+        "threads": threads,
+        "quantization": quantization,
+        "backend": backend,
+        "target_tokens": target_tokens,
+        "success": False,
+    }
+    try:
+        model = EmbeddingModel(
+            _model_config(base_config, batch_size, quantization, backend)
+        )
+        start = time.perf_counter()
+        if not model.warmup():
+            row["error"] = model._init_error or "Embedding model not loaded."
+            return row
+        row["load_seconds"] = time.perf_counter() - start
+        # Calibrate words -> tokens on this tokenizer, then count real tokens
+        sample = generate_texts(16, target_tokens)
+        sample_tokens = sum(len(i) for i in model.tokenizer(sample)["input_ids"])
+        sample_words = sum(len(t.split()) for t in sample)
+        texts = generate_texts(
+            n_texts, target_tokens, tokens_per_word=sample_tokens / sample_words
+        )
+        n_tokens = sum(
+            min(len(i), getattr(model.tokenizer, "model_max_length", len(i)))
+            for i in model.tokenizer(texts)["input_ids"]
+        )
+        batches = [texts[i : i + batch_size] for i in range(0, n_texts, batch_size)]
+        repeats = max(1, repeat)
+        latencies = []
+        for _ in range(repeats):
+            for batch in batches:
+                began = time.perf_counter()
+                result = model.encode(batch, batch_size=batch_size)
+                latencies.append(time.perf_counter() - began)
+                if not result["success"]:
+                    row["error"] = result["error"]
+                    return row
+        total = max(sum(latencies), 1e-9)
+        p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+        row.update(
+            {
+                "success": True,
+                "quant_status": model.quant_status,
+                "docs": n_texts,
+                "mean_tokens": n_tokens / n_texts,
+                "docs_per_s": repeats * n_texts / total,
+                "tokens_per_s": repeats * n_tokens / total,
+                "latency_ms_p50": float(p50),
+                "latency_ms_p95": float(p95),
+                "latency_ms_p99": float(p99),
+                "peak_rss_mb": _peak_rss_mb(),
+            }
+        )
+        return row
+    except Exception as e:
+        row["error"] = str(e)
+        return row
+    finally:
+        torch.set_num_threads(previous_threads)
+
+
+def run_throughput_benchmark(
+    batch_sizes: Optional[List[int]] = None,
+    threads: Optional[List[int]] = None,
+    quantizations: Optional[List[str]] = None,
+    backends: Optional[List[str]] = None,
+    token_lengths: Optional[List[int]] = None,
+    n_texts: int = 256,
+    repeat: int = 2,
+    model_name: Optional[str] = None,
+    isolate: bool = True,
+    output_path: Optional[str] = "embedding_throughput.json",
+) -> dict:
+    """
+    Benchmark every combination of the sweep axes. With ``isolate`` each
+    configuration runs in a fresh spawned process, so peak RSS and thread
+    settings are per configuration rather than process-wide.
+    """
+    base_config = dict(get_config_loader().get_section("embedding"))
+    if model_name:
+        base_config["model_name"] = model_name
+    batch_sizes = batch_sizes or [1, 8, 32]
+    threads = threads or [1, os.cpu_count() or 1]
+    quantizations = quantizations or ["none", "int8"]
+    backends = backends or ["torch"]
+    token_lengths = token_lengths or [32, 128]
+    unknown = [q for q in quantizations if q not in QUANTIZATIONS] + [
+        b for b in backends if b not in BACKENDS
+    ]
+    if unknown:
+        raise ValueError(f"Unknown quantization types or backends: {unknown}")
+    sweep = list(
+        itertools.product(token_lengths, backends, quantizations, threads, batch_sizes)
+    )
+    results = []
+    for target_tokens, backend, quantization, n_threads, batch_size in sweep:
+        logging.info(
+            "Benchmarking %s/%s | threads: %d | batch: %d | tokens: %d",
+            backend,
+            quantization,
+            n_threads,
+            batch_size,
+            target_tokens,
+        )
+        args = (base_config, batch_size, n_threads, quantization, backend)
+        kwargs = {"n_texts": n_texts, "target_tokens": target_tokens, "repeat": repeat}
+        if isolate:
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            ) as pool:
+                row = pool.submit(bench_config, *args, **kwargs).result()
+        else:
+            row = bench_config(*args, **kwargs)
+        if not row["success"]:
+            logging.warning("Configuration failed: %s", row.get("error"))
+        results.append(row)
+    report = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": sys.version.split()[0],
+        "cpu_count": os.cpu_count(),
+        "model_name": base_config.get("model_name"),
+        "results": results,
+    }
+    if output_path:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        logging.info("Embedding benchmark complete. Results saved to %s", output_path)
+    return report
+
+
+if __name__ == "__main__":
+    config_loader = get_config_loader()
+    bench_config_section = (
+        config_loader.get_section("embedding_benchmark")
+        if "embedding_benchmark" in config_loader.config
+        else {}
+    )
+    parser = argparse.ArgumentParser(
+        description="Offline EmbeddingModel throughput/latency sweep. CLI flags override config."
+    )
+    parser.add_argument(
+        "--model-name",
+        type=str,
+        default=bench_config_section.get("model_name"),
+        help="Locally cached model to load (default: embedding.model_name)",
+    )
+    parser.add_argument(
+        "--batch-sizes",
+        type=int,
+        nargs="*",
+        default=bench_config_section.get("batch_sizes", [1, 8, 32]),
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        nargs="*",
+        default=bench_config_section.get("threads"),
+        help="torch intra-op thread counts (default: 1 and all cores)",
+    )
+    parser.add_argument(
+        "--quantizations",
+        type=str,
+        nargs="*",
+        default=bench_config_section.get("quantizations", ["none", "int8"]),
+        help="none, float16, int8, bitsandbytes",
+    )
+    parser.add_argument(
+        "--backends",
+        type=str,
+        nargs="*",
+        default=bench_config_section.get("backends", ["torch"]),
+        help="torch, onnx",
+    )
+    parser.add_argument(
+        "--token-lengths",
+        type=int,
+        nargs="*",
+        default=bench_config_section.get("token_lengths", [32, 128]),
+        help="Approximate tokens per synthetic text",
+    )
+    parser.add_argument(
+        "--texts", type=int, default=bench_config_section.get("n_texts", 256)
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=bench_config_section.get("repeat", 2)
+    )
+    parser.add_argument(
+        "--no-isolate",
+        action="store_true",
+        help="Run every configuration in this process (peak RSS becomes cumulative)",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=bench_config_section.get("output_path", "embedding_throughput.json"),
+        help="Output path for the JSON report",
+    )
+    args = parser.parse_args()
+    # Never reach for the Hub: the model must already be in the local cache
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+    report = run_throughput_benchmark(
+        batch_sizes=args.batch_sizes,
+        threads=args.threads,
+        quantizations=args.quantizations,
+        backends=args.backends,
+        token_lengths=args.token_lengths,
+        n_texts=args.texts,
+        repeat=args.repeat,
+        model_name=args.model_name,
+        isolate=not args.no_isolate,
+        output_path=args.output,
+    )
+    failed = [r for r in report["results"] if not r["success"]]
+    if failed:
+        sys.exit(1)
@@ -0,0 +1,163 @@
+"""
+ShieldCraft AI Core - Multi-Process Bulk Embedding
+
+Backfills large text collections with a pool of worker processes. Each
+worker pins its torch thread counts, loads the model once and writes its
+shards straight into a shared ``.npy`` memmap, so embeddings are never
+pickled back to the parent. Only per-shard timings travel over the pipe.
+"""
+
+import concurrent.futures
+import multiprocessing
+import os
+import time
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+from infra.utils.config_loader import get_config_loader
+
+# Per-worker state, set by _init_worker in each child process
+_worker = {}
+
+
+def default_model_factory(config):
+    from ai_core.embedding.embedding import EmbeddingModel
+
+    return EmbeddingModel(config)
+
+
+def infer_embedding_dim(model_name: str) -> int:
+    """Hidden size from the model config alone; no weights are loaded."""
+    from transformers import AutoConfig
+
+    return AutoConfig.from_pretrained(model_name).hidden_size
+
+
+def _init_worker(model_factory, config, threads, output_path):
+    import torch
+
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Only settable before the first parallel op in this process
+        pass
+    model = model_factory(config)
+    # Load weights before the first shard so shard timings measure embedding only
+    if hasattr(model, "warmup"):
+        model.warmup()
+    _worker["model"] = model
+    _worker["out"] = np.load(output_path, mmap_mode="r+")
+
+
+def _embed_shard(start: int, texts: List[str]):
+    began = time.perf_counter()
+    result = _worker["model"].encode(texts)
+    if not result.get("success"):
+        raise RuntimeError(result.get("error") or "Embedding failed.")
+    out = _worker["out"]
+    out[start : start + len(texts)] = result["embeddings"]
+    out.flush()
+    return os.getpid(), len(texts), time.perf_counter() - began
+
+
+def bulk_embed(
+    texts: Sequence[str],
+    output_path: str,
+    config=None,
+    num_workers: Optional[int] = None,
+    threads_per_worker: Optional[int] = None,
+    shard_size: Optional[int] = None,
+    dim: Optional[int] = None,
+    model_factory: Callable = default_model_factory,
+) -> dict:
+    """
+    Embed ``texts`` into a ``(len(texts), dim)`` ``.npy`` file of the
+    configured ``output_dtype`` at ``output_path`` using ``num_workers`` processes with
+    ``threads_per_worker`` torch threads each. Returns a report with the
+    aggregate and per-worker docs/s; on failure ``success`` is False.
+    """
+    if config is None:
+        config = get_config_loader().get_section("embedding")
+    bulk_cfg = config.get("bulk") or {}
+    threads_per_worker = threads_per_worker or bulk_cfg.get("threads_per_worker", 2)
+    num_workers = num_workers or bulk_cfg.get(
+        "num_workers", max(1, (os.cpu_count() or 1) // threads_per_worker)
+    )
+    shard_size = shard_size or bulk_cfg.get("shard_size", 1024)
+    start_method = bulk_cfg.get("start_method", "spawn")
+    from ai_core.embedding.embedding import OUTPUT_DTYPES
+
+    output_dtype = config.get("output_dtype", "float32")
+    result = {"success": False, "output_path": output_path, "error": None}
+    if output_dtype not in OUTPUT_DTYPES:
+        result["error"] = (
+            f"Unknown output_dtype '{output_dtype}', expected one of {OUTPUT_DTYPES}."
+        )
+        return result
+    if not texts:
+        result["error"] = "Input text list is empty."
+        return result
+    if dim is None and config.get("projection_path"):
+        # The model's output is the projection's width, not its hidden size
+        from ai_core.embedding.projection import EmbeddingProjection
+
+        dim = EmbeddingProjection.load(config["projection_path"]).dim
+    if dim is None:
+        from ai_core.embedding.embedding import EMBEDDING_MODEL_NAME
+
+        dim = bulk_cfg.get("dim") or infer_embedding_dim(
+            config.get("model_name", EMBEDDING_MODEL_NAME)
+        )
+    out = np.lib.format.open_memmap(
+        output_path, mode="w+", dtype=output_dtype, shape=(len(texts), dim)
+    )
+    del out
+    shards = [
+        (start, list(texts[start : start + shard_size]))
+        for start in range(0, len(texts), shard_size)
+    ]
+    workers = {}
+    began = time.perf_counter()
+    ctx = multiprocessing.get_context(start_method)
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(num_workers, len(shards)),
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(model_factory, config, threads_per_worker, output_path),
+        ) as pool:
+            futures = [pool.submit(_embed_shard, *shard) for shard in shards]
+            for future in concurrent.futures.as_completed(futures):
+                pid, n_docs, seconds = future.result()
+                stats = workers.setdefault(pid, {"docs": 0, "seconds": 0.0})
+                stats["docs"] += n_docs
+                stats["seconds"] += seconds
+    except Exception as e:
+        result["error"] = f"Bulk embedding failed: {e}"
+        print(f"[ERROR] Bulk embedding failed: {e}")
+        return result
+    elapsed = time.perf_counter() - began
+    for stats in workers.values():
+        stats["docs_per_s"] = stats["docs"] / max(stats["seconds"], 1e-9)
+    result.update(
+        {
+            "success": True,
+            "shape": (len(texts), dim),
+            "dtype": output_dtype,
+            "num_workers": len(workers),
+            "threads_per_worker": threads_per_worker,
+            "seconds": elapsed,
+            "docs_per_s": len(texts) / max(elapsed, 1e-9),
+            "workers": workers,
+        }
+    )
+    print(
+        f"[INFO] Bulk embedding complete | docs: {len(texts)} | workers: {len(workers)} | docs/s: {result['docs_per_s']:.1f}"
+    )
+    for pid, stats in sorted(workers.items()):
+        print(
+            f"[INFO] Worker {pid} | docs: {stats['docs']} | docs/s: {stats['docs_per_s']:.1f}"
+        )
+    return result
@@ -0,0 +1,258 @@
+"""
+ShieldCraft AI Core - Two-Tier Embedding Cache
+
+Embeddings are keyed by (model_name, quantization_type, sha256(text)). The
+first tier is an in-memory LRU bounded by a byte budget; the second is an
+append-only on-disk store of vectors read through ``np.memmap``, with a row
+index read from a parallel file of key digests and safe to share between
+processes.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-writer only
+    fcntl = None
+
+DIGEST_BYTES = 32
+
+
+def cache_key(model_name: str, quantization_type: str, text: str) -> bytes:
+    """Digest of (model_name, quantization_type, sha256(text))."""
+    text_digest = hashlib.sha256(text.encode("utf-8")).digest()
+    scope = f"{model_name}\0{quantization_type}\0".encode("utf-8")
+    return hashlib.sha256(scope + text_digest).digest()
+
+
+class LRUVectorCache:
+    """In-memory LRU of vectors, evicting least recently used past ``max_bytes``."""
+
+    def __init__(self, max_bytes: int = 64 * 1024**2):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        vec = self._entries.get(key)
+        if vec is not None:
+            self._entries.move_to_end(key)
+        return vec
+
+    def put(self, key: bytes, vec: np.ndarray):
+        if vec.nbytes > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= old.nbytes
+        self._entries[key] = vec
+        self.nbytes += vec.nbytes
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+
+class DiskVectorStore:
+    """
+    Append-only vector file plus a file of key digests, one per row. Rows
+    are read through a memmap that is reopened only after the file grew, so
+    lookups never load the whole store. Rows without a matching digest (an
+    interrupted append) are ignored.
+
+    Several processes may share one directory: appends hold an exclusive
+    ``flock`` on ``lock`` and take their row numbers from the file sizes
+    seen under it, and a lookup that misses first picks up digests other
+    writers appended since the index was last read.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._meta_path = os.path.join(directory, "meta.json")
+        self._vectors_path = os.path.join(directory, "vectors.bin")
+        self._keys_path = os.path.join(directory, "keys.bin")
+        self._lock_path = os.path.join(directory, "lock")
+        self.dim = None
+        self.dtype = None
+        self._index = {}
+        self._rows = 0
+        self._mmap = None
+        with self._locked(exclusive=False):
+            self._refresh()
+
+    @contextlib.contextmanager
+    def _locked(self, exclusive: bool = True):
+        with open(self._lock_path, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _row_bytes(self) -> int:
+        return self.dim * self.dtype.itemsize
+
+    def _complete_rows(self) -> int:
+        """Rows with both a vector and a digest on disk."""
+        if not os.path.exists(self._keys_path):
+            return 0
+        vector_rows = 0
+        if os.path.exists(self._vectors_path):
+            vector_rows = os.path.getsize(self._vectors_path) // self._row_bytes()
+        return min(os.path.getsize(self._keys_path) // DIGEST_BYTES, vector_rows)
+
+    def _refresh(self):
+        """Index digests appended since the last read; call under the lock."""
+        if self.dim is None:
+            if not os.path.exists(self._meta_path):
+                return
+            with open(self._meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            self.dim, self.dtype = meta["dim"], np.dtype(meta["dtype"])
+        rows = self._complete_rows()
+        if rows <= self._rows:
+            return
+        with open(self._keys_path, "rb") as f:
+            f.seek(self._rows * DIGEST_BYTES)
+            keys = f.read((rows - self._rows) * DIGEST_BYTES)
+        for i in range(rows - self._rows):
+            self._index.setdefault(
+                keys[i * DIGEST_BYTES : (i + 1) * DIGEST_BYTES], self._rows + i
+            )
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        row = self._index.get(key)
+        if row is None and os.path.exists(self._keys_path):
+            if os.path.getsize(self._keys_path) > self._rows * DIGEST_BYTES:
+                with self._locked(exclusive=False):
+                    self._refresh()
+                row = self._index.get(key)
+        if row is None:
+            return None
+        if self._mmap is None or len(self._mmap) <= row:
+            self._mmap = np.memmap(
+                self._vectors_path,
+                dtype=self.dtype,
+                mode="r",
+                shape=(self._rows, self.dim),
+            )
+        return np.array(self._mmap[row])
+
+    def put_many(self, keys, vectors: np.ndarray):
+        """Append rows for keys not stored yet; vectors is ``(len(keys), dim)``."""
+        vectors = np.ascontiguousarray(vectors)
+        with self._locked():
+            self._refresh()
+            if self.dim is None:
+                self.dim, self.dtype = int(vectors.shape[1]), vectors.dtype
+                with open(self._meta_path, "w", encoding="utf-8") as f:
+                    json.dump({"dim": self.dim, "dtype": self.dtype.str}, f)
+            if vectors.shape[1] != self.dim:
+                raise ValueError(
+                    f"Vector dim {vectors.shape[1]} does not match cache dim {self.dim}."
+                )
+            fresh, seen = [], set()
+            for i, k in enumerate(keys):
+                if k not in self._index and k not in seen:
+                    fresh.append(i)
+                    seen.add(k)
+            if not fresh:
+                return
+            # Drop a torn tail so new rows stay aligned with their digests;
+            # safe only here, while no other writer can be appending
+            for path, size in (
+                (self._keys_path, self._rows * DIGEST_BYTES),
+                (self._vectors_path, self._rows * self._row_bytes()),
+            ):
+                if os.path.exists(path) and os.path.getsize(path) > size:
+                    os.truncate(path, size)
+            # Vectors are written before digests, so a crash never indexes a partial row
+            with open(self._vectors_path, "ab") as f:
+                f.write(vectors[fresh].astype(self.dtype, copy=False).tobytes())
+            with open(self._keys_path, "ab") as f:
+                f.write(b"".join(keys[i] for i in fresh))
+            for i in fresh:
+                self._index[keys[i]] = self._rows
+                self._rows += 1
+
+
+class EmbeddingCache:
+    """
+    LRU in front of an optional :class:`DiskVectorStore`. Disk hits are
+    promoted into the LRU. The disk store lives in a subdirectory per
+    (model_name, quantization_type), so switching models never mixes
+    vectors of different spaces.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        quantization_type: str,
+        memory_bytes: int = 64 * 1024**2,
+        disk_path: Optional[str] = None,
+    ):
+        self.model_name = model_name
+        self.quantization_type = quantization_type
+        self.memory = LRUVectorCache(memory_bytes)
+        self.disk = None
+        if disk_path:
+            scope = hashlib.sha256(
+                f"{model_name}\0{quantization_type}".encode("utf-8")
+            ).hexdigest()[:16]
+            self.disk = DiskVectorStore(os.path.join(disk_path, scope))
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, text: str) -> bytes:
+        return cache_key(self.model_name, self.quantization_type, text)
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        with self._lock:
+            vec = self.memory.get(key)
+            if vec is not None:
+                self.memory_hits += 1
+                return vec
+            if self.disk is not None:
+                vec = self.disk.get(key)
+                if vec is not None:
+                    self.disk_hits += 1
+                    self.memory.put(key, vec)
+                    return vec
+            self.misses += 1
+            return None
+
+    def put_many(self, keys, vectors: np.ndarray):
+        with self._lock:
+            for key, vec in zip(keys, vectors):
+                self.memory.put(key, np.array(vec))
+            if self.disk is not None:
+                self.disk.put_many(keys, vectors)
+
+    def stats(self) -> dict:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory.nbytes,
+            "disk_entries": len(self.disk) if self.disk is not None else 0,
+        }
@@ -1,14 +1,46 @@
 """
 ShieldCraft AI Core - Embedding Pipeline Scaffold
+
+torch and transformers are imported, and the weights loaded, on the first
+``encode`` (or an explicit ``warmup()``), not when the module is imported
+or the model constructed.
 """
 
-import torch
+import concurrent.futures
+import itertools
+import threading
 import numpy as np
-from transformers import AutoTokenizer, AutoModel
+from ai_core.lazy_imports import LazyModule
 from infra.utils.config_loader import get_config_loader
+from ai_core.embedding.cache import EmbeddingCache
+from ai_core.embedding.projection import EmbeddingProjection
+from ai_core.embedding.quantization import ScalarQuantizer, binary_codes
 
 
 EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+POOLING_MODES = ("mean", "cls", "max")
+OUTPUT_DTYPES = ("float32", "float16")
+
+torch = LazyModule("torch")
+transformers = LazyModule("transformers")
+
+
+def length_buckets(lengths, max_tokens):
+    """
+    Group indices by similar length so each group, padded to its longest
+    member, stays within ``max_tokens``. Indices are visited shortest first;
+    a text longer than the budget still gets a group of its own.
+    """
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    buckets, current = [], []
+    for i in order:
+        if current and (len(current) + 1) * lengths[i] > max_tokens:
+            buckets.append(current)
+            current = []
+        current.append(i)
+    if current:
+        buckets.append(current)
+    return buckets
 
 
 class EmbeddingModel:
@@ -16,29 +48,101 @@ class EmbeddingModel:
         config_loader = get_config_loader()
         if config is None:
             config = config_loader.get_section("embedding")
+        self.config = config
         self.model_name = config.get("model_name", EMBEDDING_MODEL_NAME)
-        self.device = config.get("device") or (
-            "cuda" if torch.cuda.is_available() else "cpu"
-        )
+        # None picks cuda when available, resolved at load time
+        self.device = config.get("device")
         self.quantize = config.get("quantize", False)
         self.quantization_type = config.get(
             "quantization_type", "float16"
         )  # float16, int8, bitsandbytes
         self.batch_size = config.get("batch_size", 32)
+        # Length-sorted buckets sized by a token budget instead of batch_size
+        self.length_bucketing = config.get("length_bucketing", False)
+        self.max_tokens_per_batch = config.get("max_tokens_per_batch", 8192)
+        # Overlap tokenization (and optionally pooling) with forward passes
+        self.pipelined = config.get("pipelined", False)
+        self.pipeline_stages = config.get("pipeline_stages", 2)
+        # mean (attention-masked), cls or max; normalized rows make cosine a dot product
+        self.pooling = config.get("pooling", "mean")
+        if self.pooling not in POOLING_MODES:
+            raise ValueError(
+                f"Unknown pooling '{self.pooling}', expected one of {POOLING_MODES}."
+            )
+        self.normalize = config.get("normalize", False)
+        self.output_dtype = config.get("output_dtype", "float32")
+        if self.output_dtype not in OUTPUT_DTYPES:
+            raise ValueError(
+                f"Unknown output_dtype '{self.output_dtype}', expected one of {OUTPUT_DTYPES}."
+            )
+        # Learned reduction shared with VectorStore; applied on device after pooling
+        self.projection = None
+        projection_path = config.get("projection_path")
+        if projection_path:
+            self.projection = EmbeddingProjection.load(projection_path)
+            self._projection_tensors = {}
+            print(
+                f"[INFO] Embedding projection loaded | Version: {self.projection.version} | Dim: {self.projection.dim}"
+            )
+        # Compact codes emitted next to the float rows for QuantizedIndex
+        codes_cfg = config.get("codes") or {}
+        self.binary_codes = codes_cfg.get("binary", False)
+        self.scalar_quantizer = None
+        if codes_cfg.get("int8_path"):
+            self.scalar_quantizer = ScalarQuantizer.load(codes_cfg["int8_path"])
+        # Texts pulled per step by encode_iter; bounds streaming memory
+        self.stream_window = config.get("stream_window", 1024)
+        # torch or onnx; onnx exports the model and serves it via onnxruntime
+        self.backend = config.get("backend", "torch")
+        self.quant_status = "none"
         self.model = None
         self.tokenizer = None
+        self.cache = None
         self._init_error = None
+        self._env = config_loader.get_section("app").get("env", "unknown")
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    def warmup(self) -> bool:
+        """
+        Import torch/transformers and load the weights now instead of on the
+        first ``encode``, then run one tiny forward pass so allocator and
+        kernel setup is paid up front. Returns True if the model is usable.
+        """
+        if not self._ensure_loaded():
+            return False
+        self._forward(["warmup"], 1)
+        return True
+
+    def _ensure_loaded(self) -> bool:
+        # A failed load is not retried; encode reports the stored error
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self._load()
+                    self._loaded = True
+        return self.model is not None and self.tokenizer is not None
+
+    def _load(self):
+        config = self.config
         try:
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            if self.device is None:
+                self.device = "cuda" if torch.cuda.is_available() else "cpu"
+            self.tokenizer = transformers.AutoTokenizer.from_pretrained(self.model_name)
             quant_kwargs = {}
             quant_status = "none"
-            if self.quantize:
+            dynamic_int8 = False
+            if self.backend == "onnx":
+                # The ONNX backend exports fp32 weights and quantizes those itself
+                pass
+            elif self.quantize:
                 if self.quantization_type == "float16":
                     quant_kwargs["torch_dtype"] = torch.float16
                     quant_status = "float16"
                 elif self.quantization_type == "int8":
-                    quant_kwargs["torch_dtype"] = torch.qint8
-                    quant_status = "int8"
+                    # qint8 is not a load dtype; quantize Linear layers after loading
+                    dynamic_int8 = True
+                    quant_status = "int8-dynamic"
                 elif self.quantization_type == "bitsandbytes":
                     try:
                         import bitsandbytes as bnb
@@ -57,25 +161,105 @@ class EmbeddingModel:
                     )
                     quant_kwargs["torch_dtype"] = torch.float16
                     quant_status = "float16-fallback"
-            self.model = AutoModel.from_pretrained(self.model_name, **quant_kwargs)
+            self.model = transformers.AutoModel.from_pretrained(
+                self.model_name, **quant_kwargs
+            )
             self.model.to(self.device)
-            env = config_loader.get_section("app").get("env", "unknown")
+            if dynamic_int8:
+                if self.device == "cpu":
+                    self.model = torch.ao.quantization.quantize_dynamic(
+                        self.model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+                else:
+                    print("[WARN] int8 dynamic quantization is CPU-only, using fp32.")
+                    quant_status = "none"
+            if self.backend == "onnx":
+                quant_status = self._init_onnx_backend(config.get("onnx") or {})
+            self.quant_status = quant_status
             print(
-                f"[INFO] Loaded embedding model: {self.model_name} | Env: {env} | Device: {self.device} | Quantized: {self.quantize} | Type: {quant_status}"
+                f"[INFO] Loaded embedding model: {self.model_name} | Env: {self._env} | Device: {self.device} | Quantized: {self.quantize} | Type: {quant_status}"
             )
         except Exception as e:
             print(f"[ERROR] Embedding model or tokenizer loading failed: {e}")
             self.model = None
             self.tokenizer = None
             self._init_error = str(e)
+        # Repeated alert/ticket text is served from cache instead of the model
+        cache_cfg = config.get("cache") or {}
+        self.cache = None
+        if cache_cfg.get("enabled", False):
+            # Vectors differ per quantization, pooling, normalization, dtype and projection
+            scope = "/".join(
+                [
+                    self.quant_status,
+                    self.pooling,
+                    "l2" if self.normalize else "raw",
+                    self.output_dtype,
+                    self.projection.version if self.projection else "full",
+                ]
+            )
+            self.cache = EmbeddingCache(
+                self.model_name,
+                scope,
+                memory_bytes=cache_cfg.get("memory_bytes", 64 * 1024**2),
+                disk_path=cache_cfg.get("disk_path"),
+            )
+
+    def _init_onnx_backend(self, onnx_cfg):
+        """
+        Swap the torch model for an onnxruntime session. Falls back to torch
+        when onnxruntime is missing, the device is not CPU, or the ONNX
+        output drifts below ``min_cosine`` of the torch output.
+        """
+        if self.device != "cpu":
+            print("[WARN] ONNX backend is CPU-only, using torch.")
+            self.backend = "torch"
+            return "none"
+        quantize = onnx_cfg.get("quantize_int8", True)
+        try:
+            from ai_core.embedding.onnx_backend import (
+                DEFAULT_CACHE_DIR,
+                OnnxEmbeddingBackend,
+                min_cosine_similarity,
+            )
+
+            backend = OnnxEmbeddingBackend(
+                self.model,
+                self.tokenizer,
+                self.model_name,
+                cache_dir=onnx_cfg.get("cache_dir") or DEFAULT_CACHE_DIR,
+                quantize=quantize,
+                intra_op_threads=onnx_cfg.get("intra_op_threads", 0),
+                inter_op_threads=onnx_cfg.get("inter_op_threads", 1),
+            )
+        except ImportError as e:
+            print(f"[WARN] onnxruntime not available ({e}), using torch.")
+            self.backend = "torch"
+            return "none"
+        min_cosine = onnx_cfg.get("min_cosine", 0.99)
+        similarity = min_cosine_similarity(self.model, backend, self.tokenizer)
+        if similarity < min_cosine:
+            print(
+                f"[WARN] ONNX output drifted from torch (cosine {similarity:.4f} < {min_cosine}), using torch."
+            )
+            self.backend = "torch"
+            return "none"
+        print(
+            f"[INFO] ONNX backend ready | Artifact: {backend.path} | Min cosine vs torch: {similarity:.4f}"
+        )
+        self.model = backend
+        return "onnx-int8" if quantize else "onnx-fp32"
 
     def encode(self, texts, batch_size=None):
         """
         Encode a batch of texts into embeddings. Returns dict with 'success', 'embeddings', 'error'.
-        Supports dynamic batch sizing for benchmarking and inference.
+        Supports dynamic batch sizing for benchmarking and inference. With
+        ``length_bucketing`` the token budget ``max_tokens_per_batch`` sizes
+        batches instead of ``batch_size``. With ``codes`` configured the
+        result also carries ``int8_codes`` and/or packed ``binary_codes``.
         """
         result = {"success": False, "embeddings": None, "error": None}
-        if self.model is None or self.tokenizer is None:
+        if not self._ensure_loaded():
             err_msg = self._init_error or "Embedding model not loaded."
             result["error"] = f"Embedding model not loaded: {err_msg}"
             return result
@@ -97,22 +281,19 @@ class EmbeddingModel:
             ):
                 result["error"] = f"Invalid batch_size: {effective_batch_size}"
                 return result
-            all_embeddings = []
-            for i in range(0, len(texts), effective_batch_size):
-                batch = texts[i : i + effective_batch_size]
-                inputs = self.tokenizer(
-                    batch, padding=True, truncation=True, return_tensors="pt"
-                ).to(self.device)
-                with torch.no_grad():
-                    outputs = self.model(**inputs)
-                    embeddings = outputs.last_hidden_state.mean(dim=1)
-                all_embeddings.append(embeddings.cpu().numpy())
-
-            embeddings = np.vstack(all_embeddings)
+            if self.cache is not None:
+                embeddings = self._encode_cached(texts, effective_batch_size)
+                result["cache"] = self.cache.stats()
+            else:
+                embeddings = self._forward(texts, effective_batch_size)
             result["success"] = True
             result["embeddings"] = embeddings
             result["shape"] = embeddings.shape
             result["dtype"] = str(embeddings.dtype)
+            if self.scalar_quantizer is not None:
+                result["int8_codes"] = self.scalar_quantizer.encode(embeddings)
+            if self.binary_codes:
+                result["binary_codes"] = binary_codes(embeddings)
             print(
                 f"[INFO] Embedding batch complete | shape: {embeddings.shape} | dtype: {embeddings.dtype}"
             )
@@ -121,3 +302,241 @@ class EmbeddingModel:
             result["error"] = f"Embedding failed: {e}"
             print(f"[ERROR] Embedding failed: {e}")
             return result
+
+    def _forward(self, texts, batch_size):
+        if self.length_bucketing:
+            return self._forward_bucketed(texts)
+        # Rows are written into one preallocated matrix; no vstack copy
+        out = None
+        for start, rows in self._iter_forward(texts, batch_size):
+            if out is None:
+                out = np.empty((len(texts), rows.shape[1]), dtype=rows.dtype)
+            out[start : start + len(rows)] = rows
+        return out
+
+    def _iter_forward(self, texts, batch_size):
+        batches = (
+            (i, texts[i : i + batch_size]) for i in range(0, len(texts), batch_size)
+        )
+        yield from self._run_stages(batches, self._tokenize_batch)
+
+    def _tokenize_batch(self, batch):
+        return self.tokenizer(
+            batch, padding=True, truncation=True, return_tensors="pt"
+        ).to(self.device)
+
+    def _forward_stage(self, inputs):
+        with torch.no_grad():
+            return self.model(**inputs).last_hidden_state, inputs["attention_mask"]
+
+    def _pool_stage(self, hidden, mask):
+        """
+        Pool over real tokens only (pad positions never leak into a row),
+        optionally L2-normalize and project, then cast to ``output_dtype``
+        on device.
+        """
+        with torch.no_grad():
+            mask = mask.unsqueeze(-1).to(hidden.dtype)
+            if self.pooling == "cls":
+                pooled = hidden[:, 0]
+            elif self.pooling == "max":
+                pooled = hidden.masked_fill(mask == 0, float("-inf")).max(dim=1).values
+            else:
+                pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+            if self.normalize:
+                pooled = torch.nn.functional.normalize(pooled.float(), dim=-1)
+            if self.projection is not None:
+                pooled = self._project(pooled)
+            pooled = pooled.to(getattr(torch, self.output_dtype))
+        return pooled.cpu().numpy()
+
+    def _project(self, pooled):
+        """Torch mirror of ``EmbeddingProjection.transform`` on the pooled device."""
+        projection = self.projection
+        pooled = pooled.float()
+        if pooled.shape[-1] != projection.source_dim:
+            # Truncation would otherwise silently return fewer than dim columns
+            raise ValueError(
+                f"Expected embeddings of width {projection.source_dim}, got {pooled.shape[-1]}."
+            )
+        if projection.method == "truncate":
+            out = pooled[:, : projection.dim]
+        else:
+            device = pooled.device
+            if device not in self._projection_tensors:
+                self._projection_tensors[device] = (
+                    torch.from_numpy(projection.mean).to(device),
+                    torch.from_numpy(projection.components.T.copy()).to(device),
+                )
+            mean, components = self._projection_tensors[device]
+            out = (pooled - mean) @ components
+        if projection.renormalize:
+            out = torch.nn.functional.normalize(out, dim=-1)
+        return out
+
+    def _run_stages(self, batches, prepare):
+        """
+        Yield ``(key, rows)`` for ``(key, batch)`` pairs, where ``prepare``
+        turns a batch into model inputs. In pipelined mode a background
+        thread prepares batch N+1 while batch N runs through the model; with
+        three stages pooling and the device-to-host copy of batch N also
+        overlap the forward pass of batch N+1. Output order is unchanged.
+        """
+        stages = self.pipeline_stages if self.pipelined else 1
+        if stages < 2:
+            for key, batch in batches:
+                hidden, mask = self._forward_stage(prepare(batch))
+                yield key, self._pool_stage(hidden, mask)
+            return
+        batches = iter(batches)
+        with (
+            concurrent.futures.ThreadPoolExecutor(1, "embedding-tokenize") as tok,
+            concurrent.futures.ThreadPoolExecutor(1, "embedding-pool") as post,
+        ):
+            current = next(batches, None)
+            prepared = tok.submit(prepare, current[1]) if current else None
+            pooled = None
+            while prepared is not None:
+                key, inputs = current[0], prepared.result()
+                current = next(batches, None)
+                prepared = tok.submit(prepare, current[1]) if current else None
+                hidden, mask = self._forward_stage(inputs)
+                if stages < 3:
+                    yield key, self._pool_stage(hidden, mask)
+                    continue
+                if pooled is not None:
+                    yield pooled[0], pooled[1].result()
+                pooled = (key, post.submit(self._pool_stage, hidden, mask))
+            if pooled is not None:
+                yield pooled[0], pooled[1].result()
+
+    def encode_iter(self, texts, batch_size=None, window=None):
+        """
+        Lazily yield ``(start_index, embeddings)`` blocks for ``texts``, which
+        may be any iterable (e.g. a generator over a corpus larger than RAM).
+        Texts are pulled ``window`` at a time (default ``stream_window``), so
+        memory stays bounded by one window. Plain batching yields one block
+        per batch; with the cache or length bucketing, one block per window.
+        Raises ValueError on bad input and RuntimeError if the model is not
+        loaded.
+        """
+        if not self._ensure_loaded():
+            err_msg = self._init_error or "Embedding model not loaded."
+            raise RuntimeError(f"Embedding model not loaded: {err_msg}")
+        if isinstance(texts, str):
+            texts = [texts]
+        batch_size = batch_size if batch_size is not None else self.batch_size
+        window = window or self.stream_window
+        if not isinstance(batch_size, int) or batch_size < 1:
+            raise ValueError(f"Invalid batch_size: {batch_size}")
+        iterator = iter(texts)
+        offset = 0
+        while True:
+            block = list(itertools.islice(iterator, window))
+            if not block:
+                return
+            if not all(isinstance(t, str) for t in block):
+                raise ValueError("Input must be a string or list of strings.")
+            if self.cache is not None:
+                yield offset, self._encode_cached(block, batch_size)
+            elif self.length_bucketing:
+                yield offset, self._forward_bucketed(block)
+            else:
+                for start, rows in self._iter_forward(block, batch_size):
+                    yield offset + start, rows
+            offset += len(block)
+
+    def encode_to_memmap(
+        self, texts, path, n_texts=None, dtype="float32", batch_size=None
+    ):
+        """
+        Stream embeddings of ``texts`` into a ``.npy`` memmap at ``path`` with
+        ``dtype`` (e.g. float16 to halve the file). ``n_texts`` is required
+        when ``texts`` has no length. Returns a dict like :meth:`encode`, with
+        ``path`` instead of the embeddings.
+        """
+        result = {"success": False, "path": path, "error": None}
+        if n_texts is None:
+            try:
+                n_texts = len(texts)
+            except TypeError:
+                result["error"] = "n_texts is required for unsized inputs."
+                return result
+        if n_texts < 1:
+            result["error"] = "Input text list is empty."
+            return result
+        out = None
+        written = 0
+        try:
+            for start, rows in self.encode_iter(texts, batch_size=batch_size):
+                if start + len(rows) > n_texts:
+                    raise ValueError(f"Got more than n_texts={n_texts} texts.")
+                if out is None:
+                    out = np.lib.format.open_memmap(
+                        path, mode="w+", dtype=dtype, shape=(n_texts, rows.shape[1])
+                    )
+                out[start : start + len(rows)] = rows
+                written += len(rows)
+            if written != n_texts:
+                raise ValueError(f"Got {written} texts, expected n_texts={n_texts}.")
+            out.flush()
+        except Exception as e:
+            result["error"] = f"Embedding failed: {e}"
+            print(f"[ERROR] Embedding failed: {e}")
+            return result
+        finally:
+            del out
+        result.update(
+            {
+                "success": True,
+                "shape": (n_texts, rows.shape[1]),
+                "dtype": str(np.dtype(dtype)),
+            }
+        )
+        print(
+            f"[INFO] Embeddings streamed to {path} | shape: {result['shape']} | dtype: {result['dtype']}"
+        )
+        return result
+
+    def _forward_bucketed(self, texts):
+        """
+        Tokenize once, run length-sorted buckets of at most
+        ``max_tokens_per_batch`` padded tokens and scatter rows back to input
+        order.
+        """
+        enc = self.tokenizer(texts, truncation=True)
+        ids, masks = enc["input_ids"], enc["attention_mask"]
+
+        def pad(bucket):
+            return self.tokenizer.pad(
+                {
+                    "input_ids": [ids[i] for i in bucket],
+                    "attention_mask": [masks[i] for i in bucket],
+                },
+                return_tensors="pt",
+            ).to(self.device)
+
+        buckets = length_buckets([len(i) for i in ids], self.max_tokens_per_batch)
+        out = None
+        for bucket, rows in self._run_stages(((b, b) for b in buckets), pad):
+            if out is None:
+                out = np.empty((len(texts), rows.shape[1]), dtype=rows.dtype)
+            out[bucket] = rows
+        return out
+
+    def _encode_cached(self, texts, batch_size):
+        """
+        Look every text up in the cache and run the model once per distinct
+        miss; rows are returned in input order.
+        """
+        keys = [self.cache.key(t) for t in texts]
+        first_seen = {}
+        for i, key in enumerate(keys):
+            first_seen.setdefault(key, i)
+        found = {key: self.cache.get(key) for key in first_seen}
+        missing = [key for key, vec in found.items() if vec is None]
+        if missing:
+            fresh = self._forward([texts[first_seen[k]] for k in missing], batch_size)
+            self.cache.put_many(missing, fresh)
+            found.update(zip(missing, fresh))
+        return np.stack([found[key] for key in keys])
@@ -0,0 +1,145 @@
+"""
+ShieldCraft AI Core - ONNX Runtime Embedding Backend
+
+Exports the loaded transformer to ONNX once, applies dynamic int8 weight
+quantization and serves forward passes from an onnxruntime CPU session. The
+exported artifacts are cached on disk per model name, so later processes
+skip the export. ``onnxruntime`` and ``onnx`` are optional dependencies.
+"""
+
+import hashlib
+import inspect
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import torch
+
+ONNX_OPSET = 17
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "shieldcraft", "onnx"
+)
+_VERIFY_TEXTS = [
+    "GuardDuty finding: UnauthorizedAccess:IAMUser/ConsoleLogin from unusual IP.",
+    "Ticket: rotate access keys for the build role",
+    "ok",
+]
+
+
+def artifact_paths(model_name: str, cache_dir: str = DEFAULT_CACHE_DIR):
+    """Return (fp32 path, int8 path) of the cached ONNX export for a model."""
+    scope = hashlib.sha256(model_name.encode("utf-8")).hexdigest()[:16]
+    base = os.path.join(cache_dir, scope)
+    return os.path.join(base, "model.onnx"), os.path.join(base, "model.int8.onnx")
+
+
+def export_onnx(model, tokenizer, path: str):
+    """Export ``model`` with dynamic batch and sequence axes to ``path``."""
+    sample = tokenizer(["export sample"], padding=True, return_tensors="pt")
+    names = [
+        n for n in ("input_ids", "attention_mask", "token_type_ids") if n in sample
+    ]
+    axes = {n: {0: "batch", 1: "sequence"} for n in names}
+    axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    kwargs = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        kwargs["dynamo"] = False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    model.eval()
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            tuple(sample[n].cpu() for n in names),
+            tmp_path,
+            input_names=names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=axes,
+            opset_version=ONNX_OPSET,
+            **kwargs,
+        )
+    # Publish atomically so a concurrent reader never loads a partial file
+    os.replace(tmp_path, path)
+
+
+def quantize_int8(fp32_path: str, int8_path: str):
+    """Dynamic int8 weight quantization of an exported model."""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    tmp_path = int8_path + ".tmp"
+    quantize_dynamic(fp32_path, tmp_path, weight_type=QuantType.QInt8)
+    os.replace(tmp_path, int8_path)
+
+
+class OnnxEmbeddingBackend:
+    """
+    Callable stand-in for the torch model: takes the tokenizer's tensors and
+    returns an object with ``last_hidden_state``, so ``EmbeddingModel.encode``
+    pools its output exactly as it does for the torch model.
+    """
+
+    def __init__(
+        self,
+        model,
+        tokenizer,
+        model_name: str,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        quantize: bool = True,
+        intra_op_threads: int = 0,
+        inter_op_threads: int = 1,
+    ):
+        import onnxruntime as ort
+
+        fp32_path, int8_path = artifact_paths(model_name, cache_dir)
+        if not os.path.exists(fp32_path):
+            export_onnx(model, tokenizer, fp32_path)
+        path = fp32_path
+        if quantize:
+            if not os.path.exists(int8_path):
+                quantize_int8(fp32_path, int8_path)
+            path = int8_path
+        options = ort.SessionOptions()
+        # 0 lets onnxruntime use one intra-op thread per physical core
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = inter_op_threads
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.path = path
+        self.session = ort.InferenceSession(
+            path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = [i.name for i in self.session.get_inputs()]
+
+    def to(self, device):
+        return self
+
+    def eval(self):
+        return self
+
+    def __call__(self, **inputs):
+        feed = {
+            name: inputs[name].cpu().numpy().astype(np.int64)
+            for name in self.input_names
+            if name in inputs
+        }
+        if "token_type_ids" in self.input_names and "token_type_ids" not in feed:
+            feed["token_type_ids"] = np.zeros_like(feed["input_ids"])
+        (hidden,) = self.session.run(["last_hidden_state"], feed)
+        return SimpleNamespace(last_hidden_state=torch.from_numpy(hidden))
+
+
+def _pooled(model, tokenizer, texts):
+    inputs = tokenizer(texts, padding=True, truncation=True, return_tensors="pt")
+    with torch.no_grad():
+        hidden = model(**inputs).last_hidden_state.float()
+    mask = inputs["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+    return ((hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)).numpy()
+
+
+def min_cosine_similarity(reference, candidate, tokenizer, texts=None) -> float:
+    """Lowest cosine similarity between two models' pooled embeddings of ``texts``."""
+    a = _pooled(reference, tokenizer, texts or _VERIFY_TEXTS)
+    b = _pooled(candidate, tokenizer, texts or _VERIFY_TEXTS)
+    num = (a * b).sum(axis=1)
+    den = np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1)
+    return float((num / np.maximum(den, 1e-12)).min())
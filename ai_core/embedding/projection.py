@@ -0,0 +1,211 @@
+"""
+ShieldCraft AI Core - Learned Embedding Dimensionality Reduction
+
+Fits a PCA projection (or a Matryoshka-style prefix truncation) on a sample
+of corpus embeddings and persists it as a versioned ``.npz`` artifact. The
+same artifact is loaded by ``EmbeddingModel`` and ``VectorStore`` so stored
+rows and query vectors are always reduced identically; the version id is a
+content hash, so two files with the same id hold the same projection.
+"""
+
+import hashlib
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+PROJECTION_METHODS = ("pca", "truncate")
+
+
+class EmbeddingProjection:
+    def __init__(
+        self,
+        method: str,
+        mean: np.ndarray,
+        components: np.ndarray,
+        renormalize: bool = False,
+    ):
+        if method not in PROJECTION_METHODS:
+            raise ValueError(
+                f"Unknown projection method '{method}', expected one of {PROJECTION_METHODS}."
+            )
+        self.method = method
+        self.mean = np.asarray(mean, dtype=np.float32)
+        # (dim, source_dim); rows are the retained directions
+        self.components = np.asarray(components, dtype=np.float32)
+        self.renormalize = bool(renormalize)
+
+    @property
+    def dim(self) -> int:
+        return int(self.components.shape[0])
+
+    @property
+    def source_dim(self) -> int:
+        return int(self.components.shape[1])
+
+    @property
+    def version(self) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{self.method}:{self.renormalize}".encode("utf-8"))
+        digest.update(self.mean.tobytes())
+        digest.update(self.components.tobytes())
+        return f"{self.method}{self.dim}-{digest.hexdigest()[:12]}"
+
+    @classmethod
+    def fit(
+        cls,
+        embeddings: np.ndarray,
+        dim: int,
+        method: str = "pca",
+        max_samples: Optional[int] = 100_000,
+        seed: int = 0,
+    ) -> "EmbeddingProjection":
+        """
+        Learn a ``dim``-wide projection from a ``(n, source_dim)`` sample.
+        Unit-norm input yields a projection that re-normalizes its output,
+        so cosine and inner-product search keep working after reduction.
+        """
+        x = np.asarray(embeddings, dtype=np.float32)
+        if x.ndim != 2 or len(x) == 0:
+            raise ValueError("Embeddings must be a non-empty 2D array.")
+        if not 0 < dim <= x.shape[1]:
+            raise ValueError(f"Invalid projection dim {dim} for width {x.shape[1]}.")
+        if max_samples and len(x) > max_samples:
+            rows = np.random.default_rng(seed).choice(len(x), max_samples, False)
+            x = x[rows]
+        renormalize = bool(np.allclose(np.linalg.norm(x, axis=1), 1.0, atol=1e-3))
+        if method == "truncate":
+            # Matryoshka-trained models front-load information into the prefix
+            mean = np.zeros(x.shape[1], dtype=np.float32)
+            components = np.eye(x.shape[1], dtype=np.float32)[:dim]
+            return cls(method, mean, components, renormalize)
+        if method != "pca":
+            raise ValueError(
+                f"Unknown projection method '{method}', expected one of {PROJECTION_METHODS}."
+            )
+        mean = x.mean(axis=0)
+        # Right singular vectors of the centred sample, by explained variance
+        _, _, vt = np.linalg.svd(x - mean, full_matrices=False)
+        return cls(method, mean, vt[:dim], renormalize)
+
+    def transform(self, embeddings: np.ndarray) -> np.ndarray:
+        x = np.asarray(embeddings, dtype=np.float32)
+        if x.shape[-1] != self.source_dim:
+            raise ValueError(
+                f"Expected embeddings of width {self.source_dim}, got {x.shape[-1]}."
+            )
+        if self.method == "truncate":
+            out = x[..., : self.dim].copy()
+        else:
+            out = (x - self.mean) @ self.components.T
+        if self.renormalize:
+            norms = np.linalg.norm(out, axis=-1, keepdims=True)
+            out /= np.maximum(norms, 1e-12)
+        return out
+
+    def save(self, directory: str) -> str:
+        """Write ``<directory>/<version>.npz`` and return its path."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.version}.npz")
+        tmp_path = path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            method=self.method,
+            mean=self.mean,
+            components=self.components,
+            renormalize=self.renormalize,
+            version=self.version,
+        )
+        os.replace(tmp_path, path)
+        print(
+            f"[INFO] Projection saved | Version: {self.version} | {self.source_dim} -> {self.dim} dims | Path: {path}"
+        )
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "EmbeddingProjection":
+        with np.load(path) as data:
+            projection = cls(
+                str(data["method"]),
+                data["mean"],
+                data["components"],
+                bool(data["renormalize"]),
+            )
+            stored = str(data["version"])
+        if stored != projection.version:
+            raise ValueError(
+                f"Projection artifact {path} is corrupt: version {stored} does not match its contents."
+            )
+        return projection
+
+
+def recall_at_k(ranked: np.ndarray, relevant: List[set], k: int) -> float:
+    scores = [
+        len(rel.intersection(row[:k].tolist())) / len(rel)
+        for row, rel in zip(ranked, relevant)
+        if rel
+    ]
+    return float(np.mean(scores)) if scores else 0.0
+
+
+def reduction_tradeoff(
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    relevant: Sequence[Iterable[int]],
+    dims: Sequence[int] = (384, 256, 128, 64),
+    k_values: Sequence[int] = (10, 100),
+    method: str = "pca",
+) -> List[Dict]:
+    """
+    Exact inner-product search at each width in ``dims``. ``relevant[i]``
+    holds the corpus row indices relevant to query ``i``. Returns, per
+    width, recall@k, bytes per stored float32 vector and search latency.
+    """
+    corpus = np.asarray(corpus, dtype=np.float32)
+    queries = np.asarray(queries, dtype=np.float32)
+    relevant = [set(r) for r in relevant]
+    top = min(max(k_values), len(corpus))
+    report = []
+    for dim in dims:
+        if dim >= corpus.shape[1]:
+            c, q, version = corpus, queries, None
+        else:
+            projection = EmbeddingProjection.fit(corpus, dim, method=method)
+            c, q = projection.transform(corpus), projection.transform(queries)
+            version = projection.version
+        start = time.perf_counter()
+        scores = q @ c.T
+        ranked = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+        order = np.take_along_axis(scores, ranked, axis=1).argsort(axis=1)[:, ::-1]
+        ranked = np.take_along_axis(ranked, order, axis=1)
+        seconds = time.perf_counter() - start
+        report.append(
+            {
+                "dim": int(c.shape[1]),
+                "version": version,
+                "bytes_per_vector": int(c.shape[1]) * 4,
+                "search_ms_per_query": 1000 * seconds / max(len(q), 1),
+                **{f"recall@{k}": recall_at_k(ranked, relevant, k) for k in k_values},
+            }
+        )
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Fit an embedding projection on a .npy sample of corpus embeddings."
+    )
+    parser.add_argument("sample", help="Path to a (n, source_dim) .npy array")
+    parser.add_argument("--dim", type=int, required=True, help="Target width")
+    parser.add_argument("--method", choices=PROJECTION_METHODS, default="pca")
+    parser.add_argument(
+        "--output-dir", default="projections", help="Directory for the artifact"
+    )
+    args = parser.parse_args()
+    fitted = EmbeddingProjection.fit(
+        np.load(args.sample, mmap_mode="r"), args.dim, method=args.method
+    )
+    fitted.save(args.output_dir)
@@ -0,0 +1,250 @@
+"""
+ShieldCraft AI Core - Quantized Embedding Codes and Two-Stage Search
+
+Compact codes for keeping a corpus hot in memory: int8 scalar codes with
+per-dimension calibrated ranges (4x smaller than float32) and 1-bit sign
+codes (32x smaller). ``QuantizedIndex`` retrieves candidates over the codes
+and rescores only those candidates against the float vectors, which may be
+a read-only memmap left on disk.
+"""
+
+import hashlib
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from ai_core.embedding.projection import recall_at_k
+
+CODE_TYPES = ("int8", "binary")
+# Bits set per byte value, for Hamming distance over packed sign codes
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(
+    axis=1, dtype=np.uint8
+)
+# Rows scored per step; bounds the float32 scratch of the candidate stage
+_SCAN_ROWS = 65536
+# Byte budget of the XOR scratch in hamming_distances
+_XOR_BYTES = 64 * 1024**2
+
+
+def binary_codes(embeddings: np.ndarray) -> np.ndarray:
+    """Pack the sign of each dimension into ``ceil(dim / 8)`` bytes per row."""
+    return np.packbits(np.asarray(embeddings) > 0, axis=-1)
+
+
+def hamming_distances(query_codes: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """``(n_queries, n_rows)`` Hamming distances between packed sign codes."""
+    query_codes = np.atleast_2d(query_codes)
+    out = np.empty((len(query_codes), len(codes)), dtype=np.uint16)
+    step = max(1, _XOR_BYTES // max(query_codes.size, 1))
+    for start in range(0, len(codes), step):
+        block = codes[start : start + step]
+        xor = np.bitwise_xor(query_codes[:, None, :], block[None, :, :])
+        out[:, start : start + len(block)] = _POPCOUNT[xor].sum(axis=-1)
+    return out
+
+
+class ScalarQuantizer:
+    """
+    Maps each dimension's calibrated ``[low, high]`` range onto the 256
+    int8 levels. ``quantile`` clips outliers when calibrating, trading a
+    little saturation at the tails for finer steps in the bulk.
+    """
+
+    def __init__(self, low: np.ndarray, high: np.ndarray):
+        self.low = np.asarray(low, dtype=np.float32)
+        self.high = np.asarray(high, dtype=np.float32)
+        self.scale = np.maximum(self.high - self.low, 1e-12) / 255.0
+
+    @property
+    def dim(self) -> int:
+        return int(self.low.shape[0])
+
+    @property
+    def version(self) -> str:
+        digest = hashlib.sha256(self.low.tobytes() + self.high.tobytes())
+        return f"int8-{digest.hexdigest()[:12]}"
+
+    @classmethod
+    def fit(cls, embeddings: np.ndarray, quantile: float = 0.0) -> "ScalarQuantizer":
+        x = np.asarray(embeddings, dtype=np.float32)
+        if x.ndim != 2 or len(x) == 0:
+            raise ValueError("Embeddings must be a non-empty 2D array.")
+        if not 0.0 <= quantile < 0.5:
+            raise ValueError(f"Invalid calibration quantile: {quantile}")
+        if quantile:
+            low, high = np.quantile(x, [quantile, 1.0 - quantile], axis=0)
+        else:
+            low, high = x.min(axis=0), x.max(axis=0)
+        return cls(low, high)
+
+    def encode(self, embeddings: np.ndarray) -> np.ndarray:
+        x = np.asarray(embeddings, dtype=np.float32)
+        if x.shape[-1] != self.dim:
+            raise ValueError(
+                f"Expected embeddings of width {self.dim}, got {x.shape[-1]}."
+            )
+        levels = np.rint((x - self.low) / self.scale)
+        return (np.clip(levels, 0, 255) - 128).astype(np.int8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return (codes.astype(np.float32) + 128) * self.scale + self.low
+
+    def scores(self, queries: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """
+        Inner products of float queries with decoded codes, without
+        materializing the decoded matrix: ``q·x ≈ (q*scale)·(c+128) + q·low``.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        weighted = queries * self.scale
+        offset = queries @ self.low
+        out = np.empty((len(queries), len(codes)), dtype=np.float32)
+        for start in range(0, len(codes), _SCAN_ROWS):
+            block = codes[start : start + _SCAN_ROWS].astype(np.float32) + 128
+            out[:, start : start + len(block)] = weighted @ block.T
+        return out + offset[:, None]
+
+    def save(self, directory: str) -> str:
+        """Write ``<directory>/<version>.npz`` and return its path."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.version}.npz")
+        tmp_path = path + ".tmp.npz"
+        np.savez(tmp_path, low=self.low, high=self.high)
+        os.replace(tmp_path, path)
+        print(f"[INFO] Scalar quantizer saved | Version: {self.version} | Path: {path}")
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "ScalarQuantizer":
+        with np.load(path) as data:
+            return cls(data["low"], data["high"])
+
+
+def _top_k(scores: np.ndarray, k: int, largest: bool = True) -> np.ndarray:
+    """Row-wise indices of the ``k`` best scores, best first."""
+    k = min(k, scores.shape[1])
+    keyed = -scores if largest else scores
+    idx = np.argpartition(keyed, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(keyed, idx, axis=1).argsort(axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1)
+
+
+class QuantizedIndex:
+    """
+    In-process inner-product search: candidate retrieval over int8 or
+    binary codes, then exact rescoring of the top ``candidates`` rows.
+    Only the codes need to stay resident; ``vectors`` is read per query for
+    the candidate rows alone.
+    """
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        code_type: str = "binary",
+        quantizer: Optional[ScalarQuantizer] = None,
+    ):
+        if code_type not in CODE_TYPES:
+            raise ValueError(
+                f"Unknown code type '{code_type}', expected one of {CODE_TYPES}."
+            )
+        if len(vectors) == 0:
+            raise ValueError("QuantizedIndex needs at least one vector to index.")
+        self.vectors = vectors
+        self.code_type = code_type
+        self.quantizer = None
+        if code_type == "int8":
+            self.quantizer = quantizer or ScalarQuantizer.fit(
+                vectors[: min(len(vectors), 100_000)]
+            )
+            self.codes = np.concatenate(
+                [
+                    self.quantizer.encode(vectors[s : s + _SCAN_ROWS])
+                    for s in range(0, len(vectors), _SCAN_ROWS)
+                ]
+            )
+        else:
+            self.codes = np.concatenate(
+                [
+                    binary_codes(vectors[s : s + _SCAN_ROWS])
+                    for s in range(0, len(vectors), _SCAN_ROWS)
+                ]
+            )
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def memory_report(self) -> dict:
+        float_bytes = int(np.prod(self.vectors.shape)) * 4
+        return {
+            "code_type": self.code_type,
+            "code_bytes": int(self.codes.nbytes),
+            "float32_bytes": float_bytes,
+            "compression": float_bytes / max(self.codes.nbytes, 1),
+        }
+
+    def candidates(self, queries: np.ndarray, n: int) -> np.ndarray:
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if self.code_type == "int8":
+            return _top_k(self.quantizer.scores(queries, self.codes), n)
+        distances = hamming_distances(binary_codes(queries), self.codes)
+        return _top_k(distances, n, largest=False)
+
+    def search(self, queries: np.ndarray, top_k: int = 10, candidates: int = 100):
+        """
+        Return ``(indices, scores)`` of the ``top_k`` rows per query by exact
+        float inner product, rescoring ``max(candidates, top_k)`` code hits.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if top_k < 1:
+            raise ValueError(f"Invalid top_k: {top_k}")
+        pool = self.candidates(queries, max(candidates, top_k))
+        indices = np.empty((len(queries), min(top_k, pool.shape[1])), dtype=np.int64)
+        scores = np.empty(indices.shape, dtype=np.float32)
+        for i, (query, rows) in enumerate(zip(queries, pool)):
+            # Sorted reads keep memmap access sequential
+            rows = np.sort(rows)
+            exact = np.asarray(self.vectors[rows], dtype=np.float32) @ query
+            best = _top_k(exact[None, :], indices.shape[1])[0]
+            indices[i], scores[i] = rows[best], exact[best]
+        return indices, scores
+
+
+def quantization_tradeoff(
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    relevant: Sequence[Iterable[int]],
+    k_values: Sequence[int] = (10, 100),
+    candidates: int = 200,
+) -> List[Dict]:
+    """
+    Recall@k, resident bytes and latency of exact float search against
+    two-stage search over int8 and binary codes. ``relevant[i]`` holds the
+    corpus row indices relevant to query ``i``.
+    """
+    corpus = np.asarray(corpus, dtype=np.float32)
+    queries = np.asarray(queries, dtype=np.float32)
+    relevant = [set(r) for r in relevant]
+    top = max(k_values)
+    report = []
+    for code_type in ("float32",) + CODE_TYPES:
+        if code_type == "float32":
+            start = time.perf_counter()
+            ranked = _top_k(queries @ corpus.T, top)
+            resident = corpus.nbytes
+        else:
+            index = QuantizedIndex(corpus, code_type=code_type)
+            start = time.perf_counter()
+            ranked, _ = index.search(queries, top_k=top, candidates=candidates)
+            resident = index.codes.nbytes
+        seconds = time.perf_counter() - start
+        report.append(
+            {
+                "codes": code_type,
+                "resident_bytes": int(resident),
+                "compression": corpus.nbytes / max(resident, 1),
+                "search_ms_per_query": 1000 * seconds / max(len(queries), 1),
+                **{f"recall@{k}": recall_at_k(ranked, relevant, k) for k in k_values},
+            }
+        )
+    return report
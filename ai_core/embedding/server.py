@@ -0,0 +1,234 @@
+"""
+ShieldCraft AI Core - Micro-Batching Embedding Service
+
+Queues concurrent ``embed`` calls and coalesces them into one
+``EmbeddingModel.encode`` call per batch, bounded by ``max_batch_size``
+texts and ``max_wait_ms`` of added latency. The model runs on a dedicated
+single-thread executor, so the event loop never blocks on a forward pass.
+"""
+
+import asyncio
+import concurrent.futures
+import time
+from typing import List, Optional, Union
+
+import numpy as np
+
+from infra.utils.config_loader import get_config_loader
+
+
+class EmbeddingService:
+    def __init__(
+        self,
+        model=None,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        config=None,
+    ):
+        if config is None:
+            config = get_config_loader().get_section("embedding")
+        server_cfg = config.get("server") or {}
+        if model is None:
+            from ai_core.embedding.embedding import EmbeddingModel
+
+            model = EmbeddingModel(config)
+        self.model = model
+        self.max_batch_size = max_batch_size or server_cfg.get("max_batch_size", 64)
+        self.max_wait_ms = (
+            max_wait_ms if max_wait_ms is not None else server_cfg.get("max_wait_ms", 5)
+        )
+        if self.max_batch_size < 1:
+            raise ValueError(f"Invalid max_batch_size: {self.max_batch_size}")
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._queued_texts = 0
+        self._carry = None
+        # Requests of the batch being encoded, already off the queue
+        self._inflight = []
+        # Set by stop(); new embed calls are refused from then on
+        self._stopping = False
+        self._stats = {
+            "requests": 0,
+            "batches": 0,
+            "texts": 0,
+            "failed_batches": 0,
+            "max_queue_depth": 0,
+            "last_fill_ratio": 0.0,
+            "forward_seconds": 0.0,
+        }
+
+    async def start(self):
+        if self._task is not None:
+            return
+        self._stopping = False
+        self._queue = asyncio.Queue()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="embedding-forward"
+        )
+        loop = asyncio.get_running_loop()
+        # Pay the deferred model load before the first request, off the loop
+        if hasattr(self.model, "warmup"):
+            await loop.run_in_executor(self._executor, self.model.warmup)
+        self._task = loop.create_task(self._run())
+        print(
+            f"[INFO] EmbeddingService started | Max batch: {self.max_batch_size} | Max wait: {self.max_wait_ms} ms"
+        )
+
+    async def stop(self):
+        """
+        Refuse new requests, serve the ones already queued, then stop the
+        batcher and the executor.
+        """
+        if self._task is None or self._stopping:
+            return
+        self._stopping = True
+        await self._queue.put(None)
+        try:
+            await self._task
+        finally:
+            self._fail_pending("EmbeddingService stopped before serving the request.")
+            self._executor.shutdown(wait=True)
+            self._task = None
+            self._executor = None
+
+    def _fail_pending(self, message: str):
+        # Whatever the batcher left behind would otherwise wait forever
+        items = [self._carry] if self._carry is not None else []
+        self._carry = None
+        while not self._queue.empty():
+            items.append(self._queue.get_nowait())
+        for item in items:
+            if item is None:
+                continue
+            texts, future = item
+            self._queued_texts -= len(texts)
+            if not future.done():
+                future.set_exception(RuntimeError(message))
+        for _, future in self._inflight:
+            if not future.done():
+                future.set_exception(RuntimeError(message))
+        self._inflight = []
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def embed(self, texts: Union[str, List[str]]) -> np.ndarray:
+        """Embed ``texts`` as part of a shared batch; returns this caller's rows."""
+        if self._task is None:
+            raise RuntimeError("EmbeddingService is not started.")
+        if self._stopping:
+            raise RuntimeError("EmbeddingService is stopping.")
+        if self._task.done():
+            raise RuntimeError("EmbeddingService batcher is not running.")
+        if isinstance(texts, str):
+            texts = [texts]
+        if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+            raise ValueError("Input must be a string or list of strings.")
+        if not texts:
+            raise ValueError("Input text list is empty.")
+        future = asyncio.get_running_loop().create_future()
+        self._stats["requests"] += 1
+        self._queued_texts += len(texts)
+        self._stats["max_queue_depth"] = max(
+            self._stats["max_queue_depth"], self._queued_texts
+        )
+        await self._queue.put((texts, future))
+        return await future
+
+    async def _next_batch(self):
+        # Block for the first request, then top up until full or the deadline
+        if self._carry is not None:
+            first, self._carry = self._carry, None
+        else:
+            first = await self._queue.get()
+        if first is None:
+            return [], True
+        batch, size = [first], len(first[0])
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if item is None:
+                return batch, True
+            if size + len(item[0]) > self.max_batch_size:
+                # Would overflow: it opens the next batch instead
+                self._carry = item
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch, False
+
+    async def _run(self):
+        try:
+            await self._serve()
+        except BaseException as e:
+            # A dead batcher must not leave callers waiting on their futures
+            self._fail_pending(f"EmbeddingService batcher stopped: {e!r}")
+            raise
+
+    async def _serve(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._next_batch()
+            self._inflight = batch
+            # Requests still queued behind the stop marker are served too
+            if stopping and self._carry is not None:
+                batch.append(self._carry)
+                self._carry = None
+            while stopping and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is not None:
+                    batch.append(item)
+            if not batch:
+                continue
+            texts = [t for item_texts, _ in batch for t in item_texts]
+            self._queued_texts -= len(texts)
+            start = time.perf_counter()
+            try:
+                result = await loop.run_in_executor(
+                    self._executor, self.model.encode, texts
+                )
+            except Exception as e:
+                result = {"success": False, "error": f"Embedding failed: {e}"}
+            self._stats["forward_seconds"] += time.perf_counter() - start
+            self._stats["batches"] += 1
+            self._stats["texts"] += len(texts)
+            self._stats["last_fill_ratio"] = min(1.0, len(texts) / self.max_batch_size)
+            if not result.get("success"):
+                self._stats["failed_batches"] += 1
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError(result.get("error")))
+                continue
+            embeddings = result["embeddings"]
+            offset = 0
+            for item_texts, future in batch:
+                rows = embeddings[offset : offset + len(item_texts)]
+                offset += len(item_texts)
+                if not future.done():
+                    future.set_result(rows)
+
+    def metrics(self) -> dict:
+        """Queue depth (texts waiting) and batch fill ratios, plus totals."""
+        batches = self._stats["batches"]
+        return {
+            **self._stats,
+            "queue_depth": self._queued_texts,
+            "mean_batch_size": self._stats["texts"] / batches if batches else 0.0,
+            "mean_fill_ratio": (
+                self._stats["texts"] / (batches * self.max_batch_size)
+                if batches
+                else 0.0
+            ),
+        }
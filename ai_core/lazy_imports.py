@@ -0,0 +1,142 @@
+"""
+ShieldCraft AI Core - Deferred Imports and Import-Time Report
+
+``LazyModule`` stands in for a heavy dependency (torch, transformers) and
+imports it on first attribute access, so Lambda cold starts and CLI runs
+that never touch a model skip the import entirely. ``import_time_report``
+measures what each ShieldCraft module costs to import in a fresh
+interpreter, using ``python -X importtime``.
+"""
+
+import importlib
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+DEFAULT_REPORT_MODULES = (
+    "ai_core.embedding.embedding",
+    "ai_core.model_loader",
+    "ai_core.vector_store",
+    "ai_core.embedding.server",
+    "infra.utils.config_loader",
+)
+
+# Seconds spent importing each deferred module, in load order
+_DEFERRED_IMPORTS: Dict[str, float] = {}
+_LOCK = threading.Lock()
+
+
+class LazyModule:
+    """Proxy that imports ``name`` the first time one of its attributes is used."""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        with _LOCK:
+            if self._module is None:
+                start = time.perf_counter()
+                module = importlib.import_module(self._name)
+                _DEFERRED_IMPORTS.setdefault(self._name, time.perf_counter() - start)
+                self._module = module
+        return self._module
+
+    def __getattr__(self, attr):
+        module = self._module if self._module is not None else self._load()
+        return getattr(module, attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+def deferred_import_times() -> Dict[str, float]:
+    """Seconds each ``LazyModule`` spent on its first import in this process."""
+    with _LOCK:
+        return dict(_DEFERRED_IMPORTS)
+
+
+def parse_importtime(stderr: str) -> List[dict]:
+    """Rows of ``-X importtime`` output as dicts with self/cumulative seconds."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append(
+            {
+                "module": name.strip(),
+                "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+                "self_s": int(self_us) / 1e6,
+                "cumulative_s": int(cumulative_us) / 1e6,
+            }
+        )
+    return rows
+
+
+def import_time_report(
+    modules: Sequence[str] = DEFAULT_REPORT_MODULES,
+    top: int = 5,
+    python: Optional[str] = None,
+) -> List[dict]:
+    """
+    Import each module in a fresh interpreter and report its cumulative
+    import time plus the ``top`` most expensive top-level dependencies.
+    """
+    report = []
+    for name in modules:
+        proc = subprocess.run(
+            [python or sys.executable, "-X", "importtime", "-c", f"import {name}"],
+            capture_output=True,
+            text=True,
+        )
+        rows = parse_importtime(proc.stderr)
+        entry = {"module": name, "success": proc.returncode == 0, "seconds": None}
+        if proc.returncode != 0:
+            entry["error"] = proc.stderr.strip().splitlines()[-1:]
+            report.append(entry)
+            continue
+        # Rows print in completion order: the module's subtree precedes it
+        end = max(
+            (i for i, r in enumerate(rows) if r["module"] == name and r["depth"] == 0),
+            default=None,
+        )
+        if end is None:
+            entry["seconds"], entry["heaviest"], entry["loads_torch"] = 0.0, [], False
+            report.append(entry)
+            continue
+        start = end
+        while start > 0 and rows[start - 1]["depth"] > 0:
+            start -= 1
+        entry["seconds"] = rows[end]["cumulative_s"]
+        packages = {}
+        for row in rows[start:end]:
+            root = row["module"].split(".")[0]
+            if root != name.split(".")[0] and "." not in row["module"]:
+                packages[root] = max(packages.get(root, 0.0), row["cumulative_s"])
+        entry["heaviest"] = sorted(packages.items(), key=lambda kv: -kv[1])[:top]
+        entry["loads_torch"] = "torch" in packages
+        report.append(entry)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Report how much interpreter startup each module costs to import."
+    )
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_REPORT_MODULES))
+    parser.add_argument("--top", type=int, default=5, help="Dependencies listed")
+    args = parser.parse_args()
+    for entry in import_time_report(args.modules, top=args.top):
+        if not entry["success"]:
+            print(f"[ERROR] {entry['module']} failed to import: {entry['error']}")
+            continue
+        heaviest = ", ".join(f"{n} {s:.3f}s" for n, s in entry["heaviest"])
+        print(
+            f"[INFO] {entry['module']}: {entry['seconds']:.3f}s | torch: {entry['loads_torch']} | heaviest: {heaviest}"
+        )
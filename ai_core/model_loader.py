@@ -2,15 +2,20 @@
 ShieldCraft AI Core - Model Loader
 
 Supports cost-free 'stub' model for dev, and Hugging Face models for higher envs.
+Weights (and torch/transformers themselves) load on the first ``generate`` or
+an explicit ``warmup()``.
 """
 
+import threading
 import time
-import torch
-from transformers import AutoModelForCausalLM, AutoTokenizer, BitsAndBytesConfig
-from huggingface_hub.errors import HFValidationError
+from ai_core.lazy_imports import LazyModule
 
 MODEL_NAME = "mistralai/Mistral-7B-v0.1"
 
+torch = LazyModule("torch")
+transformers = LazyModule("transformers")
+hf_errors = LazyModule("huggingface_hub.errors")
+
 
 class ShieldCraftAICore:
     def __init__(self, config_section: str = "ai_core"):
@@ -20,46 +25,66 @@ class ShieldCraftAICore:
         # Always load config from config_loader, prefer section override if provided
         config = config_loader.get_section(config_section)
         self.model_name = config.get("model_name", MODEL_NAME)
-        self.device = config.get("device") or (
-            "cuda" if torch.cuda.is_available() else "cpu"
-        )
+        # None picks cuda when available, resolved at load time
+        self.device = config.get("device")
         self.quantize = config.get("quantize", False)
+        self.model = None
+        self.tokenizer = None
+        self._env = config_loader.get_section("app").get("env", "unknown")
+        self._loaded = False
+        self._load_lock = threading.Lock()
         # Zero-cost stub backend for dev
-        if self.model_name.strip().lower() == "stub":
-            self.model = None
-            self.tokenizer = None
-            env = config_loader.get_section("app").get("env", "unknown")
+        if self._is_stub():
+            self._loaded = True
             print(
-                f"[INFO] Using stub LLM backend | Env: {env} | Device: {self.device} | Quantized: {self.quantize}"
+                f"[INFO] Using stub LLM backend | Env: {self._env} | Device: {self.device or 'auto'} | Quantized: {self.quantize}"
             )
-        else:
-            try:
-                self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-                model_kwargs = {}
-                if self.quantize:
-                    model_kwargs["quantization_config"] = BitsAndBytesConfig(
-                        load_in_4bit=True
-                    )
-                self.model = AutoModelForCausalLM.from_pretrained(
-                    self.model_name, **model_kwargs
-                )
-                self.model.to(self.device)
-                env = config_loader.get_section("app").get("env", "unknown")
-                print(
-                    f"[INFO] Loaded model: {self.model_name} | Env: {env} | Device: {self.device} | Quantized: {self.quantize}"
+
+    def _is_stub(self) -> bool:
+        return self.model_name.strip().lower() == "stub"
+
+    def warmup(self) -> bool:
+        """Load the model now instead of on the first ``generate``."""
+        self._ensure_loaded()
+        return self._is_stub() or self.model is not None
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self._load()
+                    self._loaded = True
+
+    def _load(self):
+        try:
+            if self.device is None:
+                self.device = "cuda" if torch.cuda.is_available() else "cpu"
+            self.tokenizer = transformers.AutoTokenizer.from_pretrained(self.model_name)
+            model_kwargs = {}
+            if self.quantize:
+                model_kwargs["quantization_config"] = transformers.BitsAndBytesConfig(
+                    load_in_4bit=True
                 )
-            except HFValidationError as e:
-                print(f"[ERROR] Model loading failed: {e}")
-                self.model = None
-            except Exception as e:
-                print(f"[ERROR] Model loading failed: {e}")
-                self.model = None
+            self.model = transformers.AutoModelForCausalLM.from_pretrained(
+                self.model_name, **model_kwargs
+            )
+            self.model.to(self.device)
+            print(
+                f"[INFO] Loaded model: {self.model_name} | Env: {self._env} | Device: {self.device} | Quantized: {self.quantize}"
+            )
+        except hf_errors.HFValidationError as e:
+            print(f"[ERROR] Model loading failed: {e}")
+            self.model = None
+        except Exception as e:
+            print(f"[ERROR] Model loading failed: {e}")
+            self.model = None
 
     def generate(self, prompt: str, max_new_tokens: int = 64) -> str:
         # Stub path: deterministic, free, no downloads
-        if self.model_name.strip().lower() == "stub":
+        if self._is_stub():
             prompt_preview = (prompt or "").strip().replace("\n", " ")[:60]
             return f"[STUB] echo: {prompt_preview} | max_new_tokens={max_new_tokens}"
+        self._ensure_loaded()
         if self.model is None:
             return "[ERROR] Model not loaded."
         try:
@@ -72,7 +97,7 @@ class ShieldCraftAICore:
                 f"[INFO] Inference latency: {latency:.2f}s | Device: {self.device} | Quantized: {self.quantize}"
             )
             return result
-        except HFValidationError as e:
+        except hf_errors.HFValidationError as e:
             print(f"[ERROR] Inference validation error: {e}")
             return "[ERROR] Inference validation error."
         except RuntimeError as e:
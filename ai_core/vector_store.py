@@ -2,13 +2,215 @@
 ShieldCraft AI Core - Vector Store Scaffold (pgvector, config-driven)
 """
 
+import collections
+import contextlib
+import functools
+import io
+import itertools
+import struct
+import threading
+import time
+
 import psycopg2
+import psycopg2.extras
+import psycopg2.pool
 import numpy as np
+from ai_core.embedding.projection import EmbeddingProjection
 from infra.utils.config_loader import get_config_loader
 
 
+BULK_METHODS = ("copy", "execute_values")
+# Binary COPY framing: signature, flags, header extension length / end marker
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_COPY_TRAILER = struct.pack(">h", -1)
+
+
+def vector_literal(vec) -> str:
+    """pgvector text form, e.g. ``[0.1,0.2]``."""
+    # 9 significant digits round-trip float32 exactly
+    return "[" + ",".join(f"{x:.9g}" for x in np.asarray(vec, dtype=np.float32)) + "]"
+
+
+def copy_binary_payload(texts, vectors, version=None) -> bytes:
+    """
+    One ``COPY ... FROM STDIN (FORMAT binary)`` stream for
+    ``(text, embedding, embedding_version)`` rows. A pgvector value on the
+    wire is int16 dim, int16 unused, then big-endian float32s.
+    """
+    vectors = np.asarray(vectors, dtype=">f4")
+    dim = vectors.shape[1]
+    vec_head = struct.pack(">ihh", 4 + 4 * dim, dim, 0)
+    if version is None:
+        version_field = struct.pack(">i", -1)
+    else:
+        data = version.encode("utf-8")
+        version_field = struct.pack(">i", len(data)) + data
+    buf = io.BytesIO()
+    buf.write(_COPY_HEADER)
+    for text, vec in zip(texts, vectors):
+        if text is None:
+            buf.write(struct.pack(">hi", 3, -1))
+        else:
+            data = text.encode("utf-8")
+            buf.write(struct.pack(">hi", 3, len(data)))
+            buf.write(data)
+        buf.write(vec_head)
+        buf.write(vec.tobytes())
+        buf.write(version_field)
+    buf.write(_COPY_TRAILER)
+    return buf.getvalue()
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of at most ``max_connections`` connections. A checkout
+    blocks up to ``timeout`` seconds for a free slot, pings connections that
+    sat idle longer than ``health_check_interval`` and discards connections
+    that died mid-operation, so the next checkout reconnects.
+    """
+
+    def __init__(
+        self,
+        connect,
+        min_connections: int = 1,
+        max_connections: int = 10,
+        timeout: float = 30.0,
+        health_check_interval: float = 30.0,
+    ):
+        if not 0 <= min_connections <= max_connections or max_connections < 1:
+            raise ValueError(
+                f"Invalid pool size: min {min_connections}, max {max_connections}"
+            )
+        self._connect = connect
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._lock = threading.Lock()
+        # (connection, monotonic time it was returned)
+        self._idle = collections.deque()
+        self._in_use = 0
+        self._stats = {
+            "checkouts": 0,
+            "timeouts": 0,
+            "connects": 0,
+            "discarded": 0,
+            "health_checks": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        }
+        for _ in range(min_connections):
+            self._idle.append((self._new_connection(), time.monotonic()))
+
+    def _new_connection(self):
+        conn = self._connect()
+        with self._lock:
+            self._stats["connects"] += 1
+        return conn
+
+    def _discard(self, conn):
+        with self._lock:
+            self._stats["discarded"] += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _healthy(self, conn, idle_since) -> bool:
+        if getattr(conn, "closed", 0):
+            return False
+        if time.monotonic() - idle_since < self.health_check_interval:
+            return True
+        with self._lock:
+            self._stats["health_checks"] += 1
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            return False
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                conn, idle_since = self._idle.pop()
+            if self._healthy(conn, idle_since):
+                return conn
+            self._discard(conn)
+        return self._new_connection()
+
+    @contextlib.contextmanager
+    def connection(self):
+        """
+        Check out a connection for one operation. Connections that raise
+        ``OperationalError``/``InterfaceError`` are dropped; other errors
+        roll back the open transaction before the connection is reused.
+        """
+        start = time.monotonic()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise psycopg2.pool.PoolError(
+                f"No connection available within {self.timeout}s"
+            )
+        waited = time.monotonic() - start
+        with self._lock:
+            self._stats["checkouts"] += 1
+            self._stats["wait_seconds"] += waited
+            self._stats["max_wait_seconds"] = max(
+                self._stats["max_wait_seconds"], waited
+            )
+            self._in_use += 1
+        conn = None
+        try:
+            conn = self._checkout()
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            if conn is not None:
+                self._discard(conn)
+                conn = None
+            raise
+        except BaseException:
+            if conn is not None:
+                try:
+                    conn.rollback()
+                except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                    self._discard(conn)
+                    conn = None
+            raise
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                if conn is not None and not getattr(conn, "closed", 0):
+                    self._idle.append((conn, time.monotonic()))
+            self._slots.release()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = list(self._idle), collections.deque()
+        for conn, _ in idle:
+            conn.close()
+
+    def metrics(self) -> dict:
+        """Checkout counts, wait times and reconnects, plus current occupancy."""
+        with self._lock:
+            checkouts = self._stats["checkouts"]
+            return {
+                **self._stats,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "max_connections": self.max_connections,
+                "mean_wait_seconds": (
+                    self._stats["wait_seconds"] / checkouts if checkouts else 0.0
+                ),
+            }
+
+
 class VectorStore:
-    def __init__(self, config=None):
+    def __init__(self, config=None, connect=None):
         config_loader = get_config_loader()
         if config is None:
             config = config_loader.get_section("vector_store")
@@ -19,62 +221,282 @@ class VectorStore:
         self.db_password = config.get("db_password", "postgres")
         self.table_name = config.get("table_name", "embeddings")
         self.batch_size = config.get("batch_size", 100)
-        try:
-            self.conn = psycopg2.connect(
+        # copy: binary COPY FROM STDIN; execute_values: multi-row INSERT pages
+        self.bulk_method = config.get("bulk_method", "copy")
+        if self.bulk_method not in BULK_METHODS:
+            raise ValueError(
+                f"Unknown bulk_method '{self.bulk_method}', expected one of {BULK_METHODS}."
+            )
+        # Same artifact as embedding.projection_path; full-width input is reduced here
+        self.projection = None
+        self.dim = config.get("dim", 384)
+        projection_path = config.get("projection_path")
+        # Written on every row and checked against the table on first use
+        self.embedding_version = None
+        if projection_path:
+            self.projection = EmbeddingProjection.load(projection_path)
+            self.dim = self.projection.dim
+            self.embedding_version = self.projection.version
+            print(
+                f"[INFO] Vector store projection | Version: {self.projection.version} | Dim: {self.dim}"
+            )
+        pool_cfg = config.get("pool") or {}
+        # Retries of one operation after its connection dropped
+        self.max_retries = pool_cfg.get("max_retries", 1)
+        if connect is None:
+            connect = functools.partial(
+                psycopg2.connect,
                 host=self.db_host,
                 port=self.db_port,
                 dbname=self.db_name,
                 user=self.db_user,
                 password=self.db_password,
+                connect_timeout=pool_cfg.get("connect_timeout", 5),
             )
-            self._ensure_table()
+        self._table_ready = False
+        self._table_lock = threading.Lock()
+        try:
+            self.pool = ConnectionPool(
+                connect,
+                min_connections=pool_cfg.get("min_connections", 1),
+                max_connections=pool_cfg.get("max_connections", 10),
+                timeout=pool_cfg.get("timeout", 30.0),
+                health_check_interval=pool_cfg.get("health_check_interval", 30.0),
+            )
+            self._run(lambda conn: None)
             print(
-                f"[INFO] Connected to pgvector DB: {self.db_name}@{self.db_host}:{self.db_port}"
+                f"[INFO] Connected to pgvector DB: {self.db_name}@{self.db_host}:{self.db_port} | Pool: {self.pool.max_connections}"
             )
-        except (psycopg2.DatabaseError, psycopg2.OperationalError) as e:
+        except psycopg2.Error as e:
+            # Later operations reconnect through an empty pool
             print(f"[ERROR] Vector store DB connection failed: {e}")
-            self.conn = None
+            self.pool = ConnectionPool(
+                connect,
+                min_connections=0,
+                max_connections=pool_cfg.get("max_connections", 10),
+                timeout=pool_cfg.get("timeout", 30.0),
+                health_check_interval=pool_cfg.get("health_check_interval", 30.0),
+            )
 
-    def _ensure_table(self):
-        with self.conn.cursor() as cur:
+    def _ensure_table(self, conn):
+        """
+        Create the table, then refuse to use an existing one whose vector
+        width or stored projection version differs from this store's, so
+        rows from incompatible embedding spaces are never mixed.
+        """
+        with conn.cursor() as cur:
             cur.execute(
                 f"""
                 CREATE TABLE IF NOT EXISTS {self.table_name} (
                     id SERIAL PRIMARY KEY,
                     text TEXT,
-                    embedding VECTOR(384)
+                    embedding VECTOR({self.dim}),
+                    embedding_version TEXT
                 );
             """
             )
-            self.conn.commit()
+            cur.execute(
+                f"ALTER TABLE {self.table_name} ADD COLUMN IF NOT EXISTS embedding_version TEXT"
+            )
+            # pgvector keeps the declared width in the column's typmod
+            cur.execute(
+                "SELECT atttypmod FROM pg_attribute WHERE attrelid = %s::regclass AND attname = 'embedding'",
+                (self.table_name,),
+            )
+            row = cur.fetchone()
+            if row and row[0] > 0 and row[0] != self.dim:
+                raise ValueError(
+                    f"Table {self.table_name} stores VECTOR({row[0]}) but the configured width is {self.dim}."
+                )
+            # Every writer runs this check, so one row speaks for the table
+            cur.execute(f"SELECT embedding_version FROM {self.table_name} LIMIT 1")
+            row = cur.fetchone()
+            if row and row[0] != self.embedding_version:
+                raise ValueError(
+                    f"Table {self.table_name} holds embeddings of version {row[0]} but the configured version is {self.embedding_version}."
+                )
+        conn.commit()
+
+    def _run(self, operation, retryable=None):
+        """
+        Run ``operation(conn)`` on a pooled connection, retrying on a fresh
+        connection up to ``max_retries`` times when the connection drops.
+        ``retryable()`` returning False (a commit was already sent, so the
+        write may have landed) re-raises instead of replaying it.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self.pool.connection() as conn:
+                    if not self._table_ready:
+                        with self._table_lock:
+                            if not self._table_ready:
+                                self._ensure_table(conn)
+                                self._table_ready = True
+                    return operation(conn)
+            except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+                if attempt == self.max_retries or (
+                    retryable is not None and not retryable()
+                ):
+                    raise
+                print(f"[WARN] Vector store connection lost, reconnecting: {e}")
+
+    def health_check(self) -> bool:
+        """True if a pooled connection can run ``SELECT 1``."""
+
+        def ping(conn):
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
 
-    def upsert_embeddings(self, texts, embeddings):
-        if self.conn is None:
-            return "[ERROR] Vector store not connected."
         try:
-            with self.conn.cursor() as cur:
-                for text, emb in zip(texts, embeddings):
-                    cur.execute(
-                        f"INSERT INTO {self.table_name} (text, embedding) VALUES (%s, %s)",
-                        (text, emb.tolist()),
+            return self._run(ping)
+        except (psycopg2.Error, ValueError):
+            return False
+
+    def metrics(self) -> dict:
+        return self.pool.metrics()
+
+    def close(self):
+        self.pool.close()
+
+    def _prepare(self, embeddings):
+        """
+        Reduce full-width rows with the shared projection; rows already at
+        ``dim`` (projected by EmbeddingModel) pass through unchanged.
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        width = embeddings.shape[-1]
+        if width == self.dim:
+            return embeddings
+        if self.projection is not None and width == self.projection.source_dim:
+            return self.projection.transform(embeddings)
+        raise ValueError(f"Expected embeddings of width {self.dim}, got {width}.")
+
+    def upsert_embeddings(self, texts, embeddings):
+        """
+        Insert ``texts`` with their ``embeddings``. Both may be iterators;
+        rows are written in ``batch_size`` pages via ``bulk_upsert``.
+        """
+        result = self.bulk_upsert(zip(texts, embeddings))
+        if isinstance(result, str):
+            return result
+
+    def bulk_upsert(self, rows, batch_size=None, method=None):
+        """
+        Stream ``(text, embedding)`` pairs from any iterable (a generator
+        keeps the corpus out of memory) in pages of ``batch_size`` rows,
+        committing after each page. Returns the number of rows written;
+        on failure the current page is rolled back, earlier pages stay
+        committed, and an error string is returned. A page whose connection
+        drops before its commit is sent is replayed on a new connection; one
+        that drops during the commit is reported, never replayed, since the
+        server may already have committed it.
+        """
+        batch_size = batch_size or self.batch_size
+        method = method or self.bulk_method
+        if method not in BULK_METHODS:
+            raise ValueError(
+                f"Unknown bulk method '{method}', expected one of {BULK_METHODS}."
+            )
+
+        # Set once a page's COMMIT is sent; a drop after that is not replayed
+        commit_sent = [False]
+
+        def write_page(texts, vectors):
+            def operation(conn):
+                commit_sent[0] = False
+                with conn.cursor() as cur:
+                    if method == "copy":
+                        cur.copy_expert(
+                            f"COPY {self.table_name} (text, embedding, embedding_version) FROM STDIN WITH (FORMAT binary)",
+                            io.BytesIO(
+                                copy_binary_payload(
+                                    texts, vectors, self.embedding_version
+                                )
+                            ),
+                        )
+                    else:
+                        psycopg2.extras.execute_values(
+                            cur,
+                            f"INSERT INTO {self.table_name} (text, embedding, embedding_version) VALUES %s",
+                            [
+                                (t, vector_literal(v), self.embedding_version)
+                                for t, v in zip(texts, vectors)
+                            ],
+                            template="(%s, %s::vector, %s)",
+                            page_size=batch_size,
+                        )
+                commit_sent[0] = True
+                conn.commit()
+
+            return operation
+
+        rows = iter(rows)
+        written = 0
+        batches = 0
+        while True:
+            page = list(itertools.islice(rows, batch_size))
+            if not page:
+                break
+            texts = [text for text, _ in page]
+            try:
+                vectors = self._prepare(np.stack([emb for _, emb in page]))
+            except ValueError as e:
+                print(f"[ERROR] Upsert failed after {written} rows: {e}")
+                return "[ERROR] Embedding dimension mismatch."
+            try:
+                # Each page checks out its own connection; a drop before the
+                # commit is retried, a drop during it may have written the page
+                self._run(
+                    write_page(texts, vectors), retryable=lambda: not commit_sent[0]
+                )
+            except ValueError as e:
+                print(f"[ERROR] Upsert failed after {written} rows: {e}")
+                return "[ERROR] Vector store schema mismatch."
+            except psycopg2.Error as e:
+                lost = isinstance(
+                    e, (psycopg2.OperationalError, psycopg2.InterfaceError)
+                )
+                if lost and commit_sent[0]:
+                    print(
+                        f"[ERROR] Connection lost while committing rows {written}-{written + len(page) - 1}; they may or may not have been written: {e}"
+                    )
+                    return (
+                        "[ERROR] Upsert outcome unknown; connection lost during commit."
                     )
-                self.conn.commit()
-            print(f"[INFO] Upserted {len(texts)} embeddings.")
-        except (psycopg2.DatabaseError, psycopg2.OperationalError) as e:
-            print(f"[ERROR] Upsert failed: {e}")
-            return "[ERROR] Upsert failed."
+                print(f"[ERROR] Upsert failed after {written} rows: {e}")
+                return "[ERROR] Upsert failed."
+            written += len(page)
+            batches += 1
+        print(
+            f"[INFO] Upserted {written} embeddings | Batches: {batches} | Method: {method}"
+        )
+        return written
 
     def query(self, query_embedding, top_k=5):
-        if self.conn is None:
-            return "[ERROR] Vector store not connected."
         try:
-            with self.conn.cursor() as cur:
+            query_embedding = self._prepare(query_embedding)
+        except ValueError as e:
+            print(f"[ERROR] Query failed: {e}")
+            return "[ERROR] Embedding dimension mismatch."
+
+        def operation(conn):
+            with conn.cursor() as cur:
                 cur.execute(
-                    f"SELECT text, embedding FROM {self.table_name} ORDER BY embedding <-> %s LIMIT %s",
-                    (query_embedding.tolist(), top_k),
+                    f"SELECT text, embedding FROM {self.table_name} ORDER BY embedding <-> %s::vector LIMIT %s",
+                    (vector_literal(query_embedding), top_k),
                 )
                 results = cur.fetchall()
+            # Read-only: end the transaction so the connection returns idle
+            conn.rollback()
             return results
-        except (psycopg2.DatabaseError, psycopg2.OperationalError) as e:
+
+        try:
+            return self._run(operation)
+        except ValueError as e:
+            print(f"[ERROR] Query failed: {e}")
+            return "[ERROR] Vector store schema mismatch."
+        except psycopg2.Error as e:
             print(f"[ERROR] Query failed: {e}")
             return "[ERROR] Query failed."
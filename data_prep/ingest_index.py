@@ -0,0 +1,177 @@
+"""
+ShieldCraft AI Ingest Dedup Index
+
+Persistent SQLite index of ingested documents and chunks, keyed by content
+hash plus a fingerprint of the active chunking config, so re-ingest runs skip
+unchanged files and only pass new chunks downstream.
+
+It also keeps a per-file high-water mark for tailing append-only logs.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Sequence, Set
+
+# Bytes of the file head hashed to tell an appended file from a replaced one
+TAIL_HEAD_BYTES = 1024
+# Chunk hashes looked up and staged per statement; stays under SQLite's
+# default limit of 999 bound parameters
+CHUNK_BATCH_SIZE = 500
+
+
+class TailState(NamedTuple):
+    """High-water mark of an append-only file consumed up to ``byte_offset``."""
+
+    inode: int
+    size: int
+    byte_offset: int
+    char_offset: int
+    head_sha256: str
+    # Chunks emitted so far, so chunk_index keeps counting across runs
+    chunk_count: int = 0
+
+
+def config_fingerprint(config: Dict[str, Any]) -> str:
+    """Stable sha256 of a config dict; any change in chunking params changes it."""
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_sha256(path: str, block_size: int = 1024 * 1024) -> str:
+    """sha256 of a file, streamed in blocks so large logs are never fully loaded."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def file_head_sha256(path: str, n_bytes: int) -> str:
+    """sha256 of the first ``n_bytes`` of a file; detects truncate-and-rewrite."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read(n_bytes)).hexdigest()
+
+
+def text_sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class IngestIndex:
+    def __init__(self, path: str, config_hash: str):
+        self.path = path
+        self.config_hash = config_hash
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                path TEXT NOT NULL,
+                config_hash TEXT NOT NULL,
+                doc_sha256 TEXT NOT NULL,
+                ingested_at REAL NOT NULL,
+                PRIMARY KEY (path, config_hash)
+            );
+            CREATE TABLE IF NOT EXISTS chunks (
+                chunk_sha256 TEXT NOT NULL,
+                config_hash TEXT NOT NULL,
+                PRIMARY KEY (chunk_sha256, config_hash)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS tail_offsets (
+                path TEXT NOT NULL,
+                config_hash TEXT NOT NULL,
+                inode INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                byte_offset INTEGER NOT NULL,
+                char_offset INTEGER NOT NULL,
+                head_sha256 TEXT NOT NULL,
+                chunk_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (path, config_hash)
+            );
+            """
+        )
+        columns = {
+            row[1] for row in self.conn.execute("PRAGMA table_info(tail_offsets)")
+        }
+        if "chunk_count" not in columns:
+            # Index files written before chunk_count was tracked
+            self.conn.execute(
+                "ALTER TABLE tail_offsets ADD COLUMN chunk_count INTEGER NOT NULL DEFAULT 0"
+            )
+        self.conn.commit()
+
+    def is_unchanged(self, path: str, doc_sha256: str) -> bool:
+        row = self.conn.execute(
+            "SELECT doc_sha256 FROM documents WHERE path = ? AND config_hash = ?",
+            (path, self.config_hash),
+        ).fetchone()
+        return row is not None and row[0] == doc_sha256
+
+    def has_chunk(self, chunk_sha256: str) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM chunks WHERE chunk_sha256 = ? AND config_hash = ?",
+            (chunk_sha256, self.config_hash),
+        ).fetchone()
+        return row is not None
+
+    def stage_chunks(self, chunk_hashes: Sequence[str]) -> Set[str]:
+        """
+        Return the hashes in ``chunk_hashes`` not indexed yet and insert them
+        into the open transaction with one ``IN (...)`` lookup and one
+        executemany. Nothing is committed until :meth:`record_document`;
+        :meth:`rollback` discards the staged rows.
+        """
+        unique = list(dict.fromkeys(chunk_hashes))
+        if not unique:
+            return set()
+        placeholders = ", ".join("?" * len(unique))
+        seen = {
+            row[0]
+            for row in self.conn.execute(
+                f"SELECT chunk_sha256 FROM chunks WHERE config_hash = ? AND chunk_sha256 IN ({placeholders})",
+                (self.config_hash, *unique),
+            )
+        }
+        new = [h for h in unique if h not in seen]
+        self.conn.executemany(
+            "INSERT INTO chunks (chunk_sha256, config_hash) VALUES (?, ?)",
+            ((h, self.config_hash) for h in new),
+        )
+        return set(new)
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def record_document(
+        self, path: str, doc_sha256: str, chunk_hashes: Iterable[str] = ()
+    ):
+        """
+        Record a fully processed document and its chunks, committing any
+        chunks staged with :meth:`stage_chunks` in the same transaction.
+        """
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO chunks (chunk_sha256, config_hash) VALUES (?, ?)",
+                ((h, self.config_hash) for h in chunk_hashes),
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO documents (path, config_hash, doc_sha256, ingested_at) VALUES (?, ?, ?, ?)",
+                (path, self.config_hash, doc_sha256, time.time()),
+            )
+
+    def get_tail(self, path: str) -> Optional[TailState]:
+        row = self.conn.execute(
+            "SELECT inode, size, byte_offset, char_offset, head_sha256, chunk_count FROM tail_offsets WHERE path = ? AND config_hash = ?",
+            (path, self.config_hash),
+        ).fetchone()
+        return TailState(*row) if row else None
+
+    def set_tail(self, path: str, state: TailState):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO tail_offsets (path, config_hash, inode, size, byte_offset, char_offset, head_sha256, chunk_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (path, self.config_hash, *state),
+            )
+
+    def close(self):
+        self.conn.close()
@@ -3,8 +3,32 @@ ShieldCraft AI Data Ingestion Pipeline Scaffold
 """
 
 import os
+from itertools import islice
 from infra.utils.config_loader import get_config_loader
 from ai_core.chunking.chunking import Chunker, ChunkingConfig
+from data_prep.mmap_reader import iter_mmap_windows, last_record_end
+from data_prep.ingest_index import (
+    CHUNK_BATCH_SIZE,
+    TAIL_HEAD_BYTES,
+    IngestIndex,
+    TailState,
+    config_fingerprint,
+    file_head_sha256,
+    file_sha256,
+    text_sha256,
+)
+
+
+def _shift_chunk(chunk, shift, chunk_index):
+    # Move a chunk cut from a window back to whole-file character positions,
+    # numbering it in file order rather than within its window
+    chunk.chunk_index = chunk_index
+    chunk.start_offset += shift
+    chunk.end_offset += shift
+    for key, value in chunk.metadata.items():
+        if key.endswith("_offset"):
+            chunk.metadata[key] = value + shift
+    return chunk
 
 
 class DataIngestionPipeline:
@@ -19,6 +43,9 @@ class DataIngestionPipeline:
             "allowed_extensions", [".txt", ".log", ".json"]
         )
         self.enable_chunking = config.get("enable_chunking", True)
+        # Files at or above this size are chunked through mmap windows
+        self.mmap_threshold_bytes = config.get("mmap_threshold_bytes", 64 * 1024**2)
+        self.mmap_window_bytes = config.get("mmap_window_bytes", 4 * 1024**2)
         # Chunking config
         chunking_cfg = config.get(
             "chunking",
@@ -36,6 +63,51 @@ class DataIngestionPipeline:
         except (TypeError, ValueError) as e:
             print(f"[ERROR] Chunker initialization failed: {e}")
             self.chunker = None
+        # JSON and log files are packed as whole records instead of being cut
+        # mid-object by the configured strategy
+        self.record_extensions = config.get(
+            "record_extensions", [".json", ".jsonl", ".log"]
+        )
+        self.record_chunker = None
+        if self.chunker and self.record_extensions:
+            # Per-strategy block (chunking.json_records) overrides the generic
+            # chunk_size/min_length
+            record_cfg = chunking_cfg.get("json_records") or {}
+            self.record_chunker = Chunker(
+                ChunkingConfig(
+                    strategy="json_records",
+                    chunk_size=record_cfg.get(
+                        "chunk_size", chunking_cfg.get("chunk_size", 512)
+                    ),
+                    min_length=record_cfg.get(
+                        "min_length", chunking_cfg.get("min_length", 0)
+                    ),
+                )
+            )
+        # Persistent content-hash index: skips unchanged files across runs
+        self.dedup_index_path = config.get("dedup_index_path", None)
+        self.index = None
+        if self.dedup_index_path:
+            config_hash = config_fingerprint(
+                {
+                    "chunking": chunking_cfg if self.chunker else None,
+                    "record_extensions": (
+                        self.record_extensions if self.record_chunker else None
+                    ),
+                    "mmap_threshold_bytes": self.mmap_threshold_bytes,
+                    "mmap_window_bytes": self.mmap_window_bytes,
+                }
+            )
+            self.index = IngestIndex(self.dedup_index_path, config_hash)
+        # Append-only logs are tailed from their last high-water mark
+        self.tail_mode = config.get("tail_mode", False)
+        self.tail_extensions = config.get("tail_extensions", [".log"])
+        self.tail_record_delimiter = config.get("tail_record_delimiter", "\n").encode(
+            "utf-8"
+        )
+        if self.tail_mode and self.index is None:
+            print("[ERROR] tail_mode requires dedup_index_path; tailing disabled.")
+            self.tail_mode = False
         print(
             f"[INFO] DataIngestionPipeline initialized | Source: {self.source_type} | Path: {self.source_path} | Batch size: {self.batch_size} | Chunking: {self.enable_chunking}"
         )
@@ -53,28 +125,161 @@ class DataIngestionPipeline:
         print("[ERROR] Unsupported source type.")
         return []
 
-    def read_batch(self, files):
-        batch = []
-        all_chunks = []
+    def iter_batch(self, files):
+        """
+        Lazily yield chunks (or raw texts when chunking is disabled) for the
+        next batch of files, so downstream consumers never hold the whole
+        batch in memory. With a dedup index, unchanged files are skipped and
+        only chunks not seen in earlier runs are yielded.
+        """
+        self._files_read = 0
+        self._files_skipped = 0
+        self._chunks_skipped = 0
         for f in files[: self.batch_size]:
             try:
-                with open(f, "r", encoding="utf-8") as infile:
-                    text = infile.read()
-                    batch.append(text)
-                    if self.enable_chunking and self.chunker:
-                        try:
-                            chunks = self.chunker.chunk(text)
-                            all_chunks.extend(chunks)
-                        except (ValueError, TypeError) as ce:
-                            print(f"[ERROR] Chunking failed for {f}: {ce}")
-                    else:
-                        all_chunks.append(text)
+                if self._use_tail(f):
+                    yield from self._iter_tail(f)
+                    continue
+                if self.index is None:
+                    yield from self._iter_file(f)
+                    continue
+                doc_hash = file_sha256(f)
+                if self.index.is_unchanged(f, doc_hash):
+                    self._files_skipped += 1
+                    continue
+                yield from self._iter_new(f, doc_hash, self._iter_file(f))
             except (OSError, UnicodeDecodeError) as e:
                 print(f"[ERROR] Failed to read {f}: {e}")
+            except (ValueError, TypeError) as ce:
+                print(f"[ERROR] Chunking failed for {f}: {ce}")
+
+    def _iter_file(self, f):
+        if self._use_mmap(f):
+            self._files_read += 1
+            yield from self._iter_mmap_chunks(f)
+            return
+        with open(f, "r", encoding="utf-8") as infile:
+            text = infile.read()
+        self._files_read += 1
+        if self.enable_chunking and self.chunker:
+            yield from self._chunker_for(f).iter_chunks(text)
+        else:
+            yield text
+
+    def _iter_new(self, f, doc_hash, items):
+        # Chunk hashes are staged a bounded batch at a time in one open index
+        # transaction; the document row commits last, so a file interrupted
+        # mid-way leaves no rows behind and is re-ingested on the next run
+        items = iter(items)
+        committed = False
+        try:
+            while True:
+                batch = list(islice(items, CHUNK_BATCH_SIZE))
+                if not batch:
+                    break
+                hashes = [text_sha256(getattr(item, "text", item)) for item in batch]
+                new = self.index.stage_chunks(hashes)
+                for item, h in zip(batch, hashes):
+                    if h not in new:
+                        self._chunks_skipped += 1
+                        continue
+                    # Later copies within the same batch count as duplicates
+                    new.discard(h)
+                    yield item
+            self.index.record_document(f, doc_hash)
+            committed = True
+        finally:
+            if not committed:
+                self.index.rollback()
+
+    def _chunker_for(self, f):
+        if self.record_chunker and os.path.splitext(f)[1] in self.record_extensions:
+            return self.record_chunker
+        return self.chunker
+
+    def _use_mmap(self, f):
+        if not (self.enable_chunking and self.chunker and self.mmap_threshold_bytes):
+            return False
+        try:
+            return os.path.getsize(f) >= self.mmap_threshold_bytes
+        except OSError:
+            return False
+
+    def _iter_mmap_chunks(self, f):
+        """
+        Chunk a large file one line-aligned mmap window at a time. Chunk
+        offsets are shifted back to character positions in the whole file
+        and chunk indices run 0..N-1 across all windows.
+        """
+        n_chunks = 0
+        for _, char_offset, text in iter_mmap_windows(f, self.mmap_window_bytes):
+            if not text.strip():
+                continue
+            for chunk in self._chunker_for(f).iter_chunks(text):
+                yield _shift_chunk(chunk, char_offset, n_chunks)
+                n_chunks += 1
+
+    def _use_tail(self, f):
+        return self.tail_mode and os.path.splitext(f)[1] in self.tail_extensions
+
+    def _iter_tail(self, f):
+        """
+        Chunk only the region appended since the last run, continuing the
+        file's chunk_index from where that run stopped. A trailing partial
+        record is left for the next run, and a replaced inode, a shrunken
+        file or a changed head (rotation, truncate-and-rewrite) restarts the
+        file from offset 0.
+        """
+        st = os.stat(f)
+        state = self.index.get_tail(f)
+        start, char_start, chunk_start = 0, 0, 0
+        if state is not None:
+            rotated = (
+                state.inode != st.st_ino
+                or st.st_size < state.byte_offset
+                or file_head_sha256(f, min(TAIL_HEAD_BYTES, state.byte_offset))
+                != state.head_sha256
+            )
+            if rotated:
+                print(f"[INFO] Log rotation detected for {f}; re-reading from start.")
+            else:
+                start, char_start = state.byte_offset, state.char_offset
+                chunk_start = state.chunk_count
+        end = last_record_end(f, start, st.st_size, self.tail_record_delimiter)
+        if end == start:
+            self._files_skipped += 1
+            return
+        self._files_read += 1
+        n_chars, n_chunks = 0, chunk_start
+        for _, char_offset, text in iter_mmap_windows(
+            f, self.mmap_window_bytes, start=start, stop=end
+        ):
+            n_chars = char_offset + len(text)
+            if not (self.enable_chunking and self.chunker):
+                yield text
+                continue
+            if not text.strip():
+                continue
+            for chunk in self._chunker_for(f).iter_chunks(text):
+                yield _shift_chunk(chunk, char_start + char_offset, n_chunks)
+                n_chunks += 1
+        # Only advance the high-water mark once the region was fully consumed
+        head = file_head_sha256(f, min(TAIL_HEAD_BYTES, end))
+        self.index.set_tail(
+            f,
+            TailState(st.st_ino, st.st_size, end, char_start + n_chars, head, n_chunks),
+        )
+
+    def read_batch(self, files):
+        output = list(self.iter_batch(files))
         print(
-            f"[INFO] Read {len(batch)} files in batch. Produced {len(all_chunks)} chunks."
+            f"[INFO] Read {self._files_read} files in batch. Produced {len(output)} chunks."
         )
-        return batch if not self.enable_chunking else all_chunks
+        if self.index is not None:
+            print(
+                f"[INFO] Dedup index | Unchanged files skipped: {self._files_skipped} | Duplicate chunks skipped: {self._chunks_skipped}"
+            )
+        return output
 
     def run(self):
         files = self.list_files()
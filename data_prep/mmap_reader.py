@@ -0,0 +1,91 @@
+"""
+ShieldCraft AI Memory-Mapped File Reader
+
+Reads large files through mmap in byte windows whose boundaries are snapped
+to line and UTF-8 character edges, so only the current window is ever decoded.
+"""
+
+import mmap
+import os
+from typing import Iterator, Optional, Tuple
+
+
+def _is_continuation_byte(byte: int) -> bool:
+    return byte & 0xC0 == 0x80
+
+
+def snap_boundary(
+    buf, lo: int, pos: int, snap_lines: bool = True, limit: Optional[int] = None
+) -> int:
+    """
+    Move the exclusive end ``pos`` of the window starting at ``lo`` back to the
+    last line edge, or failing that to a UTF-8 character edge. A window is
+    never allowed to become empty: if no edge exists after ``lo``, the end is
+    moved forward past the current character instead. ``limit`` caps the
+    window end (default: end of buffer).
+    """
+    limit = len(buf) if limit is None else limit
+    if pos >= limit:
+        return limit
+    if snap_lines:
+        nl = buf.rfind(b"\n", lo, pos)
+        if nl != -1:
+            return nl + 1
+    end = pos
+    while end > lo and _is_continuation_byte(buf[end]):
+        end -= 1
+    if end > lo:
+        return end
+    end = pos + 1
+    while end < limit and _is_continuation_byte(buf[end]):
+        end += 1
+    return end
+
+
+def last_record_end(path: str, start: int, stop: int, delimiter: bytes = b"\n") -> int:
+    """
+    Byte offset just past the last ``delimiter`` in ``[start, stop)``, or
+    ``start`` if the region holds no complete record yet.
+    """
+    if stop <= start:
+        return start
+    with (
+        open(path, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf,
+    ):
+        pos = buf.rfind(delimiter, start, min(stop, len(buf)))
+    return start if pos == -1 else pos + len(delimiter)
+
+
+def iter_mmap_windows(
+    path: str,
+    window_bytes: int = 4 * 1024 * 1024,
+    snap_lines: bool = True,
+    encoding: str = "utf-8",
+    start: int = 0,
+    stop: Optional[int] = None,
+) -> Iterator[Tuple[int, int, str]]:
+    """
+    Yield ``(byte_offset, char_offset, text)`` for consecutive windows of
+    ``path`` between byte offsets ``start`` and ``stop`` (default: end of
+    file). ``char_offset`` is the character position of the window relative
+    to ``start``, so offsets computed inside a window can be shifted back to
+    document positions. Resident memory is bounded by one window.
+    """
+    if window_bytes < 1:
+        raise ValueError(f"Invalid window_bytes: {window_bytes}")
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        stop = size if stop is None else min(stop, size)
+        if stop <= start:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            char_start = 0
+            while start < stop:
+                end = snap_boundary(
+                    buf, start, start + window_bytes, snap_lines, limit=stop
+                )
+                text = buf[start:end].decode(encoding)
+                yield start, char_start, text
+                char_start += len(text)
+                start = end
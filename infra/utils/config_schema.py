@@ -12,6 +12,11 @@ class BeirConfig(BaseModel):
     data_path: Optional[str] = "./beir_datasets"
     output_path: Optional[str] = "beir_results.json"
     batch_size: Optional[int] = 32
+    # Report recall vs. size/latency at these reduced widths; empty disables
+    dims: Optional[List[int]] = Field(default_factory=list)
+    # Report int8/binary two-stage search against exact float search
+    quantized: Optional[bool] = False
+    rescore_candidates: Optional[int] = 200
     model_config = ConfigDict(extra="ignore")
 
 
@@ -417,6 +422,9 @@ class EventBridgeConfig(BaseModel):
 
 class ChunkingConfig(BaseModel):
     strategy: Optional[str] = None
+    executor: Optional[str] = "thread"  # thread, process
+    max_workers: Optional[int] = 4
+    start_method: Optional[str] = "spawn"  # spawn, forkserver; process executor
     fixed: Optional[Dict[str, Any]] = None
     semantic: Optional[Dict[str, Any]] = None
     recursive: Optional[Dict[str, Any]] = None
@@ -424,6 +432,7 @@ class ChunkingConfig(BaseModel):
     token_based: Optional[Dict[str, Any]] = None
     sliding_window: Optional[Dict[str, Any]] = None
     custom_heuristic: Optional[Dict[str, Any]] = None
+    json_records: Optional[Dict[str, Any]] = None
     model_config = ConfigDict(extra="ignore")
 
 
@@ -439,6 +448,21 @@ class EmbeddingConfig(BaseModel):
     quantize: Optional[bool] = False
     device: Optional[str] = "cpu"
     batch_size: Optional[int] = 32
+    length_bucketing: Optional[bool] = False
+    max_tokens_per_batch: Optional[int] = 8192
+    stream_window: Optional[int] = 1024
+    pipelined: Optional[bool] = False
+    pipeline_stages: Optional[int] = 2  # 2: tokenize ahead, 3: also pool off-thread
+    pooling: Optional[str] = "mean"  # mean, cls, max
+    normalize: Optional[bool] = False
+    output_dtype: Optional[str] = "float32"  # float32, float16
+    projection_path: Optional[str] = None  # fitted EmbeddingProjection (.npz)
+    codes: Optional[Dict[str, Any]] = None  # binary: bool, int8_path: ScalarQuantizer
+    cache: Optional[Dict[str, Any]] = None
+    backend: Optional[str] = "torch"  # torch, onnx
+    onnx: Optional[Dict[str, Any]] = None
+    server: Optional[Dict[str, Any]] = None
+    bulk: Optional[Dict[str, Any]] = None
     model_config = ConfigDict(extra="ignore", protected_namespaces=())
 
 
@@ -449,7 +473,12 @@ class VectorStoreConfig(BaseModel):
     db_user: str
     db_password: str
     table_name: str
-    batch_size: Optional[int] = 100
+    batch_size: Optional[int] = 100  # rows per bulk page and commit
+    bulk_method: Optional[str] = "copy"  # copy, execute_values
+    dim: Optional[int] = 384
+    # min/max_connections, timeout, health_check_interval, max_retries, connect_timeout
+    pool: Optional[Dict[str, Any]] = None
+    projection_path: Optional[str] = None  # must match embedding.projection_path
     model_config = ConfigDict(extra="ignore")
 
     model_config = ConfigDict(extra="allow")
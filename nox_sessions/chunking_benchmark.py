@@ -0,0 +1,24 @@
+"""
+Chunking Benchmark Session for ShieldCraft AI
+- Runs the chunking throughput benchmark over all strategies
+- Pass `-- --baseline <report.json>` to gate on throughput regressions
+"""
+
+import nox
+
+
+@nox.session()
+def chunking_benchmark(session):
+    """
+    Benchmark every chunking strategy; extra args go to the benchmark CLI.
+    """
+    session.run("poetry", "install", external=True)
+    session.run(
+        "poetry",
+        "run",
+        "python",
+        "-m",
+        "ai_core.chunking.benchmark_chunking",
+        *session.posargs,
+        external=True,
+    )
@@ -0,0 +1,62 @@
+"""
+Offline stand-ins for the Hugging Face tokenizer and model used by EmbeddingModel
+"""
+
+from types import SimpleNamespace
+
+import pytest
+import torch
+
+
+class FakeBatch(dict):
+    def to(self, device):
+        return self
+
+
+class FakeTokenizer:
+    """Character-level tokenizer with the subset of the HF API encode relies on."""
+
+    def __call__(self, texts, padding=False, truncation=False, return_tensors=None):
+        ids = [[ord(c) % 97 + 1 for c in t] or [1] for t in texts]
+        enc = {"input_ids": ids, "attention_mask": [[1] * len(i) for i in ids]}
+        if padding or return_tensors:
+            return self.pad(enc, return_tensors=return_tensors)
+        return enc
+
+    def pad(self, encoded, return_tensors=None):
+        ids = encoded["input_ids"]
+        width = max(len(i) for i in ids)
+        input_ids = torch.tensor([list(i) + [0] * (width - len(i)) for i in ids])
+        return FakeBatch(input_ids=input_ids, attention_mask=(input_ids > 0).long())
+
+
+class FakeModel:
+    """Deterministic per-token hidden states; records the shape of every call."""
+
+    def __init__(self):
+        self.seen = []
+        self.shapes = []
+
+    def to(self, device):
+        return self
+
+    def __call__(self, input_ids, attention_mask):
+        self.seen.append(len(input_ids))
+        self.shapes.append(tuple(input_ids.shape))
+        x = input_ids.float()
+        hidden = torch.stack([x, x**0.5, -x], dim=-1)
+        return SimpleNamespace(last_hidden_state=hidden)
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    model = FakeModel()
+    monkeypatch.setattr(
+        "transformers.AutoTokenizer.from_pretrained",
+        lambda name: FakeTokenizer(),
+    )
+    monkeypatch.setattr(
+        "transformers.AutoModel.from_pretrained",
+        lambda name, **kwargs: model,
+    )
+    return model
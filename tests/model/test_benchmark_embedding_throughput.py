@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from ai_core.embedding.benchmark_throughput import (
+    generate_texts,
+    run_throughput_benchmark,
+)
+
+
+def test_generate_texts_is_deterministic_and_sized():
+    texts = generate_texts(5, 40, tokens_per_word=2.0)
+    assert texts == generate_texts(5, 40, tokens_per_word=2.0)
+    assert all(len(t.split()) == 20 for t in texts)
+    with pytest.raises(ValueError):
+        generate_texts(0, 10)
+
+
+def test_run_throughput_benchmark_sweeps_every_axis(fake_model, tmp_path):
+    out = tmp_path / "report.json"
+    report = run_throughput_benchmark(
+        batch_sizes=[2, 4],
+        threads=[1],
+        quantizations=["none"],
+        backends=["torch"],
+        token_lengths=[8, 24],
+        n_texts=8,
+        repeat=1,
+        isolate=False,
+        output_path=str(out),
+    )
+    rows = report["results"]
+    assert [(r["batch_size"], r["target_tokens"]) for r in rows] == [
+        (2, 8),
+        (4, 8),
+        (2, 24),
+        (4, 24),
+    ]
+    for row in rows:
+        assert row["success"] is True
+        assert row["latency_ms_p50"] <= row["latency_ms_p95"] <= row["latency_ms_p99"]
+        for field in ("docs_per_s", "tokens_per_s", "peak_rss_mb"):
+            assert row[field] > 0
+    # Longer synthetic texts really carry more tokens
+    assert rows[2]["mean_tokens"] > rows[0]["mean_tokens"]
+    assert fake_model.seen.count(4) >= 2
+    assert json.loads(out.read_text())["results"] == rows
+
+
+def test_run_throughput_benchmark_rejects_unknown_axes():
+    with pytest.raises(ValueError):
+        run_throughput_benchmark(backends=["tensorrt"], output_path=None)
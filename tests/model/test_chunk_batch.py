@@ -0,0 +1,114 @@
+"""
+Unit tests for the columnar ChunkBatch container in ai_core.chunking.chunk
+"""
+
+import numpy as np
+import pytest
+from ai_core.chunking.chunk import (
+    Chunk,
+    ChunkBatch,
+    FixedChunkingStrategy,
+    RecursiveChunkingStrategy,
+    SemanticChunkingStrategy,
+    SlidingWindowChunkingStrategy,
+)
+from ai_core.chunking.chunking import Chunker, ChunkingConfig
+
+
+def test_chunk_columnar_matches_chunk_list():
+    texts = ["abcdefghij", "klmnop"]
+    batch = FixedChunkingStrategy.chunk_columnar(
+        texts, ["d1", "d2"], chunk_size=3, overlap=1, min_length=2
+    )
+    expected = FixedChunkingStrategy.chunk(
+        texts[0], "d1", chunk_size=3, overlap=1, min_length=2
+    ) + FixedChunkingStrategy.chunk(
+        texts[1], "d2", chunk_size=3, overlap=1, min_length=2
+    )
+    assert len(batch) == len(expected)
+    assert [c.model_dump() for c in batch] == [c.model_dump() for c in expected]
+    assert list(batch.texts()) == [c.text for c in expected]
+
+
+def test_chunk_batch_columns_are_int64_and_docs_stored_once():
+    batch = SemanticChunkingStrategy.chunk_columnar(
+        ["a\n\nb\n\nc", "d\n\ne"], ["doc1", "doc2"]
+    )
+    assert batch.start_offset.dtype == np.int64
+    assert batch.end_offset.dtype == np.int64
+    assert batch.chunk_index.dtype == np.int64
+    assert batch.doc_ids == ["doc1", "doc2"]
+    assert batch.doc_ptr.tolist() == [0, 3, 5]
+    assert batch.doc_id(4) == "doc2"
+    assert [c.text for c in batch.doc_chunks(1)] == ["d", "e"]
+
+
+def test_chunk_batch_getitem_returns_chunk_view():
+    batch = FixedChunkingStrategy.chunk_columnar(["abcdef"], chunk_size=4)
+    chunk = batch[-1]
+    assert isinstance(chunk, Chunk)
+    assert chunk.text == "ef"
+    assert (chunk.start_offset, chunk.end_offset) == (4, 6)
+    with pytest.raises(IndexError):
+        batch[2]
+
+
+def test_chunk_batch_empty_documents_list():
+    batch = FixedChunkingStrategy.chunk_columnar([], chunk_size=4)
+    assert len(batch) == 0
+    assert batch.num_docs == 0
+    assert batch.to_chunks() == []
+
+
+def test_chunk_batch_rejects_mismatched_columns():
+    with pytest.raises(ValueError):
+        ChunkBatch("abc", [0, 1], [1], [0, 1])
+
+
+def test_recursive_offsets_point_into_source():
+    text = "short\n\n" + "x" * 25
+    chunks = RecursiveChunkingStrategy.chunk(text, max_chunk_size=10)
+    assert all(text[c.start_offset : c.end_offset] == c.text for c in chunks)
+    assert chunks[1].start_offset == 7
+
+
+def test_chunker_chunk_columnar():
+    chunker = Chunker(ChunkingConfig(chunk_size=5, overlap=2, min_length=2))
+    batch = chunker.chunk_columnar(["abcdefghij"], ["doc"])
+    assert list(batch.texts()) == ["abcde", "defgh", "ghij"]
+    with pytest.raises(ValueError):
+        chunker.chunk_columnar(["ok", ""])
+
+
+@pytest.mark.parametrize(
+    "strategy,params",
+    [
+        (FixedChunkingStrategy, {"chunk_size": 4, "overlap": 1, "min_length": 2}),
+        (FixedChunkingStrategy, {"chunk_size": 3, "overlap": 5, "min_length": 0}),
+        (
+            SlidingWindowChunkingStrategy,
+            {"window_size": 4, "step_size": 3, "min_length": 2},
+        ),
+        (
+            SlidingWindowChunkingStrategy,
+            {"window_size": 2, "step_size": 5, "min_length": 1},
+        ),
+    ],
+)
+def test_vectorized_windows_match_per_document_spans(strategy, params):
+    texts = ["a", "abcdefghij", "xyz", "0123456789abcdef", "ab"]
+    doc_ids = [f"d{i}" for i in range(len(texts))]
+    batch = strategy.chunk_columnar(texts, doc_ids, **params)
+    expected = [
+        c for t, d in zip(texts, doc_ids) for c in strategy.chunk(t, d, **params)
+    ]
+    assert [c.model_dump() for c in batch] == [c.model_dump() for c in expected]
+
+
+def test_vectorized_windows_reject_bad_input():
+    with pytest.raises(ValueError):
+        FixedChunkingStrategy.chunk_columnar(["abc", ""], chunk_size=2)
+    with pytest.raises(ValueError):
+        SlidingWindowChunkingStrategy.chunk_columnar(["abc"], step_size=0)
+    with pytest.raises(ValueError):
+        FixedChunkingStrategy.chunk_columnar(["abc"], ["d1", "d2"])
@@ -47,6 +47,22 @@ def test_non_string_input():
         chunker.chunk(123)
 
 
+def test_iter_chunks_streams_same_chunks():
+    config = ChunkingConfig(chunk_size=5, overlap=2, strategy="fixed", min_length=2)
+    chunker = Chunker(config)
+    text = "abcdefghij"
+    gen = chunker.iter_chunks(text)
+    assert not isinstance(gen, list)
+    assert [c.text for c in gen] == [c.text for c in chunker.chunk(text)]
+
+
+def test_iter_chunks_validates_eagerly():
+    config = ChunkingConfig(chunk_size=3, overlap=1, strategy="fixed", min_length=1)
+    chunker = Chunker(config)
+    with pytest.raises(ValueError):
+        chunker.iter_chunks("")
+
+
 def test_semantic_chunking_happy_path():
     config = ChunkingConfig(
         strategy="semantic", paragraph_delimiter="\n\n", min_length=1
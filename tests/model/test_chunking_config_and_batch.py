@@ -147,7 +147,6 @@ def test_token_based_chunking_param_passing(monkeypatch):
 
 
 # --- Test all strategies from config ---
-import itertools
 
 
 @pytest.mark.parametrize(
@@ -292,3 +291,124 @@ def test_custom_heuristic_chunking():
 def test_custom_heuristic_chunking_empty():
     with pytest.raises(ValueError):
         CustomHeuristicChunkingStrategy.chunk("")
+
+
+# --- Process-pool executor ---
+def _semantic_loader(extra):
+    class DummyConfigLoader:
+        def get_section(self, section):
+            return {"strategy": "semantic", "semantic": {"min_length": 1}, **extra}
+
+    return DummyConfigLoader()
+
+
+def test_chunk_batch_process_executor_matches_thread(monkeypatch):
+    monkeypatch.setattr(
+        "ai_core.chunking.chunk.get_config_loader",
+        lambda: _semantic_loader({"executor": "process", "max_workers": 2}),
+    )
+    with Chunker() as chunker:
+        assert chunker.executor == "process"
+        texts = ["a\n\nb", "ccc\n\nddd\n\neee", "f", "g\n\nh"]
+        doc_ids = ["d1", "d2", "d3", "d4"]
+        proc = chunker.chunk_batch(texts, doc_ids)
+        thread = chunker.chunk_batch(texts, doc_ids, executor="thread")
+    assert [[c.model_dump() for c in doc] for doc in proc] == [
+        [c.model_dump() for c in doc] for doc in thread
+    ]
+
+
+def test_chunk_columnar_process_executor(monkeypatch):
+    monkeypatch.setattr(
+        "ai_core.chunking.chunk.get_config_loader", lambda: _semantic_loader({})
+    )
+    with Chunker() as chunker:
+        texts = ["x\n\ny", "z" * 50, "w"]
+        batch = chunker.chunk_columnar(texts, executor="process", max_workers=2)
+        assert batch.doc_ptr.tolist() == [0, 2, 3, 4]
+        assert list(batch.texts()) == ["x", "y", "z" * 50, "w"]
+        # The worker pool outlives the call and is reused by the next batch
+        pool = chunker._pool
+        chunker.chunk_columnar(texts, executor="process", max_workers=2)
+        assert chunker._pool is pool
+        assert pool._mp_context.get_start_method() == "spawn"
+    assert chunker._pool is None
+
+
+def test_process_executor_keeps_json_record_metadata(monkeypatch):
+    class JsonConfigLoader:
+        def get_section(self, section):
+            return {
+                "strategy": "json_records",
+                "json_records": {"chunk_size": 40, "min_length": 1},
+                "executor": "process",
+                "max_workers": 2,
+            }
+
+    monkeypatch.setattr(
+        "ai_core.chunking.chunk.get_config_loader", lambda: JsonConfigLoader()
+    )
+    chunker = Chunker()
+    texts = [
+        '{"a": 1}\n{"b": 2}\n{"c": 3}\n',
+        '{"event": "login", "user": "root"}\n{"x": 1}\n',
+        '[{"k": 1}, {"k": 2}]',
+    ]
+    doc_ids = ["d1", "d2", "d3"]
+    proc = chunker.chunk_batch(texts, doc_ids)
+    chunker.close()
+    thread = chunker.chunk_batch(texts, doc_ids, executor="thread")
+    assert [[c.model_dump() for c in doc] for doc in proc] == [
+        [c.model_dump() for c in doc] for doc in thread
+    ]
+    assert proc[0][0].metadata["record_count"] == 3
+
+
+def test_process_executor_rejects_unpicklable_tokenizer(monkeypatch):
+    class TokenConfigLoader:
+        def get_section(self, section):
+            return {
+                "strategy": "token_based",
+                "token_based": {
+                    "chunk_size": 2,
+                    "overlap": 0,
+                    "min_length": 1,
+                    "tokenizer": lambda text: text.split(),
+                },
+                "executor": "process",
+            }
+
+    monkeypatch.setattr(
+        "ai_core.chunking.chunk.get_config_loader", lambda: TokenConfigLoader()
+    )
+    chunker = Chunker()
+    with pytest.raises(ValueError, match="executor 'thread'"):
+        chunker.chunk_batch(["a b c", "d e f"], max_workers=2)
+    assert chunker._pool is None
+    assert len(chunker.chunk_batch(["a b c"], executor="thread")[0]) == 2
+
+
+def test_unknown_start_method_rejected(monkeypatch):
+    monkeypatch.setattr(
+        "ai_core.chunking.chunk.get_config_loader",
+        lambda: _semantic_loader({"start_method": "fork"}),
+    )
+    with pytest.raises(ValueError):
+        Chunker()
+
+
+def test_unknown_executor_rejected(monkeypatch):
+    monkeypatch.setattr(
+        "ai_core.chunking.chunk.get_config_loader",
+        lambda: _semantic_loader({"executor": "gpu"}),
+    )
+    with pytest.raises(ValueError):
+        Chunker()
+
+
+def test_balanced_groups_spread_load():
+    from ai_core.chunking.chunk import _balanced_groups
+
+    groups = _balanced_groups([100, 1, 1, 1, 100, 1], 2)
+    assert sorted(i for g in groups for i in g) == list(range(6))
+    assert all(sum([100, 1, 1, 1, 100, 1][i] for i in g) < 150 for g in groups)
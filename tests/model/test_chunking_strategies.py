@@ -11,7 +11,9 @@ from ai_core.chunking.chunk import (
     TokenBasedChunkingStrategy,
     SlidingWindowChunkingStrategy,
     CustomHeuristicChunkingStrategy,
+    JsonRecordChunkingStrategy,
     Chunk,
+    iter_json_records,
 )
 
 
@@ -219,3 +221,173 @@ def test_empty_input(strategy_cls):
     elif strategy_cls is CustomHeuristicChunkingStrategy:
         with pytest.raises(ValueError):
             CustomHeuristicChunkingStrategy.chunk("")
+
+
+def test_iter_chunks_is_lazy():
+    text = "abcdefghij" * 1000
+    gen = FixedChunkingStrategy.iter_chunks(text, chunk_size=10)
+    first = next(gen)
+    assert isinstance(first, Chunk)
+    assert first.text == "abcdefghij"
+
+
+@pytest.mark.parametrize(
+    "strategy_cls,params,text",
+    [
+        (FixedChunkingStrategy, {"chunk_size": 3, "overlap": 1}, "abcdefghij"),
+        (SemanticChunkingStrategy, {}, "para1\n\npara2\n\npara3"),
+        (RecursiveChunkingStrategy, {"max_chunk_size": 4}, "para1\n\npara2"),
+        (SentenceChunkingStrategy, {}, "Hello world! How are you? I am fine."),
+        (SlidingWindowChunkingStrategy, {"window_size": 4, "step_size": 2}, "abcdefgh"),
+        (CustomHeuristicChunkingStrategy, {"delimiter": "-"}, "a-b-c"),
+    ],
+)
+def test_chunk_matches_iter_chunks(strategy_cls, params, text):
+    listed = strategy_cls.chunk(text, **params)
+    streamed = list(strategy_cls.iter_chunks(text, **params))
+    assert [c.model_dump() for c in listed] == [c.model_dump() for c in streamed]
+
+
+def test_semantic_chunking_repeated_paragraph_offsets():
+    text = "same\n\nother\n\nsame"
+    chunks = SemanticChunkingStrategy.chunk(text)
+    assert [c.start_offset for c in chunks] == [0, 6, 13]
+    assert all(text[c.start_offset : c.end_offset] == c.text for c in chunks)
+
+
+def test_sentence_chunking_repeated_sentence_offsets():
+    text = "Alert fired.  Alert fired. Done!"
+    chunks = SentenceChunkingStrategy.chunk(text)
+    assert [c.text for c in chunks] == ["Alert fired.", "Alert fired.", "Done!"]
+    assert [c.start_offset for c in chunks] == [0, 14, 27]
+    assert all(text[c.start_offset : c.end_offset] == c.text for c in chunks)
+
+
+def test_custom_heuristic_chunking_regex_rules():
+    text = "2024-01-01 boot\nok\n2024-01-02 login\n---\ntrailer"
+    chunks = CustomHeuristicChunkingStrategy.chunk(
+        text, delimiter="\n---\n", rules={"record_start": r"\n(?=\d{4}-\d{2}-\d{2})"}
+    )
+    assert [c.text for c in chunks] == [
+        "2024-01-01 boot\nok",
+        "2024-01-02 login",
+        "trailer",
+    ]
+    assert all(text[c.start_offset : c.end_offset] == c.text for c in chunks)
+
+
+def test_custom_heuristic_chunking_invalid_rule():
+    with pytest.raises(ValueError):
+        CustomHeuristicChunkingStrategy.chunk("a-b", delimiter="-", rules={"bad": "("})
+
+
+def _fast_word_tokenizer():
+    transformers = pytest.importorskip("transformers")
+    tokenizers = pytest.importorskip("tokenizers")
+    vocab = {"[UNK]": 0, "alert": 1, "from": 2, "guardduty": 3, "high": 4, "!": 5}
+    backend = tokenizers.Tokenizer(
+        tokenizers.models.WordLevel(vocab=vocab, unk_token="[UNK]")
+    )
+    backend.pre_tokenizer = tokenizers.pre_tokenizers.Whitespace()
+    return transformers.PreTrainedTokenizerFast(
+        tokenizer_object=backend, unk_token="[UNK]"
+    )
+
+
+def test_token_based_chunking_character_offsets():
+    class DummyTokenizer:
+        def __call__(self, text):
+            return text.split()
+
+    text = "a  b c d"
+    chunks = TokenBasedChunkingStrategy.chunk(
+        text, tokenizer=DummyTokenizer(), chunk_size=2
+    )
+    assert [c.text for c in chunks] == ["a  b", "c d"]
+    assert [(c.start_offset, c.end_offset) for c in chunks] == [(0, 4), (5, 8)]
+
+
+def test_token_based_chunking_rejects_unalignable_tokens():
+    with pytest.raises(ValueError):
+        TokenBasedChunkingStrategy.chunk("a b", tokenizer=lambda t: [1, 2])
+
+
+def test_token_based_chunking_fast_tokenizer_offsets():
+    tokenizer = _fast_word_tokenizer()
+    text = "alert  from GuardDuty: high!"
+    chunks = TokenBasedChunkingStrategy.chunk(text, tokenizer=tokenizer, chunk_size=2)
+    assert [c.text for c in chunks] == ["alert  from", "GuardDuty:", "high!"]
+    assert all(text[c.start_offset : c.end_offset] == c.text for c in chunks)
+
+
+def test_token_based_chunk_columnar_batch_mode():
+    tokenizer = _fast_word_tokenizer()
+    texts = ["alert from guardduty", "high alert"]
+    batch = TokenBasedChunkingStrategy.chunk_columnar(
+        texts, ["d1", "d2"], tokenizer=tokenizer, chunk_size=2
+    )
+    assert list(batch.texts()) == ["alert from", "guardduty", "high alert"]
+    assert batch.doc_ptr.tolist() == [0, 2, 3]
+
+
+def test_iter_json_records_keeps_records_whole():
+    text = (
+        '{"a": 1}\n'
+        '{"msg": "brace } in string"}\n'
+        "\n"
+        '{"nested":\n  {"list": [1,\n 2]}\n}\n'
+        "plain log line\n"
+    )
+    records = [text[s:e] for s, e in iter_json_records(text)]
+    assert records == [
+        '{"a": 1}',
+        '{"msg": "brace } in string"}',
+        '{"nested":\n  {"list": [1,\n 2]}\n}',
+        "plain log line",
+    ]
+
+
+def test_iter_json_records_top_level_array():
+    text = '[\n  {"a": 1},\n  {\n    "b": [2]\n  }\n]\n'
+    records = [text[s:e] for s, e in iter_json_records(text)]
+    assert records == ['{"a": 1}', '{\n    "b": [2]\n  }']
+
+
+def test_json_record_chunking_packs_to_budget_with_metadata():
+    records = ['{"id": %d, "pad": "xxxxxxxx"}' % i for i in range(10)]
+    text = "\n".join(records)
+    chunks = JsonRecordChunkingStrategy.chunk(text, chunk_size=80)
+    assert all(len(c.text) <= 80 for c in chunks)
+    assert sum(c.metadata["record_count"] for c in chunks) == 10
+    assert "\n".join(c.text for c in chunks) == text
+    for c in chunks:
+        assert c.metadata["first_record_offset"] == c.start_offset
+        assert text[c.metadata["last_record_offset"] : c.end_offset] in records
+    spans = list(JsonRecordChunkingStrategy.iter_spans(text, chunk_size=80))
+    assert spans == [(c.start_offset, c.end_offset, c.chunk_index) for c in chunks]
+
+
+def test_json_record_chunking_never_splits_large_record():
+    big = '{"blob": "%s"}' % ("z" * 100)
+    chunks = JsonRecordChunkingStrategy.chunk('{"a": 1}\n' + big, chunk_size=20)
+    assert [c.text for c in chunks] == ['{"a": 1}', big]
+
+
+def test_truncated_json_line_does_not_swallow_rest_of_file():
+    good = ['{"id": %d}' % i for i in range(1000)]
+    text = '{"a":1}\n{ broken line from app\n' + "\n".join(good) + "\n"
+    records = [text[s:e] for s, e in iter_json_records(text)]
+    assert records == ['{"a":1}', "{ broken line from app"] + good
+    chunks = JsonRecordChunkingStrategy.chunk(text, chunk_size=100)
+    assert max(len(c.text) for c in chunks) <= 100
+    assert sum(c.metadata["record_count"] for c in chunks) == 1002
+
+
+def test_unclosed_multiline_record_is_capped_to_lines():
+    # Indented lines never trigger the top-level restart; the cap ends it
+    lines = ['{"open": ['] + ['  {"k": %d},' % i for i in range(50)]
+    text = "\n".join(lines)
+    records = [text[s:e] for s, e in iter_json_records(text, max_record=60)]
+    assert max(len(r) for r in records) <= 60 + len(lines[1])
+    assert len(records) > 1
+    assert iter_json_records(text).__next__() == (0, len(text))
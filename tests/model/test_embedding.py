@@ -11,6 +11,7 @@ import torch
 
 def test_embedding_model_initialization():
     embedder = EmbeddingModel()
+    assert embedder.warmup()
     assert embedder.model is not None
     assert embedder.tokenizer is not None
     assert embedder.device in ("cpu", "cuda")
@@ -75,6 +76,7 @@ def test_embedding_model_quantization_configs(monkeypatch):
     # Test float16 quantization
     config = {"quantize": True, "quantization_type": "float16"}
     embedder = EmbeddingModel(config=config)
+    embedder.warmup()
     assert embedder.model is not None
     # Test int8 quantization (should fallback if not supported)
     config = {"quantize": True, "quantization_type": "int8"}
@@ -90,11 +92,13 @@ def test_embedding_model_device_selection(monkeypatch):
     # Force CPU
     config = {"device": "cpu"}
     embedder = EmbeddingModel(config=config)
+    embedder.warmup()
     assert embedder.device == "cpu"
     # Force CUDA if available
     if hasattr(embedder, "model") and torch.cuda.is_available():
         config = {"device": "cuda"}
         embedder = EmbeddingModel(config=config)
+        embedder.warmup()
         assert embedder.device == "cuda"
 
 
@@ -0,0 +1,32 @@
+"""
+Unit tests for length-bucketed batching in EmbeddingModel.encode
+"""
+
+import numpy as np
+
+from ai_core.embedding.embedding import EmbeddingModel, length_buckets
+
+
+def test_length_buckets_respect_token_budget():
+    lengths = [20, 500, 22, 510, 21, 3]
+    buckets = length_buckets(lengths, max_tokens=64)
+    assert sorted(i for b in buckets for i in b) == list(range(len(lengths)))
+    for b in buckets:
+        assert len(b) == 1 or len(b) * max(lengths[i] for i in b) <= 64
+    # Oversize texts are still encoded, alone
+    assert [1] in buckets and [3] in buckets
+
+
+def test_bucketed_encode_preserves_order_and_cuts_padding(fake_model):
+    texts = ["short", "x" * 60, "tiny", "y" * 58, "mid-length text"]
+    embedder = EmbeddingModel(
+        config={"device": "cpu", "length_bucketing": True, "max_tokens_per_batch": 64}
+    )
+    result = embedder.encode(texts)
+    assert result["success"] is True
+    padded = sum(rows * width for rows, width in fake_model.shapes)
+    assert padded < len(texts) * 60
+    # Each row matches encoding the text on its own
+    for text, row in zip(texts, result["embeddings"]):
+        alone = embedder.encode([text])["embeddings"][0]
+        np.testing.assert_allclose(row, alone, rtol=1e-6)
@@ -0,0 +1,117 @@
+"""
+Unit tests for multi-process bulk embedding into a shared memmap
+"""
+
+import os
+
+import numpy as np
+
+from ai_core.embedding.bulk import bulk_embed
+
+
+class LengthModel:
+    def encode(self, texts):
+        emb = np.array([[len(t), t.count("a"), 1.0] for t in texts], dtype=np.float32)
+        return {"success": True, "embeddings": emb, "error": None}
+
+
+class FailingModel:
+    def encode(self, texts):
+        return {"success": False, "embeddings": None, "error": "model not loaded"}
+
+
+class ProjectedModel:
+    def encode(self, texts):
+        emb = np.array([[len(t), 1.0] for t in texts], dtype=np.float32)
+        return {"success": True, "embeddings": emb, "error": None}
+
+
+def projected_model_factory(config):
+    return ProjectedModel()
+
+
+def length_model_factory(config):
+    return LengthModel()
+
+
+def failing_model_factory(config):
+    return FailingModel()
+
+
+def test_bulk_embed_writes_rows_in_order_from_all_workers(tmp_path):
+    texts = ["a" * (i % 7) + "b" * i for i in range(50)]
+    out_path = str(tmp_path / "emb.npy")
+    report = bulk_embed(
+        texts,
+        out_path,
+        config={},
+        num_workers=2,
+        threads_per_worker=1,
+        shard_size=8,
+        dim=3,
+        model_factory=length_model_factory,
+    )
+    assert report["success"] is True, report["error"]
+    out = np.load(out_path, mmap_mode="r")
+    expected = LengthModel().encode(texts)["embeddings"]
+    np.testing.assert_array_equal(out, expected)
+    assert sum(w["docs"] for w in report["workers"].values()) == len(texts)
+    assert os.getpid() not in report["workers"]
+    assert report["docs_per_s"] > 0
+    assert all(w["docs_per_s"] > 0 for w in report["workers"].values())
+
+
+def test_bulk_embed_reports_worker_failure(tmp_path):
+    report = bulk_embed(
+        ["x", "y"],
+        str(tmp_path / "emb.npy"),
+        config={},
+        num_workers=1,
+        dim=3,
+        model_factory=failing_model_factory,
+    )
+    assert report["success"] is False
+    assert "model not loaded" in report["error"]
+
+
+def test_bulk_embed_rejects_empty_input(tmp_path):
+    report = bulk_embed([], str(tmp_path / "emb.npy"), config={}, dim=3)
+    assert report["success"] is False
+
+
+def test_bulk_embed_takes_width_from_configured_projection(tmp_path):
+    from ai_core.embedding.projection import EmbeddingProjection
+
+    sample = np.random.default_rng(0).normal(size=(20, 6)).astype(np.float32)
+    path = EmbeddingProjection.fit(sample, 2).save(str(tmp_path / "proj"))
+    out_path = str(tmp_path / "emb.npy")
+    report = bulk_embed(
+        ["x", "yy", "zzz"],
+        out_path,
+        config={"projection_path": path, "bulk": {"dim": 6}},
+        num_workers=1,
+        threads_per_worker=1,
+        model_factory=projected_model_factory,
+    )
+    assert report["success"] is True, report["error"]
+    assert report["shape"] == (3, 2)
+    np.testing.assert_array_equal(np.load(out_path)[:, 0], [1, 2, 3])
+
+
+def test_bulk_embed_writes_configured_output_dtype(tmp_path):
+    out_path = str(tmp_path / "emb.npy")
+    report = bulk_embed(
+        ["a", "bb"],
+        out_path,
+        config={"output_dtype": "float16"},
+        num_workers=1,
+        threads_per_worker=1,
+        dim=3,
+        model_factory=length_model_factory,
+    )
+    assert report["success"] is True, report["error"]
+    out = np.load(out_path)
+    assert out.dtype == np.float16 and report["dtype"] == "float16"
+    np.testing.assert_array_equal(out[:, 0], [1, 2])
+    bad = bulk_embed(["a"], out_path, config={"output_dtype": "int8"}, dim=3)
+    assert bad["success"] is False and "output_dtype" in bad["error"]
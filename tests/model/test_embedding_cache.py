@@ -0,0 +1,130 @@
+"""
+Unit tests for the two-tier embedding cache and its use in EmbeddingModel.encode
+"""
+
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from ai_core.embedding.cache import (
+    DiskVectorStore,
+    EmbeddingCache,
+    LRUVectorCache,
+    cache_key,
+)
+from ai_core.embedding.embedding import EmbeddingModel
+
+
+def test_cache_key_scopes_model_and_quantization():
+    assert cache_key("m", "none", "x") == cache_key("m", "none", "x")
+    assert cache_key("m", "none", "x") != cache_key("m", "int8", "x")
+    assert cache_key("m", "none", "x") != cache_key("n", "none", "x")
+
+
+def test_lru_evicts_past_byte_budget():
+    lru = LRUVectorCache(max_bytes=3 * 16)
+    for i in range(3):
+        lru.put(bytes([i]), np.full(4, i, dtype=np.float32))
+    lru.get(bytes([0]))
+    lru.put(bytes([3]), np.zeros(4, dtype=np.float32))
+    assert lru.get(bytes([1])) is None
+    assert lru.get(bytes([0])) is not None
+    assert lru.nbytes == 3 * 16
+
+
+def test_disk_store_persists_and_ignores_torn_rows(tmp_path):
+    store = DiskVectorStore(str(tmp_path))
+    keys = [bytes([i]) * 32 for i in range(3)]
+    vecs = np.arange(12, dtype=np.float32).reshape(3, 4)
+    store.put_many(keys, vecs)
+    # Simulate a crash after the vectors of a fourth row were written
+    with open(tmp_path / "vectors.bin", "ab") as f:
+        f.write(np.ones(4, dtype=np.float32).tobytes())
+    reopened = DiskVectorStore(str(tmp_path))
+    assert len(reopened) == 3
+    np.testing.assert_array_equal(reopened.get(keys[2]), vecs[2])
+    reopened.put_many([b"\x09" * 32], np.full((1, 4), 7, dtype=np.float32))
+    np.testing.assert_array_equal(reopened.get(b"\x09" * 32), np.full(4, 7))
+    with pytest.raises(ValueError):
+        reopened.put_many([b"\x0a" * 32], np.zeros((1, 5), dtype=np.float32))
+
+
+_WRITER = """
+import sys
+import numpy as np
+from ai_core.embedding.cache import DiskVectorStore
+
+path, tag, offset = sys.argv[1], sys.argv[2], int(sys.argv[3])
+for i in range(200):
+    store = DiskVectorStore(path) if i % 50 == 0 else store
+    key = f"{tag}-{i}".encode().ljust(32, b"\\0")
+    store.put_many([key], np.full((1, 4), offset + i, dtype=np.float32))
+"""
+
+
+def test_disk_store_shared_by_two_writer_processes(tmp_path):
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-c", _WRITER, str(tmp_path), tag, str(offset)]
+        )
+        for tag, offset in (("alpha", 0), ("beta", 1000))
+    ]
+    assert [p.wait(timeout=60) for p in procs] == [0, 0]
+    store = DiskVectorStore(str(tmp_path))
+    assert len(store) == 400
+    for tag, offset in (("alpha", 0), ("beta", 1000)):
+        for i in range(200):
+            vec = store.get(f"{tag}-{i}".encode().ljust(32, b"\0"))
+            assert vec is not None and vec[0] == offset + i
+
+
+def test_disk_store_sees_rows_appended_by_another_instance(tmp_path):
+    reader = DiskVectorStore(str(tmp_path))
+    writer = DiskVectorStore(str(tmp_path))
+    writer.put_many([b"a" * 32], np.ones((1, 4), dtype=np.float32))
+    np.testing.assert_array_equal(reader.get(b"a" * 32), np.ones(4))
+    reader.put_many([b"b" * 32], np.full((1, 4), 2, dtype=np.float32))
+    np.testing.assert_array_equal(writer.get(b"b" * 32), np.full(4, 2))
+    np.testing.assert_array_equal(writer.get(b"a" * 32), np.ones(4))
+    assert len(reader) == len(writer) == 2
+
+
+def test_encode_only_runs_model_on_misses(fake_model):
+    embedder = EmbeddingModel(
+        config={"device": "cpu", "cache": {"enabled": True}, "batch_size": 8}
+    )
+    uncached = EmbeddingModel(config={"device": "cpu", "batch_size": 8})
+    texts = ["alpha", "beta", "alpha", "gamma", "beta"]
+    expected = uncached.encode(texts)["embeddings"]
+    fake_model.seen.clear()
+    result = embedder.encode(texts)
+    assert result["success"] is True
+    np.testing.assert_allclose(result["embeddings"], expected, rtol=1e-6)
+    assert fake_model.seen == [3]
+    again = embedder.encode(["gamma", "delta", "alpha"])
+    assert fake_model.seen == [3, 1]
+    np.testing.assert_allclose(again["embeddings"][0], expected[3], rtol=1e-6)
+    assert again["cache"]["memory_hits"] == 2
+
+
+def test_encode_reads_disk_tier_across_instances(fake_model, tmp_path):
+    config = {
+        "device": "cpu",
+        "cache": {"enabled": True, "disk_path": str(tmp_path), "memory_bytes": 0},
+    }
+    first = EmbeddingModel(config=config).encode(["one", "two"])["embeddings"]
+    fake_model.seen.clear()
+    result = EmbeddingModel(config=config).encode(["two", "one"])
+    assert fake_model.seen == []
+    assert result["cache"]["disk_hits"] == 2
+    np.testing.assert_array_equal(result["embeddings"], first[::-1])
+
+
+def test_embedding_cache_separates_quantization_on_disk(tmp_path):
+    a = EmbeddingCache("m", "none", disk_path=str(tmp_path))
+    b = EmbeddingCache("m", "int8", disk_path=str(tmp_path))
+    a.put_many([a.key("x")], np.ones((1, 2), dtype=np.float32))
+    assert b.get(b.key("x")) is None
+    assert a.disk.directory != b.disk.directory
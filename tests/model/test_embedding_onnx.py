@@ -0,0 +1,85 @@
+"""
+Unit tests for the ONNX Runtime embedding backend
+"""
+
+import os
+
+import numpy as np
+import pytest
+import torch
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")
+
+from transformers import BertConfig, BertModel
+
+from ai_core.embedding.embedding import EmbeddingModel
+from ai_core.embedding.onnx_backend import artifact_paths
+from tests.model.conftest import FakeTokenizer
+
+
+@pytest.fixture
+def tiny_bert(monkeypatch):
+    torch.manual_seed(0)
+    model = BertModel(
+        BertConfig(
+            vocab_size=128,
+            hidden_size=32,
+            num_hidden_layers=2,
+            num_attention_heads=2,
+            intermediate_size=64,
+        )
+    ).eval()
+    monkeypatch.setattr(
+        "transformers.AutoTokenizer.from_pretrained",
+        lambda name: FakeTokenizer(),
+    )
+    monkeypatch.setattr(
+        "transformers.AutoModel.from_pretrained",
+        lambda name, **kwargs: model,
+    )
+    return model
+
+
+def _config(tmp_path, **onnx):
+    return {
+        "device": "cpu",
+        "model_name": "tiny-bert",
+        "backend": "onnx",
+        "onnx": {"cache_dir": str(tmp_path), "intra_op_threads": 1, **onnx},
+    }
+
+
+def test_onnx_int8_backend_matches_torch_within_tolerance(tiny_bert, tmp_path):
+    texts = ["root login from new ASN", "s3 bucket made public", "ok"]
+    torch_out = EmbeddingModel(config={"device": "cpu"}).encode(texts)["embeddings"]
+    embedder = EmbeddingModel(config=_config(tmp_path))
+    assert embedder.warmup()
+    assert embedder.backend == "onnx"
+    assert embedder.quant_status == "onnx-int8"
+    onnx_out = embedder.encode(texts)["embeddings"]
+    cos = (torch_out * onnx_out).sum(1) / (
+        np.linalg.norm(torch_out, axis=1) * np.linalg.norm(onnx_out, axis=1)
+    )
+    assert cos.min() > 0.99
+    fp32_path, int8_path = artifact_paths("tiny-bert", str(tmp_path))
+    assert os.path.exists(fp32_path) and os.path.exists(int8_path)
+
+
+def test_onnx_artifacts_are_reused(tiny_bert, tmp_path, monkeypatch):
+    EmbeddingModel(config=_config(tmp_path, quantize_int8=False)).warmup()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("export should not run again")
+
+    monkeypatch.setattr("ai_core.embedding.onnx_backend.export_onnx", fail)
+    embedder = EmbeddingModel(config=_config(tmp_path, quantize_int8=False))
+    embedder.warmup()
+    assert embedder.quant_status == "onnx-fp32"
+
+
+def test_onnx_backend_falls_back_when_output_drifts(tiny_bert, tmp_path):
+    embedder = EmbeddingModel(config=_config(tmp_path, min_cosine=1.01))
+    embedder.warmup()
+    assert embedder.backend == "torch"
+    assert isinstance(embedder.model, BertModel)
@@ -0,0 +1,55 @@
+"""
+Unit tests for pipelined tokenization / forward / pooling in EmbeddingModel
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from ai_core.embedding.embedding import EmbeddingModel
+from tests.model.conftest import FakeTokenizer
+
+
+def _texts(n):
+    return [f"finding {i} " + "y" * (i * 7 % 19) for i in range(n)]
+
+
+@pytest.mark.parametrize("stages", [2, 3])
+@pytest.mark.parametrize("bucketing", [False, True])
+def test_pipelined_output_matches_sequential(fake_model, stages, bucketing):
+    base = {
+        "device": "cpu",
+        "batch_size": 3,
+        "length_bucketing": bucketing,
+        "max_tokens_per_batch": 64,
+    }
+    texts = _texts(17)
+    expected = EmbeddingModel(config=base).encode(texts)["embeddings"]
+    embedder = EmbeddingModel(
+        config={**base, "pipelined": True, "pipeline_stages": stages}
+    )
+    result = embedder.encode(texts)
+    assert result["success"] is True
+    np.testing.assert_allclose(result["embeddings"], expected, rtol=1e-6)
+
+
+class RecordingTokenizer(FakeTokenizer):
+    def __init__(self):
+        self.threads = []
+
+    def __call__(self, *args, **kwargs):
+        self.threads.append(threading.current_thread().name)
+        return super().__call__(*args, **kwargs)
+
+
+def test_pipelined_tokenizes_on_background_thread(fake_model):
+    embedder = EmbeddingModel(
+        config={"device": "cpu", "batch_size": 2, "pipelined": True}
+    )
+    embedder.warmup()
+    embedder.tokenizer = RecordingTokenizer()
+    embedder.encode(_texts(6))
+    threads = embedder.tokenizer.threads
+    assert len(threads) == 3
+    assert all(name.startswith("embedding-tokenize") for name in threads)
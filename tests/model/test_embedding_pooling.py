@@ -0,0 +1,49 @@
+"""
+Unit tests for pooling modes, normalization and output dtype in EmbeddingModel
+"""
+
+import numpy as np
+import pytest
+
+from ai_core.embedding.embedding import EmbeddingModel
+
+
+def _embedder(**extra):
+    return EmbeddingModel(config={"device": "cpu", "batch_size": 8, **extra})
+
+
+@pytest.mark.parametrize("pooling", ["mean", "cls", "max"])
+def test_rows_do_not_depend_on_batch_padding(fake_model, pooling):
+    embedder = _embedder(pooling=pooling)
+    texts = ["ab", "a much longer alert text", "xyz"]
+    batched = embedder.encode(texts)["embeddings"]
+    for text, row in zip(texts, batched):
+        np.testing.assert_allclose(row, embedder.encode([text])["embeddings"][0])
+
+
+def test_pooling_modes_differ_as_expected(fake_model):
+    # FakeModel hidden state per token is [id, sqrt(id), -id]
+    ids = np.array([ord(c) % 97 + 1 for c in "abc"], dtype=np.float32)
+    mean = _embedder().encode(["abc"])["embeddings"][0]
+    cls = _embedder(pooling="cls").encode(["abc"])["embeddings"][0]
+    mx = _embedder(pooling="max").encode(["abc"])["embeddings"][0]
+    np.testing.assert_allclose(mean[0], ids.mean())
+    np.testing.assert_allclose(cls[0], ids[0])
+    np.testing.assert_allclose(mx, [ids.max(), np.sqrt(ids).max(), -ids.min()])
+
+
+def test_normalized_float16_output_supports_inner_product_search(fake_model):
+    embedder = _embedder(normalize=True, output_dtype="float16")
+    result = embedder.encode(["alpha", "beta gamma"])
+    emb = result["embeddings"]
+    assert emb.dtype == np.float16 and result["dtype"] == "float16"
+    np.testing.assert_allclose(
+        np.linalg.norm(emb.astype(np.float32), axis=1), 1.0, atol=1e-3
+    )
+
+
+def test_invalid_pooling_options_rejected(fake_model):
+    with pytest.raises(ValueError):
+        _embedder(pooling="median")
+    with pytest.raises(ValueError):
+        _embedder(output_dtype="int4")
@@ -0,0 +1,102 @@
+"""
+Unit tests for learned embedding projections and their use in EmbeddingModel and VectorStore
+"""
+
+import numpy as np
+import pytest
+
+from ai_core.embedding.embedding import EmbeddingModel
+from ai_core.embedding.projection import EmbeddingProjection, reduction_tradeoff
+from ai_core.vector_store import VectorStore
+
+
+def _sample(n=200, width=16, rank=4, seed=0):
+    rng = np.random.default_rng(seed)
+    basis = rng.normal(size=(rank, width))
+    return (rng.normal(size=(n, rank)) @ basis).astype(np.float32)
+
+
+def test_pca_keeps_low_rank_structure():
+    x = _sample()
+    projection = EmbeddingProjection.fit(x, 4)
+    reduced = projection.transform(x)
+    assert reduced.shape == (200, 4)
+    # Pairwise inner products of centred data survive a full-rank projection
+    centred = x - x.mean(axis=0)
+    np.testing.assert_allclose(reduced @ reduced.T, centred @ centred.T, atol=1e-2)
+
+
+def test_unit_norm_input_is_renormalized():
+    x = _sample()
+    x /= np.linalg.norm(x, axis=1, keepdims=True)
+    for method in ("pca", "truncate"):
+        projection = EmbeddingProjection.fit(x, 3, method=method)
+        assert projection.renormalize
+        norms = np.linalg.norm(projection.transform(x), axis=1)
+        np.testing.assert_allclose(norms, 1.0, atol=1e-5)
+
+
+def test_save_load_roundtrip_keeps_version(tmp_path):
+    projection = EmbeddingProjection.fit(_sample(), 2)
+    path = projection.save(str(tmp_path))
+    loaded = EmbeddingProjection.load(path)
+    assert loaded.version == projection.version
+    assert path.endswith(f"{projection.version}.npz")
+    other = EmbeddingProjection.fit(_sample(seed=1), 2)
+    assert other.version != projection.version
+    with pytest.raises(ValueError):
+        loaded.transform(np.zeros((1, 5)))
+    with pytest.raises(ValueError):
+        EmbeddingProjection.fit(_sample(), 2, method="umap")
+
+
+def test_encode_applies_projection_before_cache(fake_model, tmp_path):
+    texts = ["alpha", "beta gamma", "delta", "a much longer alert"]
+    full = EmbeddingModel(config={"device": "cpu"}).encode(texts)["embeddings"]
+    projection = EmbeddingProjection.fit(full, 2)
+    path = projection.save(str(tmp_path))
+    config = {"device": "cpu", "projection_path": path, "cache": {"enabled": True}}
+    embedder = EmbeddingModel(config=config)
+    result = embedder.encode(texts)
+    assert result["shape"] == (4, 2)
+    np.testing.assert_allclose(
+        result["embeddings"], projection.transform(full), rtol=1e-4, atol=1e-4
+    )
+    plain = EmbeddingModel(config={"device": "cpu", "cache": {"enabled": True}})
+    plain.warmup()
+    assert embedder.cache.key("alpha") != plain.cache.key("alpha")
+    # The store accepts both full-width and already-reduced rows
+    store = VectorStore(config={"projection_path": path})
+    assert store.dim == 2
+    np.testing.assert_allclose(
+        store._prepare(full), result["embeddings"], rtol=1e-4, atol=1e-4
+    )
+    np.testing.assert_array_equal(
+        store._prepare(result["embeddings"]), result["embeddings"]
+    )
+    with pytest.raises(ValueError):
+        store._prepare(np.zeros((1, 5)))
+
+
+def test_truncate_wider_than_model_output_fails(fake_model, tmp_path):
+    width = EmbeddingModel(config={"device": "cpu"}).encode(["a"])["shape"][1]
+    projection = EmbeddingProjection.fit(
+        _sample(width=width + 8), width + 4, method="truncate"
+    )
+    config = {"device": "cpu", "projection_path": projection.save(str(tmp_path))}
+    result = EmbeddingModel(config=config).encode(["alpha"])
+    assert result["success"] is False and "width" in result["error"]
+
+
+def test_reduction_tradeoff_reports_each_width():
+    corpus = _sample(n=100, width=16, rank=16)
+    queries = corpus[:10] + 0.01
+    relevant = [[i] for i in range(10)]
+    report = reduction_tradeoff(
+        corpus, queries, relevant, dims=(16, 8), k_values=(1, 5)
+    )
+    assert [r["dim"] for r in report] == [16, 8]
+    assert report[0]["version"] is None and report[1]["version"]
+    assert report[0]["recall@5"] == 1.0
+    assert report[1]["bytes_per_vector"] == 32
+    assert all(r["search_ms_per_query"] >= 0 for r in report)
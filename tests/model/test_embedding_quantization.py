@@ -0,0 +1,109 @@
+"""
+Unit tests for int8/binary embedding codes and two-stage QuantizedIndex search
+"""
+
+import numpy as np
+import pytest
+
+from ai_core.embedding.embedding import EmbeddingModel
+from ai_core.embedding.quantization import (
+    QuantizedIndex,
+    ScalarQuantizer,
+    binary_codes,
+    hamming_distances,
+    quantization_tradeoff,
+)
+
+
+def _corpus(n=500, width=32, seed=0):
+    rng = np.random.default_rng(seed)
+    x = rng.normal(size=(n, width)).astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+def test_scalar_quantizer_roundtrip_error_is_one_step():
+    x = _corpus()
+    quantizer = ScalarQuantizer.fit(x)
+    codes = quantizer.encode(x)
+    assert codes.dtype == np.int8 and codes.nbytes * 4 == x.nbytes
+    assert np.all(np.abs(quantizer.decode(codes) - x) <= quantizer.scale / 2 + 1e-6)
+    query = x[:3]
+    np.testing.assert_allclose(
+        quantizer.scores(query, codes), query @ quantizer.decode(codes).T, atol=1e-4
+    )
+
+
+def test_scalar_quantizer_save_load(tmp_path):
+    quantizer = ScalarQuantizer.fit(_corpus(), quantile=0.01)
+    loaded = ScalarQuantizer.load(quantizer.save(str(tmp_path)))
+    assert loaded.version == quantizer.version
+    with pytest.raises(ValueError):
+        loaded.encode(np.zeros((1, 3)))
+
+
+def test_hamming_distance_counts_sign_flips():
+    a = np.array([[1.0, -1.0, 1.0, 1.0, -1.0, 1.0, 1.0, 1.0, 1.0]])
+    b = -a
+    b[0, :2] = a[0, :2]
+    codes = binary_codes(np.vstack([a, b]))
+    assert codes.shape == (2, 2)
+    np.testing.assert_array_equal(hamming_distances(codes[0], codes), [[0, 7]])
+
+
+@pytest.mark.parametrize("code_type", ["int8", "binary"])
+def test_two_stage_search_matches_exact_top_k(code_type):
+    corpus = _corpus()
+    queries = corpus[:20] + 0.05 * _corpus(20, seed=1)
+    index = QuantizedIndex(corpus, code_type=code_type)
+    indices, scores = index.search(queries, top_k=5, candidates=100)
+    exact = np.argsort(-(queries @ corpus.T), axis=1)[:, :5]
+    np.testing.assert_array_equal(indices[:, 0], exact[:, 0])
+    np.testing.assert_allclose(
+        scores[:, 0], np.sum(queries * corpus[:20], axis=1), rtol=1e-5
+    )
+    report = index.memory_report()
+    assert report["compression"] == (4 if code_type == "int8" else 32)
+
+
+def test_search_reads_vectors_from_memmap(tmp_path):
+    corpus = _corpus()
+    path = tmp_path / "vectors.npy"
+    np.save(path, corpus)
+    index = QuantizedIndex(np.load(path, mmap_mode="r"), code_type="binary")
+    indices, _ = index.search(corpus[7], top_k=1)
+    assert indices.tolist() == [[7]]
+    with pytest.raises(ValueError):
+        QuantizedIndex(corpus, code_type="pq")
+
+
+@pytest.mark.parametrize("code_type", ["int8", "binary"])
+def test_empty_corpus_is_rejected(code_type):
+    with pytest.raises(ValueError, match="at least one vector"):
+        QuantizedIndex(np.empty((0, 8), dtype=np.float32), code_type=code_type)
+
+
+def test_encode_emits_codes_next_to_floats(fake_model, tmp_path):
+    base = EmbeddingModel(config={"device": "cpu"})
+    sample = base.encode(["alpha", "beta", "gamma delta"])["embeddings"]
+    path = ScalarQuantizer.fit(sample).save(str(tmp_path))
+    embedder = EmbeddingModel(
+        config={"device": "cpu", "codes": {"binary": True, "int8_path": path}}
+    )
+    result = embedder.encode(["alpha", "beta"])
+    assert result["int8_codes"].dtype == np.int8
+    assert result["int8_codes"].shape == (2, 3)
+    np.testing.assert_array_equal(
+        result["binary_codes"], binary_codes(result["embeddings"])
+    )
+    assert "binary_codes" not in base.encode(["alpha"])
+
+
+def test_quantization_tradeoff_keeps_recall():
+    corpus = _corpus()
+    queries = corpus[:30] + 0.05 * _corpus(30, seed=2)
+    relevant = [[i] for i in range(30)]
+    report = quantization_tradeoff(corpus, queries, relevant, k_values=(1, 10))
+    assert [r["codes"] for r in report] == ["float32", "int8", "binary"]
+    for entry in report:
+        assert entry["recall@10"] == report[0]["recall@10"]
+    assert report[2]["compression"] == 32
@@ -0,0 +1,138 @@
+"""
+Unit tests for the micro-batching EmbeddingService
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from ai_core.embedding.server import EmbeddingService
+
+
+class RecordingModel:
+    """Embeds a text as [len(text), index-in-batch] and records batch sizes."""
+
+    def __init__(self, fail=False):
+        self.batches = []
+        self.threads = set()
+        self.fail = fail
+
+    def encode(self, texts):
+        self.batches.append(len(texts))
+        self.threads.add(threading.current_thread().name)
+        if self.fail:
+            return {"success": False, "embeddings": None, "error": "boom"}
+        emb = np.array([[len(t), i] for i, t in enumerate(texts)], dtype=np.float32)
+        return {"success": True, "embeddings": emb, "error": None}
+
+
+def _service(model, **kwargs):
+    return EmbeddingService(model=model, config={}, **kwargs)
+
+
+def test_concurrent_callers_are_coalesced_and_get_their_own_rows():
+    model = RecordingModel()
+
+    async def main():
+        async with _service(model, max_batch_size=64, max_wait_ms=50) as svc:
+            texts = [["a" * (i + 1)] * (1 + i % 3) for i in range(10)]
+            results = await asyncio.gather(*(svc.embed(t) for t in texts))
+            return texts, results, svc.metrics()
+
+    texts, results, metrics = asyncio.run(main())
+    assert len(model.batches) < len(texts)
+    for t, rows in zip(texts, results):
+        assert rows.shape == (len(t), 2)
+        assert (rows[:, 0] == len(t[0])).all()
+    assert all(name.startswith("embedding-forward") for name in model.threads)
+    assert metrics["requests"] == 10
+    assert metrics["texts"] == sum(len(t) for t in texts)
+    assert metrics["queue_depth"] == 0
+    assert 0 < metrics["mean_fill_ratio"] <= 1
+
+
+def test_batches_respect_max_batch_size():
+    model = RecordingModel()
+
+    async def main():
+        async with _service(model, max_batch_size=4, max_wait_ms=50) as svc:
+            await asyncio.gather(*(svc.embed(["x"] * (1 + i % 3)) for i in range(10)))
+
+    asyncio.run(main())
+    assert sum(model.batches) == 19
+    assert max(model.batches) <= 4
+
+
+def test_failed_batch_raises_for_every_caller():
+    async def main():
+        async with _service(RecordingModel(fail=True), max_wait_ms=1) as svc:
+            results = await asyncio.gather(
+                svc.embed("a"), svc.embed("b"), return_exceptions=True
+            )
+            return results, svc.metrics()
+
+    results, metrics = asyncio.run(main())
+    assert all(isinstance(r, RuntimeError) and "boom" in str(r) for r in results)
+    assert metrics["failed_batches"] >= 1
+
+
+def test_embed_validates_input_and_requires_start():
+    svc = _service(RecordingModel())
+    with pytest.raises(RuntimeError):
+        asyncio.run(svc.embed("a"))
+
+    async def main():
+        async with svc:
+            with pytest.raises(ValueError):
+                await svc.embed([])
+
+    asyncio.run(main())
+
+
+def test_embed_during_or_after_stop_fails_instead_of_hanging():
+    model = RecordingModel()
+
+    async def main():
+        svc = _service(model, max_wait_ms=1)
+        await svc.start()
+        queued = asyncio.ensure_future(svc.embed("queued"))
+        await asyncio.sleep(0)
+        stopping = asyncio.ensure_future(svc.stop())
+        await asyncio.sleep(0)
+        with pytest.raises(RuntimeError, match="stopping"):
+            await asyncio.wait_for(svc.embed("late"), 1)
+        await stopping
+        with pytest.raises(RuntimeError, match="not started"):
+            await asyncio.wait_for(svc.embed("after"), 1)
+        return await queued
+
+    rows = asyncio.run(main())
+    # Requests queued before stop() are still served
+    assert rows.shape == (1, 2)
+
+
+def test_batcher_failure_fails_waiting_callers():
+    class ExplodingList(list):
+        def __getitem__(self, key):
+            raise KeyError("corrupt batch")
+
+    class BadRowsModel(RecordingModel):
+        def encode(self, texts):
+            return {"success": True, "embeddings": ExplodingList(), "error": None}
+
+    async def main():
+        svc = _service(BadRowsModel(), max_wait_ms=1)
+        await svc.start()
+        result = await asyncio.wait_for(
+            asyncio.gather(svc.embed("a"), return_exceptions=True), 1
+        )
+        with pytest.raises(RuntimeError, match="not running"):
+            await svc.embed("b")
+        with pytest.raises(KeyError):
+            await svc.stop()
+        return result
+
+    (error,) = asyncio.run(main())
+    assert isinstance(error, RuntimeError) and "batcher stopped" in str(error)
@@ -0,0 +1,62 @@
+"""
+Unit tests for streaming EmbeddingModel.encode_iter and encode_to_memmap
+"""
+
+import numpy as np
+import pytest
+
+from ai_core.embedding.embedding import EmbeddingModel
+
+
+def _texts(n):
+    return [f"event {i} " + "x" * (i % 13) for i in range(n)]
+
+
+@pytest.mark.parametrize(
+    "extra",
+    [{}, {"length_bucketing": True}, {"cache": {"enabled": True}}],
+)
+def test_encode_iter_blocks_match_encode(fake_model, extra):
+    embedder = EmbeddingModel(config={"device": "cpu", "batch_size": 4, **extra})
+    texts = _texts(23)
+    expected = embedder.encode(texts)["embeddings"]
+    out = np.zeros_like(expected)
+    seen = 0
+    for start, rows in embedder.encode_iter(iter(texts), window=8):
+        out[start : start + len(rows)] = rows
+        seen += len(rows)
+    assert seen == len(texts)
+    np.testing.assert_allclose(out, expected, rtol=1e-6)
+
+
+def test_encode_iter_plain_mode_yields_per_batch(fake_model):
+    embedder = EmbeddingModel(config={"device": "cpu", "batch_size": 4})
+    starts = [start for start, _ in embedder.encode_iter(_texts(10), window=8)]
+    assert starts == [0, 4, 8]
+
+
+def test_encode_to_memmap_from_generator_in_float16(fake_model, tmp_path):
+    embedder = EmbeddingModel(config={"device": "cpu", "batch_size": 3})
+    texts = _texts(11)
+    path = str(tmp_path / "emb.npy")
+    result = embedder.encode_to_memmap(
+        (t for t in texts), path, n_texts=len(texts), dtype="float16"
+    )
+    assert result["success"] is True, result["error"]
+    out = np.load(path, mmap_mode="r")
+    assert out.dtype == np.float16 and out.shape == result["shape"]
+    expected = embedder.encode(texts)["embeddings"]
+    np.testing.assert_allclose(out, expected, rtol=1e-2)
+
+
+def test_encode_to_memmap_reports_bad_input(fake_model, tmp_path):
+    embedder = EmbeddingModel(config={"device": "cpu"})
+    path = str(tmp_path / "emb.npy")
+    assert "n_texts" in embedder.encode_to_memmap(iter(["a"]), path)["error"]
+    short = embedder.encode_to_memmap(iter(["a"]), path, n_texts=2)
+    assert short["success"] is False and "expected" in short["error"]
+    missing_dir = str(tmp_path / "missing" / "emb.npy")
+    unwritable = embedder.encode_to_memmap(["a"], missing_dir)
+    assert unwritable["success"] is False and "Embedding failed" in unwritable["error"]
+    with pytest.raises(ValueError):
+        list(embedder.encode_iter(["a", 3]))
@@ -0,0 +1,73 @@
+import sqlite3
+
+from data_prep.ingest_index import (
+    IngestIndex,
+    TailState,
+    config_fingerprint,
+    file_sha256,
+    text_sha256,
+)
+
+
+def test_config_fingerprint_is_order_independent():
+    a = config_fingerprint({"strategy": "fixed", "chunk_size": 5})
+    b = config_fingerprint({"chunk_size": 5, "strategy": "fixed"})
+    c = config_fingerprint({"chunk_size": 6, "strategy": "fixed"})
+    assert a == b
+    assert a != c
+
+
+def test_file_sha256_streams_blocks(tmp_path):
+    path = tmp_path / "f.log"
+    path.write_bytes(b"x" * 10_000)
+    assert file_sha256(str(path), block_size=7) == file_sha256(str(path))
+
+
+def test_index_persists_documents_and_chunks(tmp_path):
+    db = str(tmp_path / "index.sqlite")
+    index = IngestIndex(db, "cfg1")
+    index.record_document("a.log", "h1", [text_sha256("chunk")])
+    index.close()
+
+    reopened = IngestIndex(db, "cfg1")
+    assert reopened.is_unchanged("a.log", "h1")
+    assert not reopened.is_unchanged("a.log", "h2")
+    assert reopened.has_chunk(text_sha256("chunk"))
+    reopened.close()
+
+    other_config = IngestIndex(db, "cfg2")
+    assert not other_config.is_unchanged("a.log", "h1")
+    assert not other_config.has_chunk(text_sha256("chunk"))
+    other_config.close()
+
+
+def test_tail_state_chunk_count_survives_older_index_files(tmp_path):
+    db = str(tmp_path / "index.sqlite")
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "CREATE TABLE tail_offsets (path TEXT NOT NULL, config_hash TEXT NOT NULL, inode INTEGER NOT NULL, size INTEGER NOT NULL, byte_offset INTEGER NOT NULL, char_offset INTEGER NOT NULL, head_sha256 TEXT NOT NULL, PRIMARY KEY (path, config_hash))"
+    )
+    conn.execute(
+        "INSERT INTO tail_offsets VALUES ('a.log', 'cfg1', 1, 10, 10, 10, 'h')"
+    )
+    conn.commit()
+    conn.close()
+
+    index = IngestIndex(db, "cfg1")
+    assert index.get_tail("a.log") == TailState(1, 10, 10, 10, "h", 0)
+    index.set_tail("a.log", TailState(1, 20, 20, 20, "h", 7))
+    assert index.get_tail("a.log").chunk_count == 7
+    index.close()
+
+
+def test_stage_chunks_is_discarded_on_rollback(tmp_path):
+    index = IngestIndex(str(tmp_path / "index.sqlite"), "cfg1")
+    index.record_document("a.log", "h1", ["a"])
+    assert index.stage_chunks(["a", "b", "b", "c"]) == {"b", "c"}
+    assert index.stage_chunks(["b", "d"]) == {"d"}
+    index.rollback()
+    assert index.has_chunk("a") and not index.has_chunk("b")
+    assert index.stage_chunks(["b"]) == {"b"}
+    index.record_document("b.log", "h2")
+    index.close()
+    assert IngestIndex(str(tmp_path / "index.sqlite"), "cfg1").has_chunk("b")
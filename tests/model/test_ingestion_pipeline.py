@@ -1,5 +1,6 @@
 import os
 import pytest
+from data_prep.ingest_index import text_sha256
 from data_prep.ingestion_pipeline import DataIngestionPipeline
 
 
@@ -172,3 +173,225 @@ def test_run_pipeline_with_chunking(setup_test_files, monkeypatch):
     # Each file's text is chunked into chars as DummyChunk objects
     chunk_texts = [c.text for c in result]
     assert sorted(chunk_texts) == sorted(["test1", "test2"])
+
+
+def test_read_batch_mmap_path_matches_full_read(tmp_path):
+    text = "".join(f"2024-01-01T00:00:{i:02d} sshd accepted ✓\n" for i in range(60))
+    (tmp_path / "huge.log").write_text(text, encoding="utf-8")
+
+    class MmapConfig(DummyConfig):
+        def get(self, key, default=None):
+            overrides = {
+                "source_path": str(tmp_path),
+                "enable_chunking": True,
+                "chunking": {"strategy": "semantic", "min_length": 1},
+                "record_extensions": [],
+                "mmap_threshold_bytes": 1,
+                "mmap_window_bytes": 128,
+            }
+            if key in overrides:
+                return overrides[key]
+            return super().get(key, default)
+
+    pipeline = DataIngestionPipeline(config=MmapConfig())
+    chunks = pipeline.read_batch(pipeline.list_files())
+    assert "".join(c.text for c in chunks) == text
+    assert all(text[c.start_offset : c.end_offset] == c.text for c in chunks)
+    # Indices count through the whole file, not per mmap window
+    assert [c.chunk_index for c in chunks] == list(range(len(chunks)))
+
+
+def test_dedup_index_skips_unchanged_files_and_seen_chunks(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.log").write_text("alpha\n\nbeta", encoding="utf-8")
+    (src / "b.log").write_text("gamma", encoding="utf-8")
+
+    class DedupConfig(DummyConfig):
+        def get(self, key, default=None):
+            overrides = {
+                "source_path": str(src),
+                "enable_chunking": True,
+                "chunking": {"strategy": "semantic", "min_length": 1},
+                "record_extensions": [],
+                "dedup_index_path": str(tmp_path / "index.sqlite"),
+            }
+            if key in overrides:
+                return overrides[key]
+            return super().get(key, default)
+
+    first = DataIngestionPipeline(config=DedupConfig()).run()
+    assert sorted(c.text for c in first) == ["alpha", "beta", "gamma"]
+
+    # Unchanged rerun: nothing flows downstream
+    assert DataIngestionPipeline(config=DedupConfig()).run() == []
+
+    # Modified file: only its new chunk is emitted
+    (src / "a.log").write_text("alpha\n\nbeta\n\ndelta", encoding="utf-8")
+    pipeline = DataIngestionPipeline(config=DedupConfig())
+    third = pipeline.run()
+    assert [c.text for c in third] == ["delta"]
+    assert pipeline._files_skipped == 1
+    assert pipeline._chunks_skipped == 2
+
+
+def test_dedup_stages_chunks_in_batches_and_commits_document_last(
+    tmp_path, monkeypatch
+):
+    import data_prep.ingestion_pipeline as ingestion_pipeline
+
+    monkeypatch.setattr(ingestion_pipeline, "CHUNK_BATCH_SIZE", 2)
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.log").write_text("x\n\ny\n\nx\n\nz\n\ny", encoding="utf-8")
+
+    class DedupConfig(DummyConfig):
+        def get(self, key, default=None):
+            overrides = {
+                "source_path": str(src),
+                "enable_chunking": True,
+                "chunking": {"strategy": "semantic", "min_length": 1},
+                "record_extensions": [],
+                "dedup_index_path": str(tmp_path / "index.sqlite"),
+            }
+            if key in overrides:
+                return overrides[key]
+            return super().get(key, default)
+
+    # A consumer that stops mid-file rolls the staged chunks back
+    pipeline = DataIngestionPipeline(config=DedupConfig())
+    stream = pipeline.iter_batch(pipeline.list_files())
+    assert next(stream).text == "x"
+    stream.close()
+    assert not pipeline.index.has_chunk(text_sha256("x"))
+    pipeline.index.close()
+
+    # Duplicates within and across batches are emitted once
+    pipeline = DataIngestionPipeline(config=DedupConfig())
+    assert [c.text for c in pipeline.run()] == ["x", "y", "z"]
+    assert pipeline._chunks_skipped == 2
+
+
+def _tail_config(tmp_path, src):
+    class TailConfig(DummyConfig):
+        def get(self, key, default=None):
+            overrides = {
+                "source_path": str(src),
+                "enable_chunking": True,
+                "chunking": {"strategy": "semantic", "min_length": 1},
+                "record_extensions": [],
+                "dedup_index_path": str(tmp_path / "index.sqlite"),
+                "tail_mode": True,
+                "mmap_window_bytes": 16,
+            }
+            if key in overrides:
+                return overrides[key]
+            return super().get(key, default)
+
+    return TailConfig()
+
+
+def test_tail_mode_chunks_only_appended_records(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    log = src / "app.log"
+    log.write_text("first\n\nsecond\n\nthi", encoding="utf-8")
+
+    first = DataIngestionPipeline(config=_tail_config(tmp_path, src)).run()
+    # The partial trailing record is held back until it is terminated
+    assert [c.text for c in first] == ["first", "second"]
+
+    with open(log, "a", encoding="utf-8") as f:
+        f.write("rd ✓\n\nfourth\n")
+    second = DataIngestionPipeline(config=_tail_config(tmp_path, src)).run()
+    full = log.read_text(encoding="utf-8")
+    assert [c.text for c in second] == ["third ✓", "fourth\n"]
+    assert all(full[c.start_offset : c.end_offset] == c.text for c in second)
+    assert [c.chunk_index for c in first + second] == [0, 1, 2, 3]
+
+    pipeline = DataIngestionPipeline(config=_tail_config(tmp_path, src))
+    assert pipeline.run() == []
+    assert pipeline._files_skipped == 1
+
+
+def test_tail_mode_restarts_after_rotation(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    log = src / "app.log"
+    log.write_text("old entry one\n\nold entry two\n", encoding="utf-8")
+    DataIngestionPipeline(config=_tail_config(tmp_path, src)).run()
+
+    # Truncate-and-rewrite with a shorter file
+    log.write_text("new\n", encoding="utf-8")
+    assert [
+        c.text for c in DataIngestionPipeline(config=_tail_config(tmp_path, src)).run()
+    ] == ["new\n"]
+
+    # Rename-and-recreate: same size class but a different head
+    os.rename(log, src / "app.log.1")
+    log.write_text("NEW\n\nnext\n", encoding="utf-8")
+    rotated = DataIngestionPipeline(config=_tail_config(tmp_path, src)).run()
+    assert [c.text for c in rotated] == ["NEW", "next\n"]
+    assert [c.chunk_index for c in rotated] == [0, 1]
+
+
+def test_tail_mode_requires_index(tmp_path):
+    class NoIndexConfig(DummyConfig):
+        def get(self, key, default=None):
+            if key == "tail_mode":
+                return True
+            return super().get(key, default)
+
+    assert DataIngestionPipeline(config=NoIndexConfig()).tail_mode is False
+
+
+def test_json_files_are_chunked_on_record_boundaries(tmp_path):
+    records = [
+        f'{{"event": "login", "user": "u{i}", "msg": "a}}b"}}' for i in range(40)
+    ]
+    text = "\n".join(records) + "\n"
+    (tmp_path / "events.json").write_text(text, encoding="utf-8")
+
+    class RecordConfig(DummyConfig):
+        def get(self, key, default=None):
+            overrides = {
+                "source_path": str(tmp_path),
+                "allowed_extensions": [".json"],
+                "enable_chunking": True,
+                "chunking": {"strategy": "fixed", "chunk_size": 200, "min_length": 1},
+                "mmap_threshold_bytes": 1,
+                "mmap_window_bytes": 300,
+            }
+            if key in overrides:
+                return overrides[key]
+            return super().get(key, default)
+
+    pipeline = DataIngestionPipeline(config=RecordConfig())
+    chunks = pipeline.read_batch(pipeline.list_files())
+    assert sum(c.metadata["record_count"] for c in chunks) == len(records)
+    for c in chunks:
+        assert text[c.start_offset : c.end_offset] == c.text
+        assert c.text.split("\n")[0] in records and c.text.split("\n")[-1] in records
+        last = c.metadata["last_record_offset"]
+        assert text[last : c.end_offset] in records
+
+
+def test_record_chunker_uses_json_records_block(tmp_path):
+    class RecordConfig(DummyConfig):
+        def get(self, key, default=None):
+            overrides = {
+                "source_path": str(tmp_path),
+                "enable_chunking": True,
+                "chunking": {
+                    "strategy": "fixed",
+                    "chunk_size": 200,
+                    "min_length": 64,
+                    "json_records": {"chunk_size": 1024, "min_length": 0},
+                },
+            }
+            if key in overrides:
+                return overrides[key]
+            return super().get(key, default)
+
+    config = DataIngestionPipeline(config=RecordConfig()).record_chunker.config
+    assert (config.chunk_size, config.min_length) == (1024, 0)
@@ -0,0 +1,69 @@
+"""
+Unit tests for deferred imports, deferred model loading and the import-time report
+"""
+
+import subprocess
+import sys
+
+from ai_core.embedding.embedding import EmbeddingModel
+from ai_core.lazy_imports import (
+    LazyModule,
+    deferred_import_times,
+    import_time_report,
+    parse_importtime,
+)
+
+
+def test_lazy_module_imports_on_first_attribute():
+    lazy = LazyModule("json")
+    assert "not loaded" in repr(lazy)
+    assert lazy.dumps([1]) == "[1]"
+    assert "json" in deferred_import_times()
+    assert "(loaded)" in repr(lazy)
+
+
+def test_embedding_and_model_loader_do_not_import_torch():
+    code = (
+        "import sys, ai_core.embedding.embedding, ai_core.model_loader; "
+        "print(sorted(m for m in ('torch', 'transformers') if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "[]"
+
+
+def test_model_loads_on_first_encode_or_warmup(fake_model):
+    embedder = EmbeddingModel(config={"device": "cpu"})
+    assert embedder.model is None and fake_model.seen == []
+    assert embedder.encode(["alpha"])["success"] is True
+    assert embedder.model is fake_model
+    eager = EmbeddingModel(config={"device": "cpu"})
+    assert eager.warmup() is True
+    assert eager.model is fake_model
+
+
+def test_failed_load_is_reported_by_encode(monkeypatch):
+    def fail(name, **kwargs):
+        raise OSError("no such model")
+
+    monkeypatch.setattr("transformers.AutoTokenizer.from_pretrained", fail)
+    embedder = EmbeddingModel(config={"device": "cpu", "model_name": "missing"})
+    assert embedder.warmup() is False
+    result = embedder.encode(["alpha"])
+    assert result["success"] is False
+    assert "no such model" in result["error"]
+
+
+def test_parse_importtime_and_report():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   _json\n"
+        "import time:      1500 |       1620 | json\n"
+    )
+    rows = parse_importtime(stderr)
+    assert [r["module"] for r in rows] == ["_json", "json"]
+    assert rows[0]["depth"] == 1 and rows[1]["cumulative_s"] == 0.00162
+    (entry,) = import_time_report(["ai_core.lazy_imports"])
+    assert entry["success"] and entry["seconds"] > 0
+    assert entry["loads_torch"] is False
@@ -0,0 +1,62 @@
+import mmap
+import pytest
+from data_prep.mmap_reader import iter_mmap_windows, last_record_end, snap_boundary
+
+
+def _write(tmp_path, text):
+    path = tmp_path / "big.log"
+    path.write_bytes(text.encode("utf-8"))
+    return str(path)
+
+
+def test_windows_reassemble_file_and_track_char_offsets(tmp_path):
+    text = "".join(f"line {i} émoji ✓\n" for i in range(200))
+    path = _write(tmp_path, text)
+    windows = list(iter_mmap_windows(path, window_bytes=64))
+    assert "".join(w[2] for w in windows) == text
+    for byte_offset, char_offset, chunk in windows:
+        assert text[char_offset : char_offset + len(chunk)] == chunk
+        assert len(text[:char_offset].encode("utf-8")) == byte_offset
+    # Every window but the last ends on a line edge
+    assert all(w[2].endswith("\n") for w in windows[:-1])
+
+
+def test_windows_snap_to_char_edges_without_newlines(tmp_path):
+    text = "ü" * 100
+    path = _write(tmp_path, text)
+    windows = list(iter_mmap_windows(path, window_bytes=7))
+    assert "".join(w[2] for w in windows) == text
+    assert all(len(w[2]) == 3 for w in windows[:-1])
+
+
+def test_snap_boundary_moves_forward_when_window_too_small(tmp_path):
+    path = _write(tmp_path, "✓✓")
+    with (
+        open(path, "rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf,
+    ):
+        assert snap_boundary(buf, 0, 1) == 3
+
+
+def test_empty_file_and_invalid_window(tmp_path):
+    path = _write(tmp_path, "")
+    assert list(iter_mmap_windows(path)) == []
+    with pytest.raises(ValueError):
+        list(iter_mmap_windows(path, window_bytes=0))
+
+
+def test_windows_between_start_and_stop(tmp_path):
+    text = "line one\nline two ✓\nline three\n"
+    path = _write(tmp_path, text)
+    start = len("line one\n")
+    stop = len(text.encode("utf-8")) - len("line three\n")
+    windows = list(iter_mmap_windows(path, window_bytes=4, start=start, stop=stop))
+    assert "".join(w[2] for w in windows) == "line two ✓\n"
+    assert windows[0][:2] == (start, 0)
+
+
+def test_last_record_end_leaves_partial_record(tmp_path):
+    path = _write(tmp_path, "a\nbb\npartial")
+    assert last_record_end(path, 0, 12) == 5
+    assert last_record_end(path, 5, 12) == 5
+    assert last_record_end(path, 0, 0) == 0
@@ -1,12 +1,13 @@
 import pytest
 import numpy as np
+import psycopg2
 from ai_core.vector_store import VectorStore
 
 
 def test_vector_store_initialization():
     store = VectorStore()
-    # If DB is not available, conn will be None; skip test in that case
-    if store.conn is None:
+    # If DB is not available, the health check fails; skip test in that case
+    if not store.health_check():
         pytest.skip("Vector store DB not available; skipping initialization test.")
     assert isinstance(store.table_name, str)
 
@@ -17,6 +18,12 @@ def test_vector_store_upsert_and_query(monkeypatch):
         def execute(self, *args, **kwargs):
             pass
 
+        def copy_expert(self, sql, file):
+            pass
+
+        def fetchone(self):
+            return None
+
         def fetchall(self):
             return [("test text", np.zeros(384))]
 
@@ -33,8 +40,13 @@ def test_vector_store_upsert_and_query(monkeypatch):
         def commit(self):
             pass
 
-    store = VectorStore()
-    store.conn = DummyConn()
+        def rollback(self):
+            pass
+
+        def close(self):
+            pass
+
+    store = VectorStore(connect=DummyConn)
     texts = ["test text"]
     embeddings = np.zeros((1, 384))
     result = store.upsert_embeddings(texts, embeddings)
@@ -46,9 +58,81 @@ def test_vector_store_upsert_and_query(monkeypatch):
 
 
 def test_vector_store_error_handling():
-    store = VectorStore()
-    store.conn = None
+    def unreachable():
+        raise psycopg2.OperationalError("could not connect to server")
+
+    store = VectorStore(connect=unreachable)
     result = store.upsert_embeddings(["text"], np.zeros((1, 384)))
     assert "ERROR" in str(result)
     result = store.query(np.zeros(384), top_k=1)
     assert "ERROR" in str(result)
+
+
+class SchemaCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, args=None):
+        self.conn.sql.append(sql)
+
+    def fetchone(self):
+        sql = self.conn.sql[-1]
+        if "atttypmod" in sql:
+            return (self.conn.width,) if self.conn.width else None
+        if "SELECT embedding_version" in sql:
+            return (self.conn.version,) if self.conn.has_rows else None
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class SchemaConn:
+    """Reports an existing table of ``width`` holding rows of ``version``."""
+
+    def __init__(self, width=None, version=None, has_rows=False):
+        self.width, self.version, self.has_rows = width, version, has_rows
+        self.sql = []
+
+    def cursor(self):
+        return SchemaCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_vector_store_rejects_table_of_another_width():
+    with pytest.raises(ValueError, match="VECTOR\\(384\\)"):
+        VectorStore(config={"dim": 128}, connect=lambda: SchemaConn(width=384))
+    store = VectorStore(config={"dim": 384}, connect=lambda: SchemaConn(width=384))
+    assert store.health_check()
+
+
+def test_vector_store_rejects_rows_of_another_projection_version(tmp_path):
+    from ai_core.embedding.projection import EmbeddingProjection
+
+    sample = np.random.default_rng(0).normal(size=(50, 8)).astype(np.float32)
+    path = EmbeddingProjection.fit(sample, 4).save(str(tmp_path))
+    other = EmbeddingProjection.fit(sample[::-1] * 2, 4)
+    config = {"projection_path": path}
+    with pytest.raises(ValueError, match="version"):
+        VectorStore(
+            config=config,
+            connect=lambda: SchemaConn(width=4, version=other.version, has_rows=True),
+        )
+    # Unversioned rows were written without a projection
+    with pytest.raises(ValueError, match="version"):
+        VectorStore(config=config, connect=lambda: SchemaConn(has_rows=True))
+    conn = SchemaConn(width=4)
+    store = VectorStore(config=config, connect=lambda: conn)
+    assert store.embedding_version == EmbeddingProjection.load(path).version
+    assert any("ADD COLUMN IF NOT EXISTS embedding_version" in sql for sql in conn.sql)
@@ -0,0 +1,201 @@
+"""
+Unit tests for the VectorStore bulk upsert path (binary COPY and execute_values pages)
+"""
+
+import struct
+
+import numpy as np
+import psycopg2
+import pytest
+
+from ai_core.vector_store import VectorStore, copy_binary_payload, vector_literal
+
+
+class RecordingCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.connection = conn
+
+    def copy_expert(self, sql, file):
+        self.conn.calls.append(("copy", sql, file.read()))
+        self.conn.maybe_fail()
+
+    def mogrify(self, template, args):
+        return (template.replace("%s", "{!r}").format(*args)).encode("utf-8")
+
+    def execute(self, sql, args=None):
+        self.conn.calls.append(("execute", sql, args))
+        self.conn.maybe_fail()
+
+    def fetchone(self):
+        return None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+class RecordingConn:
+    encoding = "UTF8"
+
+    def __init__(self):
+        self.calls = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = 0
+        self.fail_on_call = None
+        self.fail_on_commit = False
+        self.error = psycopg2.DataError
+
+    def maybe_fail(self):
+        if self.fail_on_call is not None and len(self.calls) == self.fail_on_call:
+            raise self.error("page rejected")
+
+    def cursor(self):
+        return RecordingCursor(self)
+
+    def commit(self):
+        if self.fail_on_commit:
+            raise psycopg2.OperationalError("server closed the connection")
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = 1
+
+
+def _store(conn, **config):
+    store = VectorStore(
+        config={"batch_size": 3, "dim": 4, **config}, connect=lambda: conn
+    )
+    # Forget the schema setup issued on the first checkout
+    conn.calls.clear()
+    conn.commits = 0
+    return store
+
+
+def _rows(n, consumed):
+    for i in range(n):
+        consumed.append(i)
+        yield f"chunk {i}", np.full(4, i, dtype=np.float32)
+
+
+def _parse_copy(payload, versions=None):
+    assert payload.startswith(b"PGCOPY\n\xff\r\n\x00")
+    pos, rows = 19, []
+    while True:
+        (fields,) = struct.unpack_from(">h", payload, pos)
+        pos += 2
+        if fields == -1:
+            return rows
+        assert fields == 3
+        (n,) = struct.unpack_from(">i", payload, pos)
+        text = payload[pos + 4 : pos + 4 + n].decode("utf-8")
+        pos += 4 + n
+        size, dim, _ = struct.unpack_from(">ihh", payload, pos)
+        vec = np.frombuffer(payload, dtype=">f4", count=dim, offset=pos + 8)
+        assert size == 4 + 4 * dim
+        pos += 4 + size
+        (n,) = struct.unpack_from(">i", payload, pos)
+        version = None if n == -1 else payload[pos + 4 : pos + 4 + n].decode()
+        pos += 4 + max(n, 0)
+        if versions is not None:
+            versions.append(version)
+        rows.append((text, vec.astype(np.float32)))
+
+
+def test_copy_payload_roundtrips_pgvector_binary():
+    vectors = np.array([[0.5, -1.25], [3.0, 0.0]], dtype=np.float32)
+    versions = []
+    rows = _parse_copy(copy_binary_payload(["a", "ünï"], vectors), versions)
+    assert [t for t, _ in rows] == ["a", "ünï"]
+    np.testing.assert_array_equal(np.stack([v for _, v in rows]), vectors)
+    assert versions == [None, None]
+    _parse_copy(copy_binary_payload(["a"], vectors[:1], "pca2-abc"), versions)
+    assert versions[-1] == "pca2-abc"
+    assert vector_literal([0.1, 2]) == "[0.100000001,2]"
+
+
+def test_bulk_upsert_streams_generator_in_committed_pages():
+    conn = RecordingConn()
+    store = _store(conn)
+    consumed = []
+    assert store.bulk_upsert(_rows(7, consumed)) == 7
+    assert [len(_parse_copy(payload)) for _, _, payload in conn.calls] == [3, 3, 1]
+    assert conn.commits == 3
+    assert "FORMAT binary" in conn.calls[0][1]
+    assert consumed == list(range(7))
+
+
+def test_generator_is_consumed_one_page_at_a_time():
+    conn = RecordingConn()
+    store = _store(conn)
+    consumed = []
+    seen = []
+    original = conn.maybe_fail
+    conn.maybe_fail = lambda: seen.append(len(consumed)) or original()
+    store.bulk_upsert(_rows(7, consumed))
+    assert seen == [3, 6, 7]
+
+
+def test_execute_values_sends_one_statement_per_page():
+    conn = RecordingConn()
+    store = _store(conn, bulk_method="execute_values")
+    store.upsert_embeddings(
+        (f"t{i}" for i in range(4)), (np.ones(4) * i for i in range(4))
+    )
+    statements = [sql for kind, sql, _ in conn.calls if kind == "execute"]
+    assert len(statements) == 2 and conn.commits == 2
+    assert b"'[3,3,3,3]'::vector, None" in statements[1]
+
+
+def test_failed_page_rolls_back_and_keeps_earlier_pages():
+    conn = RecordingConn()
+    store = _store(conn)
+    conn.fail_on_call = 2
+    result = store.bulk_upsert(_rows(7, []))
+    assert "ERROR" in result
+    assert conn.commits == 1 and conn.rollbacks == 1
+    assert "ERROR" in str(store.bulk_upsert([("x", np.zeros(5))]))
+    with pytest.raises(ValueError):
+        store.bulk_upsert([], method="insert")
+
+
+def test_dropped_connection_retries_page_on_new_connection():
+    conns = []
+
+    def connect():
+        conns.append(RecordingConn())
+        return conns[-1]
+
+    store = VectorStore(config={"batch_size": 3, "dim": 4}, connect=connect)
+    conns[0].calls.clear()
+    conns[0].fail_on_call = 2
+    conns[0].error = psycopg2.OperationalError
+    assert store.bulk_upsert(_rows(7, [])) == 7
+    assert len(conns) == 2 and conns[0].closed
+    # Page 2 failed on the first connection and was replayed on the second
+    assert [len(_parse_copy(p)) for _, _, p in conns[1].calls] == [3, 1]
+    metrics = store.metrics()
+    assert metrics["discarded"] == 1 and metrics["connects"] == 2
+
+
+def test_dropped_connection_during_commit_is_not_replayed():
+    conns = []
+
+    def connect():
+        conns.append(RecordingConn())
+        return conns[-1]
+
+    store = VectorStore(config={"batch_size": 3, "dim": 4}, connect=connect)
+    conns[0].calls.clear()
+    conns[0].fail_on_commit = True
+    result = store.bulk_upsert(_rows(7, []))
+    assert "unknown" in result
+    # The server may have committed page 1, so it is never sent again
+    assert len(conns) == 1 and len(conns[0].calls) == 1
+    assert store.metrics()["discarded"] == 1
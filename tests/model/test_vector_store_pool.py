@@ -0,0 +1,176 @@
+import concurrent.futures
+import os
+import threading
+import time
+
+import numpy as np
+import psycopg2
+import psycopg2.pool
+import pytest
+
+from ai_core.vector_store import ConnectionPool, VectorStore
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        if self.conn.dead:
+            raise psycopg2.OperationalError("server closed the connection")
+
+
+class FakeConn:
+    def __init__(self):
+        self.dead = False
+        self.closed = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def commit(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+class Connector:
+    def __init__(self):
+        self.conns = []
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        with self.lock:
+            self.conns.append(FakeConn())
+            return self.conns[-1]
+
+
+def test_pool_never_exceeds_max_connections_under_threads():
+    connect = Connector()
+    pool = ConnectionPool(connect, min_connections=1, max_connections=3, timeout=5)
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def work(_):
+        with pool.connection():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(work, range(40)))
+    metrics = pool.metrics()
+    assert peak[0] <= 3 and len(connect.conns) <= 3
+    assert metrics["checkouts"] == 40 and metrics["in_use"] == 0
+    assert metrics["idle"] == len(connect.conns)
+    assert metrics["max_wait_seconds"] >= metrics["mean_wait_seconds"] > 0
+
+
+def test_pool_timeout_raises_and_is_counted():
+    pool = ConnectionPool(
+        Connector(), min_connections=0, max_connections=1, timeout=0.05
+    )
+    with pool.connection():
+        with pytest.raises(psycopg2.pool.PoolError):
+            with pool.connection():
+                pass
+    assert pool.metrics()["timeouts"] == 1
+    with pool.connection():
+        pass
+
+
+def test_pool_rejects_invalid_sizes():
+    with pytest.raises(ValueError):
+        ConnectionPool(Connector(), min_connections=3, max_connections=2)
+    with pytest.raises(ValueError):
+        ConnectionPool(Connector(), min_connections=0, max_connections=0)
+
+
+def test_pool_discards_dead_idle_connection_on_health_check():
+    connect = Connector()
+    pool = ConnectionPool(connect, min_connections=1, health_check_interval=0)
+    connect.conns[0].dead = True
+    with pool.connection() as conn:
+        assert conn is connect.conns[1]
+    metrics = pool.metrics()
+    assert metrics["health_checks"] == 1 and metrics["discarded"] == 1
+    assert connect.conns[0].closed
+
+
+def test_pool_rolls_back_on_error_and_drops_on_operational_error():
+    connect = Connector()
+    pool = ConnectionPool(connect, min_connections=1)
+    with pytest.raises(KeyError):
+        with pool.connection():
+            raise KeyError("bad row")
+    assert connect.conns[0].rollbacks == 1 and pool.metrics()["idle"] == 1
+    with pytest.raises(psycopg2.OperationalError):
+        with pool.connection():
+            raise psycopg2.OperationalError("terminating connection")
+    assert connect.conns[0].closed and pool.metrics()["idle"] == 0
+    pool.close()
+
+
+@pytest.mark.skipif(
+    not os.environ.get("VECTOR_STORE_TEST_HOST"),
+    reason="Set VECTOR_STORE_TEST_HOST to a local pgvector Postgres to run.",
+)
+def test_pooled_store_against_local_postgres():
+    """
+    e.g. docker run -d -p 5432:5432 -e POSTGRES_PASSWORD=postgres pgvector/pgvector:pg16
+    then VECTOR_STORE_TEST_HOST=localhost pytest tests/model/test_vector_store_pool.py
+    """
+    config = {
+        "db_host": os.environ["VECTOR_STORE_TEST_HOST"],
+        "db_port": int(os.environ.get("VECTOR_STORE_TEST_PORT", 5432)),
+        "db_name": os.environ.get("VECTOR_STORE_TEST_DB", "postgres"),
+        "db_user": os.environ.get("VECTOR_STORE_TEST_USER", "postgres"),
+        "db_password": os.environ.get("VECTOR_STORE_TEST_PASSWORD", "postgres"),
+        "table_name": f"pool_test_{os.getpid()}",
+        "dim": 4,
+        "batch_size": 10,
+        "pool": {"min_connections": 1, "max_connections": 4},
+    }
+    setup = psycopg2.connect(
+        host=config["db_host"],
+        port=config["db_port"],
+        dbname=config["db_name"],
+        user=config["db_user"],
+        password=config["db_password"],
+    )
+    with setup, setup.cursor() as cur:
+        cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    store = VectorStore(config=config)
+    try:
+        assert store.health_check()
+
+        def write_and_read(worker):
+            rng = np.random.default_rng(worker)
+            rows = [(f"w{worker}-{i}", rng.random(4)) for i in range(25)]
+            written = store.bulk_upsert(rows)
+            return written, store.query(rows[0][1], top_k=1)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(write_and_read, range(16)))
+        assert all(written == 25 for written, _ in results)
+        assert all(isinstance(hits, list) and hits for _, hits in results)
+        assert store.metrics()["connects"] <= 4
+    finally:
+        with setup, setup.cursor() as cur:
+            cur.execute(f"DROP TABLE IF EXISTS {config['table_name']}")
+        setup.close()
+        store.close()